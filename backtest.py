@@ -0,0 +1,170 @@
+import math
+import logging
+import numpy as np
+import pandas as pd
+from signal_series import signal_series, RECOMMENDATION_LABELS
+
+logger = logging.getLogger(__name__)
+
+NAN = float('nan')
+
+# Target exposure for each recommendation code (-3 STRONG SELL .. 3 STRONG BUY).
+# NaN keeps the previous position, so HOLD neither opens nor closes a trade.
+LONG_ONLY = {3: 1.0, 2: 1.0, 1: 0.5, 0: NAN, -1: 0.0, -2: 0.0, -3: 0.0}
+LONG_SHORT = {3: 1.0, 2: 1.0, 1: 0.5, 0: NAN, -1: -0.5, -2: -1.0, -3: -1.0}
+
+# Optional volatility overlay: the assess_risk cut-offs (annualized volatility,
+# MODERATE above 20, HIGH above 30) and the exposure kept at LOW/MODERATE/HIGH risk
+RISK_CUTOFFS = (20.0, 30.0)
+RISK_EXPOSURE = (1.0, 0.5, 0.0)
+
+
+def target_positions(recommendation, position_map=None):
+    """
+    Map recommendation codes (..., bars) to target exposures, carrying the last
+    target forward through NaN (hold) entries with an index scan instead of a loop.
+    Bars before the first target are flat.
+    """
+    position_map = LONG_ONLY if position_map is None else position_map
+    lookup = np.array([position_map.get(code, NAN) for code in range(-3, 4)], dtype='float64')
+    target = lookup[np.asarray(recommendation, dtype='int64') + 3]
+
+    missing = np.isnan(target)
+    source = np.where(missing, 0, np.arange(target.shape[-1]))
+    np.maximum.accumulate(source, axis=-1, out=source)
+    target = np.take_along_axis(target, source, axis=-1)
+    target[np.isnan(target)] = 0.0
+    return target
+
+
+def _trade_stats(held, net):
+    """Number of trades (runs of a constant non-zero position) and how many made money"""
+    n = held.shape[-1]
+    rows = held.reshape(-1, n)
+    starts = np.ones(rows.shape, dtype=bool)
+    starts[:, 1:] = rows[:, 1:] != rows[:, :-1]
+    # Runs are numbered across all rows so one bincount serves every variant
+    run_ids = np.cumsum(starts.ravel()) - 1
+    log_growth = np.bincount(run_ids, weights=np.log1p(net.reshape(-1, n)).ravel())
+    run_row = np.repeat(np.arange(rows.shape[0]), starts.sum(axis=1))
+    in_market = rows[starts] != 0
+    trades = np.bincount(run_row, weights=in_market, minlength=rows.shape[0])
+    wins = np.bincount(run_row, weights=in_market & (log_growth > 0), minlength=rows.shape[0])
+    shape = held.shape[:-1]
+    return trades.reshape(shape), wins.reshape(shape)
+
+
+def risk_scale(volatility, risk_cutoffs=RISK_CUTOFFS, risk_exposure=RISK_EXPOSURE):
+    """
+    Exposure multiplier per bar from the assess_risk levels: LOW, MODERATE above the
+    first cut-off, HIGH above the second. Cut-offs may be arrays (variants, 1).
+    Bars without a volatility reading count as LOW.
+    """
+    volatility = np.nan_to_num(np.asarray(volatility, dtype='float64'), nan=0.0)
+    moderate, high = (np.asarray(cutoff, dtype='float64') for cutoff in risk_cutoffs)
+    low_exposure, moderate_exposure, high_exposure = risk_exposure
+    return np.where(volatility > high, high_exposure,
+                    np.where(volatility > moderate, moderate_exposure, low_exposure))
+
+
+def backtest(close, recommendation, position_map=None, cost_bps=0.0, slippage_bps=0.0,
+             periods_per_year=252, initial_capital=1.0, volatility=None, risk_cutoffs=RISK_CUTOFFS,
+             risk_exposure=RISK_EXPOSURE):
+    """
+    Vectorized backtest of recommendation codes against close prices.
+    A recommendation at a bar's close sets the position held over the next bar;
+    each change in position pays (cost_bps + slippage_bps) on the traded exposure.
+    With volatility (annualized, in the units of risk_cutoffs) the target is scaled
+    by risk_scale. recommendation may carry leading variant axes (..., bars) to
+    test many signal sets at once. Returns a dict of per-bar arrays (position,
+    returns, costs, turnover, equity, drawdown) and a summary dict of scalars (or
+    arrays per variant).
+    """
+    close = np.asarray(close, dtype='float64')
+    recommendation = np.asarray(recommendation)
+    if recommendation.shape[-1] != close.shape[-1]:
+        raise ValueError(f"{recommendation.shape[-1]} recommendations for {close.shape[-1]} bars")
+
+    target = target_positions(recommendation, position_map)
+    if volatility is not None:
+        target = target * risk_scale(volatility, risk_cutoffs, risk_exposure)
+    held = np.zeros_like(target)
+    held[..., 1:] = target[..., :-1]
+
+    bar_returns = np.zeros_like(close)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        bar_returns[1:] = close[1:] / close[:-1] - 1
+    bar_returns[~np.isfinite(bar_returns)] = 0.0
+
+    turnover = np.abs(np.diff(held, axis=-1, prepend=0.0))
+    costs = turnover * ((cost_bps + slippage_bps) / 10_000)
+    gross = held * bar_returns
+    result = performance(held, gross - costs, turnover, costs, periods_per_year, initial_capital)
+    result['gross_returns'] = gross
+    return result
+
+
+def performance(held, net, turnover, costs, periods_per_year=252, initial_capital=1.0):
+    """
+    Equity curve, drawdown and summary statistics from per-bar positions and net
+    returns (..., bars). Returns the backtest() result dict without gross_returns.
+    """
+    equity = initial_capital * np.cumprod(1 + net, axis=-1)
+    drawdown = equity / np.maximum.accumulate(equity, axis=-1) - 1
+
+    n = net.shape[-1]
+    years = n / periods_per_year
+    total_return = equity[..., -1] / initial_capital - 1
+    mean = net.mean(axis=-1)
+    deviation = net.std(axis=-1, ddof=1) if n > 1 else np.zeros_like(mean)
+    in_market = held != 0
+    exposure_bars = in_market.sum(axis=-1)
+    trades, wins = _trade_stats(held, net)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        summary = {
+            'total_return': total_return,
+            'cagr': np.where(equity[..., -1] > 0, (equity[..., -1] / initial_capital) ** (1 / years) - 1, -1.0),
+            'annual_volatility': deviation * math.sqrt(periods_per_year),
+            'sharpe': np.where(deviation > 0, mean / deviation * math.sqrt(periods_per_year), 0.0),
+            'max_drawdown': drawdown.min(axis=-1),
+            'hit_rate': np.where(exposure_bars > 0,
+                                 (in_market & (net > 0)).sum(axis=-1) / np.maximum(exposure_bars, 1), NAN),
+            'trades': trades.astype('int64'),
+            'trade_hit_rate': np.where(trades > 0, wins / np.maximum(trades, 1), NAN),
+            'turnover': turnover.sum(axis=-1) / years,
+            'exposure': exposure_bars / n,
+            'costs': costs.sum(axis=-1),
+        }
+    if held.ndim == 1:
+        summary = {name: value.item() for name, value in summary.items()}
+
+    return {
+        'position': held,
+        'returns': net,
+        'costs': costs,
+        'turnover': turnover,
+        'equity': equity,
+        'drawdown': drawdown,
+        'summary': summary,
+    }
+
+
+def backtest_frame(data, rules=None, periods_per_year=252, **options):
+    """
+    Backtest the recommendations signal_series produces for an indicator frame.
+    Returns (DataFrame of per-bar results, summary dict).
+    """
+    series = signal_series(data, rules=rules)
+    result = backtest(data['Close'].to_numpy(dtype='float64'), series['recommendation'],
+                      periods_per_year=periods_per_year, **options)
+    frame = pd.DataFrame({
+        'Close': data['Close'].to_numpy(),
+        'recommendation': pd.Series(series['recommendation']).map(RECOMMENDATION_LABELS).to_numpy(),
+        'position': result['position'],
+        'returns': result['returns'],
+        'turnover': result['turnover'],
+        'equity': result['equity'],
+        'drawdown': result['drawdown'],
+    }, index=data.index)
+    return frame, result['summary']
@@ -0,0 +1,81 @@
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from data_providers import YahooProvider
+from fetch_scheduler import FetchScheduler
+from data_validation import validate_ohlcv, summarize_report
+
+logger = logging.getLogger(__name__)
+
+NIFTY_INDEX_SYMBOL = "^NSEI"
+
+# Nifty 50 constituents (Yahoo Finance symbols). Update when the index is rebalanced.
+NIFTY50_SYMBOLS = [
+    "ADANIENT.NS", "ADANIPORTS.NS", "APOLLOHOSP.NS", "ASIANPAINT.NS", "AXISBANK.NS",
+    "BAJAJ-AUTO.NS", "BAJFINANCE.NS", "BAJAJFINSV.NS", "BEL.NS", "BHARTIARTL.NS",
+    "CIPLA.NS", "COALINDIA.NS", "DRREDDY.NS", "EICHERMOT.NS", "ETERNAL.NS",
+    "GRASIM.NS", "HCLTECH.NS", "HDFCBANK.NS", "HDFCLIFE.NS", "HEROMOTOCO.NS",
+    "HINDALCO.NS", "HINDUNILVR.NS", "ICICIBANK.NS", "INDUSINDBK.NS", "INFY.NS",
+    "ITC.NS", "JIOFIN.NS", "JSWSTEEL.NS", "KOTAKBANK.NS", "LT.NS",
+    "M&M.NS", "MARUTI.NS", "NESTLEIND.NS", "NTPC.NS", "ONGC.NS",
+    "POWERGRID.NS", "RELIANCE.NS", "SBILIFE.NS", "SBIN.NS", "SHRIRAMFIN.NS",
+    "SUNPHARMA.NS", "TATACONSUM.NS", "TATAMOTORS.NS", "TATASTEEL.NS", "TCS.NS",
+    "TECHM.NS", "TITAN.NS", "TRENT.NS", "ULTRACEMCO.NS", "WIPRO.NS",
+]
+
+
+def fetch_many(symbols, provider=None, period="1y", max_workers=8, cache=None, max_retries=3, rate_limit=None,
+               validation_policy=None, validate=True):
+    """
+    Fetch history for many symbols concurrently.
+    Returns (frames, errors): symbol -> DataFrame for successful fetches and
+    symbol -> error message for failures, so one bad ticker does not sink the batch.
+    Requests go through a FetchScheduler (backoff, rate limit, coalescing) unless
+    the provider already is one.
+    """
+    provider = provider if provider is not None else YahooProvider()
+    if not isinstance(provider, FetchScheduler):
+        provider = FetchScheduler(provider, max_retries=max_retries, rate_limit=rate_limit)
+    frames = {}
+    errors = {}
+
+    def fetch_one(symbol):
+        def download(period=None, start=None):
+            return provider.history(symbol, period=period, start=start)
+
+        if cache is not None:
+            data = cache.fetch(symbol, download, period=period)
+        else:
+            data = download(period=period)
+
+        if data is None or data.empty:
+            raise ValueError(f"No data received from {provider.name} provider")
+
+        if validate:
+            data, report = validate_ohlcv(data, policy=validation_policy)
+            if report['issues']:
+                logger.warning(f"Data validation for {symbol}: {summarize_report(report)}")
+        return data
+
+    start_time = time.perf_counter()
+    # Bounded pool: max_workers caps the number of requests in flight at once
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(fetch_one, symbol): symbol for symbol in symbols}
+        for future in as_completed(futures):
+            symbol = futures[future]
+            try:
+                frames[symbol] = future.result()
+            except Exception as e:
+                logger.warning(f"Fetch failed for {symbol}: {str(e)}")
+                errors[symbol] = str(e)
+
+    elapsed = time.perf_counter() - start_time
+    logger.info(f"Fetched {len(frames)}/{len(symbols)} symbols in {elapsed:.2f}s ({len(errors)} errors)")
+    return frames, errors
+
+
+def fetch_universe(provider=None, period="1y", max_workers=8, cache=None, include_index=True, **scheduler_options):
+    """Fetch the Nifty 50 index and all of its constituents"""
+    symbols = ([NIFTY_INDEX_SYMBOL] if include_index else []) + NIFTY50_SYMBOLS
+    return fetch_many(symbols, provider=provider, period=period, max_workers=max_workers, cache=cache,
+                      **scheduler_options)
@@ -0,0 +1,177 @@
+import logging
+import numpy as np
+import pandas as pd
+from data_providers import MarketDataProvider
+from signal_rules import DEFAULT_RULES
+from signal_series import signal_series, label_series
+
+logger = logging.getLogger(__name__)
+
+PRICE_WINDOWS = {'5DMA': 5, '50DMA': 50, '200DMA': 200}
+VOLUME_WINDOW = 20
+VOLATILITY_WINDOW = 20
+# Bars kept per symbol for screening: the 200DMA pair needs 201 and the 5DEMA replay
+# 300, after which its starting value weighs (2/3)**300 ~ 1e-53, far below float64
+# resolution, so the replay lands on the same value as one over the whole history
+TAIL_BARS = 300
+
+
+def stack_frames(frames, columns=('Close', 'Volume'), length=None):
+    """
+    Right-align per-symbol OHLCV frames on their own bar sequences: the last row
+    holds every symbol's last bar, the row before it each symbol's previous bar,
+    and shorter histories are padded with leading NaN. Rolling windows then cover
+    exactly the bars the per-symbol analyzer would use, whatever the calendar gaps.
+    With length, only each symbol's last `length` bars are kept.
+    Returns (symbols, matrices, last_timestamps).
+    """
+    symbols = list(frames)
+    longest = max((len(frames[symbol]) for symbol in symbols), default=0)
+    length = longest if length is None else min(longest, length)
+    stacked = {column: np.full((length, len(symbols)), np.nan) for column in columns}
+    for j, symbol in enumerate(symbols):
+        frame = frames[symbol]
+        rows = min(len(frame), length)
+        for column in columns:
+            if rows:
+                stacked[column][length - rows:, j] = frame[column].to_numpy()[len(frame) - rows:]
+    return symbols, stacked, _last_timestamps([frames[symbol].index for symbol in symbols])
+
+
+def _last_timestamps(indexes):
+    """
+    Last timestamp of each index (NaT/None when empty). DatetimeIndexes sharing a
+    time zone are read as raw datetime64 values and converted in one call.
+    """
+    zones = {index.tz for index in indexes if isinstance(index, pd.DatetimeIndex) and len(index)}
+    if len(zones) != 1 or not all(isinstance(index, pd.DatetimeIndex) for index in indexes):
+        return [index[-1] if len(index) else None for index in indexes]
+    stamps = np.array([index.values[-1] if len(index) else np.datetime64('NaT') for index in indexes],
+                      dtype='datetime64[ns]')
+    # Tz-aware values are UTC
+    zone = zones.pop()
+    return pd.DatetimeIndex(stamps) if zone is None else pd.DatetimeIndex(stamps).tz_localize('UTC').tz_convert(zone)
+
+
+def _tail_means(values, window):
+    """Window means ending at the last and the previous row, NaN where a window holds a NaN"""
+    n = values.shape[0]
+    latest = values[n - window:].mean(axis=0) if n >= window else np.full(values.shape[1:], np.nan)
+    previous = values[n - window - 1:n - 1].mean(axis=0) if n > window else np.full(values.shape[1:], np.nan)
+    return latest, previous
+
+
+def _ema_last_two(values, span):
+    """
+    Last two rows of pandas' column-wise ewm(span=span, adjust=False).mean(),
+    replayed one row at a time across all columns with the same floating-point
+    operations, so the results are bit-identical. Columns with a NaN after their
+    first value are left to pandas, which reweights across the gap.
+    """
+    alpha = 1.0 / (1.0 + (span - 1) / 2.0)
+    factor = 1.0 - alpha
+    denominator = factor + alpha
+    n, width = values.shape
+    present = ~np.isnan(values)
+    first = np.where(present.any(axis=0), present.argmax(axis=0), n)
+    leading = np.arange(n)[:, None] < first
+    gaps = (~present & ~leading).any(axis=0)
+
+    # Padding takes the first value, so the replay leaves it untouched until the series starts
+    filled = np.where(leading, values[np.minimum(first, n - 1), np.arange(width)], values)
+    scaled = alpha * filled
+    weighted = filled[0].copy()
+    update = np.empty_like(weighted)
+    changed = np.empty(width, dtype=bool)
+    previous = weighted.copy()
+    for row in range(1, n):
+        if row == n - 1:
+            previous = weighted.copy()
+        np.multiply(weighted, factor, out=update)
+        update += scaled[row]
+        update /= denominator
+        # pandas keeps the value when the new bar equals it
+        np.not_equal(weighted, filled[row], out=changed)
+        np.copyto(weighted, update, where=changed)
+    latest = weighted
+
+    if gaps.any():
+        ema = pd.DataFrame(values[:, gaps]).ewm(span=span, adjust=False).mean().to_numpy()
+        latest[gaps], previous[gaps] = ema[-1], ema[-2]
+    return latest, previous
+
+
+def tail_batch_indicators(close, volume=None, periods_per_year=252):
+    """
+    The calculate_moving_averages indicator set at the last two rows of
+    right-aligned (bars x symbol) matrices (see stack_frames). The 5DEMA is
+    replayed over every row given; every other indicator reads its last window.
+    Returns (latest, previous) dicts of per-symbol arrays, including Close (and
+    Volume and Volume_SMA when volume is given).
+    """
+    close = np.asarray(close, dtype='float64')
+    latest = {'Close': close[-1]}
+    previous = {'Close': close[-2]}
+
+    for name, window in PRICE_WINDOWS.items():
+        latest[name], previous[name] = _tail_means(close, window)
+    if volume is not None:
+        volume = np.asarray(volume, dtype='float64')
+        latest['Volume'], previous['Volume'] = volume[-1], volume[-2]
+        latest['Volume_SMA'], previous['Volume_SMA'] = _tail_means(volume, VOLUME_WINDOW)
+
+    latest['5DEMA'], previous['5DEMA'] = _ema_last_two(close, 5)
+
+    tail = close[-(VOLATILITY_WINDOW + 2):]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = tail[1:] / tail[:-1] - 1
+    latest['Price_Change'], previous['Price_Change'] = returns[-1], returns[-2]
+    annualise = np.sqrt(periods_per_year)
+    for row, stop in ((latest, len(returns)), (previous, len(returns) - 1)):
+        window = returns[stop - VOLATILITY_WINDOW:stop]
+        row['Volatility'] = (window.std(axis=0, ddof=1) * annualise if len(window) == VOLATILITY_WINDOW
+                             else np.full(close.shape[1], np.nan))
+    return latest, previous
+
+
+def screen(frames, periods_per_year=252, analyzer=None, details=False):
+    """
+    Run the moving-average signal analysis for many symbols at once. The last
+    TAIL_BARS bars of every symbol are right-aligned on its own bar sequence (see
+    stack_frames) and the signal rules score all symbols' last two rows in one
+    vectorized pass, so the signals match running the analyzer on each symbol
+    alone, gaps included. Rules come from analyzer when given (default DEFAULT_RULES).
+    Returns a DataFrame indexed by symbol with the last bar's date, close and
+    volatility, the signals and strengths, overall trend and recommendation. With
+    details=True returns symbol -> signals dict (same shape as
+    NiftyWebAnalyzer.results) instead, built per symbol by analyzer.build_signals.
+    """
+    columns = ('Close', 'Volume') if details else ('Close',)
+    symbols, matrices, last_timestamps = stack_frames(frames, columns, length=TAIL_BARS)
+    screened = []
+    for j, symbol in enumerate(symbols):
+        if len(frames[symbol]) < 2:
+            logger.warning(f"Not enough bars to screen {symbol}")
+        else:
+            screened.append(j)
+    if not screened:
+        return {} if details else pd.DataFrame()
+    latest, previous = tail_batch_indicators(matrices['Close'], matrices.get('Volume'), periods_per_year)
+
+    if details:
+        if analyzer is None:
+            # Imported lazily so the indicator functions stay usable without the analyzer
+            from main_web import NiftyWebAnalyzer
+            analyzer = NiftyWebAnalyzer(provider=MarketDataProvider())
+        return {symbols[j]: analyzer.build_signals({name: values[j] for name, values in latest.items()},
+                                                   {name: values[j] for name, values in previous.items()},
+                                                   last_timestamps[j])
+                for j in screened}
+
+    rows = {name: np.stack([previous[name], latest[name]]) for name in ('Close', '5DMA', '5DEMA', '50DMA', '200DMA')}
+    series = signal_series(rows, rules=analyzer.rules if analyzer is not None else DEFAULT_RULES)
+    table = label_series({name: values[-1] for name, values in series.items()}, index=pd.Index(symbols, name='symbol'))
+    table.insert(0, 'date', last_timestamps)
+    table.insert(1, 'close', latest['Close'])
+    table.insert(2, 'volatility', latest['Volatility'])
+    return table.iloc[screened]
@@ -0,0 +1,408 @@
+import argparse
+import tempfile
+import time
+import tracemalloc
+import logging
+import numpy as np
+import pandas as pd
+from data_providers import ReplayProvider, save_fixture
+from main_web import NiftyWebAnalyzer
+from data_validation import validate_ohlcv
+from tick_stream import run_throughput
+from compact import to_compact, compare_compact_accuracy, COMPACT_TOLERANCES
+from ma_kernel import multi_window_sma
+from batch_indicators import screen
+from oscillators import compute_oscillators
+from rolling_stats import rolling_mean_var, RollingVariance
+from indicator_registry import DEFAULT_REGISTRY
+from signal_series import signal_series
+from backtest import backtest
+
+logger = logging.getLogger(__name__)
+
+
+def synthetic_ohlcv(n_bars, start="2000-01-03", seed=42, freq="B"):
+    """Generate a random-walk OHLCV frame with Yahoo-style columns"""
+    rng = np.random.default_rng(seed)
+    index = pd.date_range(start, periods=n_bars, freq=freq, tz="Asia/Kolkata")
+    returns = rng.normal(0.0004, 0.011, n_bars)
+    # Fold the log-price walk into [-1, 1] so multi-million-bar series stay at realistic levels
+    log_price = np.abs((np.cumsum(returns) + 1) % 4 - 2) - 1
+    close = 10000 * np.exp(log_price)
+    open_ = close * (1 + rng.normal(0, 0.003, n_bars))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.004, n_bars)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.004, n_bars)))
+    volume = rng.integers(100_000, 1_000_000, n_bars)
+    return pd.DataFrame(
+        {'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Volume': volume},
+        index=index
+    )
+
+
+def time_call(func, repeat=5):
+    """Return the best wall time of several calls in seconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_pipeline(n_bars=5000, repeat=5, latency=0.0):
+    """Time fetch + indicators + signals against the offline replay provider"""
+    with tempfile.TemporaryDirectory() as fixture_dir:
+        save_fixture(synthetic_ohlcv(n_bars), fixture_dir, "^NSEI")
+        provider = ReplayProvider(fixture_dir, latency=latency)
+
+        def run():
+            analyzer = NiftyWebAnalyzer(provider=provider)
+            analyzer.fetch_data(period="max")
+            analyzer.calculate_moving_averages()
+            analyzer.generate_signals()
+
+        elapsed = time_call(run, repeat)
+    print(f"pipeline  bars={n_bars:>9,}  best={elapsed * 1000:9.2f} ms")
+    return elapsed
+
+
+def bench_validation(n_bars=100_000, repeat=5):
+    """Time the OHLCV validation stage on a frame with a sprinkling of bad bars"""
+    data = synthetic_ohlcv(n_bars)
+    rng = np.random.default_rng(0)
+    bad_rows = rng.choice(n_bars, size=max(1, n_bars // 1000), replace=False)
+    data.iloc[bad_rows, data.columns.get_loc('Close')] = np.nan
+    data.iloc[bad_rows[::2], data.columns.get_loc('Volume')] = 0
+
+    elapsed = time_call(lambda: validate_ohlcv(data), repeat)
+    print(f"validation  bars={n_bars:>9,}  best={elapsed * 1000:9.2f} ms  "
+          f"({elapsed * 1000 / (n_bars / 1000):.4f} ms per 1k bars)")
+    return elapsed
+
+
+def bench_ticks(n_bars=5_000_000, repeat=1):
+    """Measure tick-to-bar aggregation throughput (n_bars is the number of ticks here)"""
+    result = run_throughput(n_ticks=n_bars)
+    print(f"ticks  n={n_bars:>11,}  batched={result['batched_ticks_per_second'] / 1e6:8.1f} M ticks/s  "
+          f"per-tick={result['per_tick_ticks_per_second'] / 1e6:6.2f} M ticks/s  bars={result['bars']:,}")
+    return result
+
+
+def bench_compact(n_bars=1_000_000, repeat=3):
+    """Compare memory, time and accuracy of compact (float32) mode against the float64 path"""
+    data = synthetic_ohlcv(n_bars)
+    data['Dividends'] = 0.0
+    data['Stock Splits'] = 0.0
+    results = {}
+    for compact in (False, True):
+        def run():
+            analyzer = NiftyWebAnalyzer(provider=object(), compact=compact)
+            analyzer.data = data.copy()
+            if compact:
+                analyzer.data = to_compact(analyzer.data)
+            analyzer.calculate_moving_averages()
+            results[compact] = analyzer.data.memory_usage(deep=True).sum()
+
+        elapsed = time_call(run, repeat)
+        print(f"compact={str(compact):5}  bars={n_bars:>9,}  best={elapsed * 1000:9.2f} ms  "
+              f"frame={results[compact] / 1e6:8.1f} MB")
+
+    # Also measure a history with a missing close, which must stay NaN-aware
+    gapped = data.copy()
+    gapped.iloc[min(100, n_bars - 1), gapped.columns.get_loc('Close')] = np.nan
+    over = []
+    for label, frame in (("clean", data), ("one NaN close", gapped)):
+        errors = compare_compact_accuracy(frame)
+        print(f"  accuracy ({label}):")
+        for name, error in errors.items():
+            status = "ok" if error <= COMPACT_TOLERANCES[name] else "OVER TOLERANCE"
+            if status != "ok":
+                over.append(f"{name} ({label})")
+            print(f"    {name:<13} max error {error:.2e}  (tolerance {COMPACT_TOLERANCES[name]:.0e}) {status}")
+    if over:
+        raise SystemExit(f"compact mode is over tolerance for: {', '.join(over)}")
+    return errors
+
+
+def bench_kernel(n_bars=None, repeat=3):
+    """Compare four pandas rolling means with the single-pass multi-window kernel, 1k to 10M bars"""
+    sizes = [n_bars] if n_bars else [1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+    windows = [5, 50, 200, 20]
+    for size in sizes:
+        close = synthetic_ohlcv(size)['Close']
+        out = np.empty((len(windows), size))
+
+        def run_pandas():
+            return [close.rolling(window=w).mean() for w in windows]
+
+        pandas_time = time_call(run_pandas, repeat)
+        kernel_time = time_call(lambda: multi_window_sma(close.to_numpy(), windows, out=out), repeat)
+        reference = run_pandas()
+        drift = max(np.nanmax(np.abs(out[i] / reference[i].to_numpy() - 1)) for i in range(len(windows)))
+        print(f"kernel  bars={size:>11,}  pandas={pandas_time * 1000:9.2f} ms  kernel={kernel_time * 1000:9.2f} ms  "
+              f"speedup={pandas_time / kernel_time:5.2f}x  max rel diff={drift:.1e}")
+
+
+def bench_batch(n_bars=2500, repeat=3, n_symbols=500):
+    """Screen many symbols one analyzer at a time versus one batched 2-D pass"""
+    frames = {}
+    for i in range(n_symbols):
+        # Stagger listing dates so the aligned matrix is ragged
+        listed = i % 10 * (n_bars // 20)
+        frame = synthetic_ohlcv(n_bars, seed=i).iloc[listed:]
+        if i % 7 == 0:
+            # A missed session inside the history (must not blank the long windows)
+            frame = frame.drop(frame.index[-60])
+        frames[f"SYM{i:03d}.NS"] = frame
+    analyzer = NiftyWebAnalyzer(provider=ReplayProvider(tempfile.gettempdir()))
+
+    def run_loop(symbols):
+        results = {}
+        for symbol in symbols:
+            analyzer.data = frames[symbol].copy()
+            analyzer.calculate_moving_averages()
+            analyzer.generate_signals()
+            results[symbol] = analyzer.results
+        return results
+
+    loop_time = time_call(lambda: run_loop(frames), repeat)
+    five_time = time_call(lambda: run_loop(list(frames)[:5]), repeat)
+    batch_time = time_call(lambda: screen(frames, analyzer=analyzer), repeat)
+    expected = run_loop(frames)
+    table = screen(frames, analyzer=analyzer)
+    matches = expected == screen(frames, analyzer=analyzer, details=True) and all(
+        (row.short_signal, row.medium_signal, row.long_signal, row.overall_trend) ==
+        tuple(expected[symbol][name]['signal'] for name in ('short_term', 'medium_term', 'long_term')) +
+        (expected[symbol]['overall_trend'],) for symbol, row in table.iterrows())
+    print(f"batch  symbols={n_symbols}  bars={n_bars:>7,}  loop={loop_time * 1000:9.2f} ms  "
+          f"batched={batch_time * 1000:9.2f} ms  speedup={loop_time / batch_time:5.2f}x  "
+          f"5-symbol loop={five_time * 1000:7.2f} ms  signals {'identical' if matches else 'DIFFER'}")
+    return loop_time, batch_time
+
+
+def _pandas_oscillators(data):
+    """Reference oscillator pack as one pandas call per column"""
+    high, low, close = data['High'], data['Low'], data['Close']
+
+    def wilder(series, period, first):
+        series = series.copy()
+        seed = series.iloc[first:first + period].mean()
+        series.iloc[:first + period - 1] = np.nan
+        series.iloc[first + period - 1] = seed
+        return series.ewm(alpha=1 / period, adjust=False).mean()
+
+    delta = close.diff()
+    average_gain, average_loss = wilder(delta.clip(lower=0), 14, 1), wilder((-delta).clip(lower=0), 14, 1)
+    previous_close = close.shift()
+    true_range = pd.concat([high - low, (high - previous_close).abs(), (low - previous_close).abs()], axis=1).max(axis=1)
+    macd = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+    middle, deviation = close.rolling(20).mean(), close.rolling(20).std(ddof=0)
+    highest, lowest = high.rolling(14).max(), low.rolling(14).min()
+    stoch_k = 100 * (close - lowest) / (highest - lowest)
+    return {
+        'RSI': 100 - 100 / (1 + average_gain / average_loss),
+        'ATR': wilder(true_range, 14, 0),
+        'MACD': macd,
+        'MACD_Signal': macd.ewm(span=9, adjust=False).mean(),
+        'BB_Upper': middle + 2 * deviation,
+        'BB_Lower': middle - 2 * deviation,
+        'Stoch_K': stoch_k,
+        'Stoch_D': stoch_k.rolling(3).mean(),
+    }
+
+
+def bench_oscillators(n_bars=1_000_000, repeat=3):
+    """Compare the NumPy oscillator pack with per-column pandas calls"""
+    data = synthetic_ohlcv(n_bars)
+    arrays = data['High'].to_numpy(), data['Low'].to_numpy(), data['Close'].to_numpy()
+    pandas_time = time_call(lambda: _pandas_oscillators(data), repeat)
+    numpy_time = time_call(lambda: compute_oscillators(*arrays), repeat)
+    computed, reference = compute_oscillators(*arrays), _pandas_oscillators(data)
+    drift = max(np.nanmax(np.abs(computed[name] - values.to_numpy()) / np.maximum(np.abs(values.to_numpy()), 1))
+                for name, values in reference.items())
+    print(f"oscillators  bars={n_bars:>11,}  pandas={pandas_time * 1000:9.2f} ms  numpy={numpy_time * 1000:9.2f} ms  "
+          f"max rel diff={drift:.1e}")
+    return pandas_time, numpy_time
+
+
+def bench_tail(n_bars=250, repeat=5, n_runs=200):
+    """Full indicator frame + signals versus the tail-only signal path"""
+    data = synthetic_ohlcv(n_bars)
+    analyzer = NiftyWebAnalyzer(provider=ReplayProvider(tempfile.gettempdir()))
+
+    def run_full():
+        for _ in range(n_runs):
+            analyzer.data = data.copy()
+            analyzer.calculate_moving_averages()
+            analyzer.generate_signals()
+        return analyzer.results
+
+    def run_tail():
+        for _ in range(n_runs):
+            analyzer.data = data
+            analyzer.generate_signals(tail=True)
+        return analyzer.results
+
+    full_time = time_call(run_full, repeat) / n_runs
+    tail_time = time_call(run_tail, repeat) / n_runs
+    matches = run_full() == run_tail()
+    print(f"tail  bars={n_bars:>9,}  full={full_time * 1000:7.3f} ms  tail={tail_time * 1000:7.3f} ms  "
+          f"speedup={full_time / tail_time:5.2f}x  signals {'identical' if matches else 'DIFFER'}")
+    return full_time, tail_time
+
+
+def _longdouble_rolling_var(values, window, chunk_rows=1_000_000):
+    """High-precision reference: two-pass rolling variance in extended precision"""
+    values = np.asarray(values, dtype=np.longdouble)
+    variance = np.full(len(values), np.nan, dtype=np.longdouble)
+    windows = np.lib.stride_tricks.sliding_window_view(values, window)
+    for start in range(0, len(windows), chunk_rows):
+        chunk = windows[start:start + chunk_rows]
+        centred = chunk - chunk.mean(axis=-1, keepdims=True)
+        variance[start + window - 1:start + window - 1 + len(chunk)] = (centred * centred).sum(axis=-1) / (window - 1)
+    return variance
+
+
+def bench_variance(n_bars=10_000_000, repeat=1, window=20):
+    """
+    Rolling variance of closes (level ~1e4, so cancellation-prone) against an
+    extended-precision two-pass reference: batch and streaming Welford engine,
+    pandas, and the naive running sum / sum-of-squares form.
+    """
+    close = synthetic_ohlcv(n_bars)['Close'].to_numpy()
+    reference = _longdouble_rolling_var(close, window)
+
+    def naive():
+        sums = np.cumsum(np.r_[0.0, close])
+        squares = np.cumsum(np.r_[0.0, close * close])
+        window_sum = sums[window:] - sums[:-window]
+        variance = np.full(n_bars, np.nan)
+        variance[window - 1:] = (squares[window:] - squares[:-window] - window_sum * window_sum / window) / (window - 1)
+        return variance
+
+    def streaming():
+        engine = RollingVariance(window)
+        return np.array([engine.update(value) for value in close.tolist()])
+
+    candidates = {
+        'batch': lambda: rolling_mean_var(close, window)[1],
+        'streaming': streaming,
+        'pandas': lambda: pd.Series(close).rolling(window).var().to_numpy(),
+        'naive sums': naive,
+    }
+    errors = {}
+    for name, func in candidates.items():
+        start = time.perf_counter()
+        variance = func()
+        elapsed = time.perf_counter() - start
+        errors[name] = float(np.nanmax(np.abs(variance - reference) / reference))
+        print(f"variance  {name:<10} bars={n_bars:>11,}  time={elapsed * 1000:10.2f} ms  "
+              f"max rel error={errors[name]:.1e}")
+    return errors
+
+
+def _peak_memory(func):
+    """Run func once and return (wall seconds, peak traced allocation in bytes)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def bench_frame(n_bars=1_000_000, repeat=3):
+    """
+    Indicator frame construction: the previous column-by-column inserts into the
+    OHLCV frame versus the preallocated indicator block joined in one step (and
+    signals read straight from the block, with no frame assembled at all).
+    """
+    data = synthetic_ohlcv(n_bars)
+    analyzer = NiftyWebAnalyzer(provider=ReplayProvider(tempfile.gettempdir()))
+
+    def column_inserts():
+        frame = data.copy()
+        for name, values in DEFAULT_REGISTRY.compute(frame, periods_per_year=252).items():
+            frame[name] = values
+        return frame.iloc[-1]
+
+    def block_frame():
+        analyzer.data = data.copy()
+        analyzer.calculate_moving_averages()
+        return analyzer.data.iloc[-1]
+
+    def block_signals():
+        analyzer.data = data.copy()
+        analyzer.calculate_moving_averages()
+        analyzer.generate_signals()
+
+    def blocks(frame):
+        return frame._mgr.nblocks
+
+    results = {}
+    for name, func in (('column inserts', column_inserts), ('block + frame', block_frame),
+                       ('block, signals only', block_signals)):
+        best = time_call(func, repeat)
+        _, peak = _peak_memory(func)
+        results[name] = (best, peak)
+        print(f"frame  {name:<20} bars={n_bars:>10,}  best={best * 1000:9.2f} ms  peak={peak / 2 ** 20:8.1f} MB")
+
+    frame = data.copy()
+    for name, values in DEFAULT_REGISTRY.compute(frame, periods_per_year=252).items():
+        frame[name] = values
+    analyzer.data = data.copy()
+    analyzer.calculate_moving_averages()
+    print(f"frame  pandas blocks: column inserts={blocks(frame)}  indicator block={blocks(analyzer.data)}")
+    return results
+
+
+def bench_backtest(n_bars=2520, repeat=5, cost_bps=5.0):
+    """Signals + vectorized backtest timing (default: ten years of daily bars)"""
+    analyzer = NiftyWebAnalyzer(provider=ReplayProvider(tempfile.gettempdir()))
+    analyzer.data = synthetic_ohlcv(n_bars)
+    analyzer.calculate_moving_averages()
+    data = analyzer.data
+    close = data['Close'].to_numpy()
+    recommendation = signal_series(data)['recommendation']
+
+    signal_time = time_call(lambda: signal_series(data), repeat)
+    vector_time = time_call(lambda: backtest(close, recommendation, cost_bps=cost_bps), repeat)
+    summary = backtest(close, recommendation, cost_bps=cost_bps)['summary']
+    print(f"backtest  bars={n_bars:>9,}  signals={signal_time * 1000:7.3f} ms  backtest={vector_time * 1000:7.3f} ms")
+    print(f"backtest  return={summary['total_return']:+.2%}  max_drawdown={summary['max_drawdown']:.2%}  "
+          f"hit_rate={summary['hit_rate']:.2%}  trades={summary['trades']}  turnover={summary['turnover']:.1f}/yr")
+    return signal_time, vector_time
+
+
+BENCHMARKS = {
+    'pipeline': bench_pipeline,
+    'validation': bench_validation,
+    'ticks': bench_ticks,
+    'compact': bench_compact,
+    'kernel': bench_kernel,
+    'batch': bench_batch,
+    'oscillators': bench_oscillators,
+    'tail': bench_tail,
+    'variance': bench_variance,
+    'frame': bench_frame,
+    'backtest': bench_backtest,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline performance benchmarks")
+    parser.add_argument('benchmark', choices=sorted(BENCHMARKS), nargs='?', default='pipeline')
+    parser.add_argument('--bars', type=int, default=None, help="Number of bars (default: per benchmark)")
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    options = {'repeat': args.repeat}
+    if args.bars is not None:
+        options['n_bars'] = args.bars
+    BENCHMARKS[args.benchmark](**options)
+
+
+if __name__ == "__main__":
+    main()
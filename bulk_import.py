@@ -0,0 +1,251 @@
+import os
+import io
+import time
+import tempfile
+import argparse
+import logging
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from history_store import HistoryStore
+from data_validation import validate_ohlcv
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_ROWS = 250_000
+FIELDS = ['Open', 'High', 'Low', 'Close', 'Volume']
+CSV_DTYPES = {'Open': 'float64', 'High': 'float64', 'Low': 'float64', 'Close': 'float64', 'Volume': 'float64'}
+DATE_ALIASES = ('date', 'datetime', 'timestamp', 'time')
+
+
+def _csv_columns(path):
+    """Map the vendor's header names onto Date/Open/High/Low/Close/Volume (case-insensitive)"""
+    header = pd.read_csv(path, nrows=0).columns
+    lookup = {name.strip().lower(): name for name in header}
+    date_col = next((lookup[a] for a in DATE_ALIASES if a in lookup), None)
+    if date_col is None:
+        raise ValueError(f"{path}: no date column (expected one of {', '.join(DATE_ALIASES)})")
+
+    columns = {}
+    for field in FIELDS:
+        if field.lower() in lookup:
+            columns[lookup[field.lower()]] = field
+    if 'Close' not in columns.values():
+        raise ValueError(f"{path}: no Close column")
+    return date_col, columns
+
+
+def _iter_csv_chunks(path, chunk_rows, tz, date_format=None):
+    date_col, columns = _csv_columns(path)
+    reader = pd.read_csv(
+        path,
+        usecols=[date_col] + list(columns),
+        dtype={vendor: CSV_DTYPES[field] for vendor, field in columns.items()},
+        chunksize=chunk_rows,
+    )
+    for chunk in reader:
+        index = pd.to_datetime(chunk[date_col], format=date_format)
+        index = index.dt.tz_localize(tz) if index.dt.tz is None else index.dt.tz_convert(tz)
+        chunk = chunk.drop(columns=[date_col]).rename(columns=columns)
+        chunk.index = pd.DatetimeIndex(index)
+        yield chunk
+
+
+def _iter_npy_chunks(path, chunk_rows, tz, reverse=False):
+    """
+    Yield frames from a structured .npy array (a date/timestamp field plus OHLCV
+    fields). With reverse (a newest-first array) the blocks are read from the end
+    so the frames still come oldest first.
+    """
+    array = np.load(path, mmap_mode='r')
+    if array.dtype.names is None:
+        raise ValueError(f"{path}: expected a structured array with named fields")
+
+    lookup = {name.lower(): name for name in array.dtype.names}
+    date_field = next((lookup[a] for a in DATE_ALIASES if a in lookup), None)
+    if date_field is None:
+        raise ValueError(f"{path}: no date field")
+    fields = {lookup[f.lower()]: f for f in FIELDS if f.lower() in lookup}
+
+    starts = range(0, len(array), chunk_rows)
+    for start in (reversed(starts) if reverse else starts):
+        # Only this slice is paged in and copied out of the memory map
+        block = array[start:start + chunk_rows]
+        if reverse:
+            block = block[::-1]
+        timestamps = block[date_field]
+        if not np.issubdtype(timestamps.dtype, np.datetime64):
+            timestamps = timestamps.astype('int64').view('datetime64[ns]')
+        index = pd.DatetimeIndex(timestamps)
+        index = index.tz_localize('UTC').tz_convert(tz) if index.tz is None else index.tz_convert(tz)
+        yield pd.DataFrame({field: np.asarray(block[name]) for name, field in fields.items()}, index=index)
+
+
+def _utc_ns(index):
+    """Timestamps of a DatetimeIndex as UTC nanoseconds (naive values are taken as UTC)"""
+    return pd.DatetimeIndex(index).values.astype('datetime64[ns]').view('int64')
+
+
+def _last_csv_line(path, block_size=65536):
+    """Return the last non-empty line of a text file, reading backwards from the end"""
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        tail = b''
+        while position > 0:
+            step = min(block_size, position)
+            position -= step
+            f.seek(position)
+            tail = f.read(step) + tail
+            lines = tail.rstrip(b'\r\n').split(b'\n')
+            if len(lines) > 1 or position == 0:
+                return lines[-1].decode()
+    return ''
+
+
+def _is_newest_first(path, date_format=None):
+    """True when the file's first row is dated after its last row (a newest-first export)"""
+    if path.endswith('.npy'):
+        array = np.load(path, mmap_mode='r')
+        if array.dtype.names is None or len(array) < 2:
+            return False
+        lookup = {name.lower(): name for name in array.dtype.names}
+        date_field = next((lookup[a] for a in DATE_ALIASES if a in lookup), None)
+        # Raw int64 or datetime64 values order the same way as the timestamps
+        return date_field is not None and array[date_field][0] > array[date_field][-1]
+
+    date_col, _ = _csv_columns(path)
+    with open(path) as f:
+        header_line = f.readline()
+    first_row = pd.read_csv(path, usecols=[date_col], nrows=1)
+    if first_row.empty:
+        return False
+    last_row = pd.read_csv(io.StringIO(header_line + _last_csv_line(path)), usecols=[date_col])
+    dates = pd.to_datetime(pd.concat([first_row, last_row])[date_col], format=date_format, utc=True)
+    return dates.iloc[0] > dates.iloc[-1]
+
+
+def _reversed_chunks(chunks):
+    """
+    Yield the frames of a newest-first file oldest first. Chunks are spooled to a
+    temporary directory and replayed backwards, so memory stays at one chunk.
+    """
+    with tempfile.TemporaryDirectory(prefix="bulk_import_") as spool:
+        count = 0
+        for chunk in chunks:
+            chunk.to_pickle(os.path.join(spool, f"{count}.pkl"))
+            count += 1
+        for i in reversed(range(count)):
+            yield pd.read_pickle(os.path.join(spool, f"{i}.pkl")).iloc[::-1]
+
+
+def import_file(path, store_root, symbol, chunk_rows=DEFAULT_CHUNK_ROWS, tz="Asia/Kolkata",
+                date_format=None, validate=True):
+    """Import one CSV or .npy file into the history store, replacing any stored history for the symbol"""
+    store = HistoryStore(store_root)
+    start_time = time.perf_counter()
+    # Vendors often export newest first; chunks must reach the store oldest first
+    newest_first = _is_newest_first(path, date_format)
+    if path.endswith('.npy'):
+        chunks = _iter_npy_chunks(path, chunk_rows, tz, reverse=newest_first)
+    else:
+        chunks = _iter_csv_chunks(path, chunk_rows, tz, date_format)
+        if newest_first:
+            chunks = _reversed_chunks(chunks)
+    if newest_first:
+        logger.info(f"{path}: rows are newest first, importing in reverse")
+
+    rows_read = 0
+    rows_stored = 0
+    last = None
+    for i, chunk in enumerate(chunks):
+        rows_read += len(chunk)
+        if validate:
+            chunk, _ = validate_ohlcv(chunk)
+        if chunk.empty:
+            continue
+        # append() only keeps bars newer than the stored tail, so an out-of-order
+        # chunk would be dropped silently; refuse the file instead
+        stamps = _utc_ns(chunk.index)
+        if last is not None and stamps.min() <= last:
+            raise ValueError(f"{path}: chunk {i} starts at {chunk.index.min()}, at or before the last "
+                             f"stored bar; rows are not in time order")
+        rows_stored += store.write(symbol, chunk) if last is None else store.append(symbol, chunk)
+        last = stamps.max()
+
+    return {
+        'symbol': symbol,
+        'rows_read': rows_read,
+        'rows_stored': rows_stored,
+        'seconds': time.perf_counter() - start_time,
+    }
+
+
+def find_import_files(source_dir):
+    """Return (path, symbol) pairs for every CSV/NPY file in a directory"""
+    files = []
+    for name in sorted(os.listdir(source_dir)):
+        stem, ext = os.path.splitext(name)
+        if ext.lower() in ('.csv', '.npy'):
+            files.append((os.path.join(source_dir, name), stem))
+    return files
+
+
+def bulk_import(source_dir, store_root, workers=None, chunk_rows=DEFAULT_CHUNK_ROWS, symbol_suffix="",
+                tz="Asia/Kolkata", date_format=None, validate=True):
+    """Import every CSV/NPY archive in a directory into the history store using a process pool"""
+    files = find_import_files(source_dir)
+    if not files:
+        logger.warning(f"No CSV or NPY files found in {source_dir}")
+        return []
+
+    results = []
+    failures = 0
+    start_time = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(import_file, path, store_root, f"{stem}{symbol_suffix}",
+                            chunk_rows, tz, date_format, validate): path
+            for path, stem in files
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            path = futures[future]
+            try:
+                result = future.result()
+                results.append(result)
+                logger.info(f"[{done}/{len(files)}] {result['symbol']}: {result['rows_stored']:,} bars "
+                            f"in {result['seconds']:.2f}s")
+            except Exception as e:
+                failures += 1
+                logger.error(f"[{done}/{len(files)}] Failed to import {path}: {str(e)}")
+
+    elapsed = time.perf_counter() - start_time
+    total_rows = sum(r['rows_stored'] for r in results)
+    logger.info(f"Imported {total_rows:,} bars for {len(results)} symbols in {elapsed:.1f}s "
+                f"({total_rows / max(elapsed, 1e-9):,.0f} bars/s, {failures} failures)")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import historical OHLCV archives into the history store")
+    parser.add_argument('source_dir', help="Directory of vendor CSV exports or structured .npy arrays")
+    parser.add_argument('store_dir', help="HistoryStore root directory")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS, help="Rows parsed per chunk")
+    parser.add_argument('--suffix', default="", help="Suffix appended to file stems, e.g. .NS")
+    parser.add_argument('--tz', default="Asia/Kolkata", help="Timezone of naive timestamps")
+    parser.add_argument('--date-format', default=None, help="strftime format of the date column")
+    parser.add_argument('--no-validate', action='store_true', help="Skip OHLCV validation")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    results = bulk_import(args.source_dir, args.store_dir, workers=args.workers, chunk_rows=args.chunk_rows,
+                          symbol_suffix=args.suffix, tz=args.tz, date_format=args.date_format,
+                          validate=not args.no_validate)
+    return bool(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
@@ -0,0 +1,132 @@
+import logging
+import numpy as np
+import pandas as pd
+from rolling_stats import rolling_std
+
+logger = logging.getLogger(__name__)
+
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close']
+UNUSED_COLUMNS = ['Dividends', 'Stock Splits', 'Capital Gains', 'Adj Close']
+INDICATOR_COLUMNS = ['5DMA', '50DMA', '200DMA', '5DEMA', 'Volume_SMA', 'Price_Change', 'Volatility']
+
+# Accuracy of compact mode relative to the float64 path. Prices and indicators are
+# stored as float32 (24-bit mantissa) and sums are accumulated in float64, so:
+#   - moving averages, EMA and Volume_SMA stay within ~1e-7 relative error. At Nifty
+#     levels (~25,000) that is about 0.003 index points, below the 0.01 rounding in
+#     reports, but a value on a rounding boundary can still print 0.01 apart;
+#   - Price_Change stays within ~2e-7 absolute;
+#   - Volatility stays within ~1e-5 relative, because float32 closes perturb each
+#     daily return by ~1e-7 against a typical return of ~1e-2.
+# Signals can only differ when the close sits within ~1e-7 relative of a moving average.
+# Missing closes stay NaN and blank only the windows that contain them, as in pandas.
+# Missing volume is stored as 0 (integers have no NaN), so Volume_SMA then counts it as
+# zero volume where the float64 path gives NaN; compare_compact_accuracy reports any
+# such NaN mismatch as an infinite error.
+# compare_compact_accuracy() measures these errors on any frame.
+COMPACT_TOLERANCES = {
+    '5DMA': 5e-7, '50DMA': 5e-7, '200DMA': 5e-7, '5DEMA': 5e-7, 'Volume_SMA': 5e-7,
+    'Price_Change': 5e-7, 'Volatility': 5e-5,
+}
+
+
+def to_compact(data):
+    """Drop unused columns and store prices as float32 and volume as int32 (int64 if it overflows)"""
+    data = data.drop(columns=[c for c in UNUSED_COLUMNS if c in data.columns])
+    columns = {}
+    for col in data.columns:
+        if col in PRICE_COLUMNS:
+            columns[col] = data[col].to_numpy(dtype='float32')
+        elif col == 'Volume':
+            volume = data[col].fillna(0).to_numpy()
+            dtype = 'int32' if len(volume) == 0 or volume.max() <= np.iinfo('int32').max else 'int64'
+            columns[col] = volume.astype(dtype)
+        else:
+            columns[col] = data[col].to_numpy()
+    return pd.DataFrame(columns, index=data.index)
+
+
+def _window_sums(values, window):
+    """Sums of every full window (n - window + 1 of them) from one cumulative sum"""
+    cumsum = np.cumsum(values)
+    sums = cumsum[window - 1:].copy()
+    sums[1:] -= cumsum[:-window]
+    return sums
+
+
+def _rolling_mean_into(values, window, out):
+    """
+    Rolling mean of float64 values written into a float32 row. Like pandas
+    rolling(window).mean(), it is NaN until the window is full and while the
+    window holds a NaN; NaNs are counted per window (as in ma_kernel) so one
+    NaN bar does not poison every later window of the cumulative sum.
+    """
+    out[:window - 1] = np.nan
+    if len(values) < window:
+        out[:] = np.nan
+        return out
+    nan_mask = np.isnan(values)
+    if nan_mask.any():
+        sums = _window_sums(np.where(nan_mask, 0.0, values), window)
+        sums[_window_sums(nan_mask.astype('int64'), window) > 0] = np.nan
+    else:
+        sums = _window_sums(values, window)
+    np.divide(sums, window, out=out[window - 1:], casting='same_kind')
+    return out
+
+
+def compact_indicators(close, volume, periods_per_year=252):
+    """
+    Compute the moving-average indicator set into one preallocated float32 buffer.
+    Inputs are widened to float64 for accumulation; results are returned as a
+    dict of float32 row views into the shared buffer.
+    """
+    n = len(close)
+    buffer = np.empty((len(INDICATOR_COLUMNS), n), dtype='float32')
+    rows = dict(zip(INDICATOR_COLUMNS, buffer))
+    close64 = np.asarray(close, dtype='float64')
+    volume64 = np.asarray(volume, dtype='float64')
+
+    _rolling_mean_into(close64, 5, rows['5DMA'])
+    _rolling_mean_into(close64, 50, rows['50DMA'])
+    _rolling_mean_into(close64, 200, rows['200DMA'])
+    rows['5DEMA'][:] = pd.Series(close64).ewm(span=5, adjust=False).mean().to_numpy()
+    _rolling_mean_into(volume64, 20, rows['Volume_SMA'])
+
+    returns = np.empty(n)
+    returns[:1] = np.nan
+    returns[1:] = close64[1:] / close64[:-1] - 1
+    rows['Price_Change'][:] = returns
+
+    np.multiply(rolling_std(returns, 20), np.sqrt(periods_per_year), out=rows['Volatility'], casting='same_kind')
+    return rows
+
+
+def compare_compact_accuracy(data, periods_per_year=252):
+    """Return the max relative error of each compact indicator against the float64 pandas path"""
+    close = data['Close'].astype('float64')
+    reference = {
+        '5DMA': close.rolling(window=5).mean(),
+        '50DMA': close.rolling(window=50).mean(),
+        '200DMA': close.rolling(window=200).mean(),
+        '5DEMA': close.ewm(span=5, adjust=False).mean(),
+        'Volume_SMA': data['Volume'].astype('float64').rolling(window=20).mean(),
+    }
+    reference['Price_Change'] = close.pct_change()
+    reference['Volatility'] = reference['Price_Change'].rolling(window=20).std() * np.sqrt(periods_per_year)
+
+    compact = to_compact(data)
+    rows = compact_indicators(compact['Close'].to_numpy(), compact['Volume'].to_numpy(), periods_per_year)
+    errors = {}
+    for name, expected in reference.items():
+        expected = expected.to_numpy()
+        mask = ~np.isnan(expected)
+        if not np.array_equal(np.isnan(rows[name]), ~mask):
+            # NaN where the float64 path has a value (or the reverse) is not a rounding error
+            errors[name] = float('inf')
+            continue
+        if name in ('Price_Change',):
+            # Returns are near zero, so compare absolute error instead
+            errors[name] = float(np.max(np.abs(rows[name][mask] - expected[mask]), initial=0))
+        else:
+            errors[name] = float(np.max(np.abs(rows[name][mask] / expected[mask] - 1), initial=0))
+    return errors
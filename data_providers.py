@@ -0,0 +1,123 @@
+import os
+import re
+import time
+import random
+import logging
+import pandas as pd
+from ohlcv_cache import period_start
+
+logger = logging.getLogger(__name__)
+
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+class DataProviderError(Exception):
+    """Raised when a provider cannot return history for a symbol"""
+
+
+class MarketDataProvider:
+    """Base class for OHLCV history sources used by NiftyWebAnalyzer"""
+
+    name = "base"
+
+    def history(self, symbol, period="1y", start=None, interval="1d"):
+        """Return an OHLCV DataFrame for a symbol, either for a period or from a start date"""
+        raise NotImplementedError
+
+
+class YahooProvider(MarketDataProvider):
+    """OHLCV history from Yahoo Finance via yfinance"""
+
+    name = "yahoo"
+
+    def __init__(self, session=None):
+        # Imported lazily so offline providers work without yfinance installed
+        import yfinance as yf
+        self._yf = yf
+        # One HTTP session shared by every request (and thread) made through this provider;
+        # None lets yfinance use its own shared session
+        self.session = session
+
+    def history(self, symbol, period="1y", start=None, interval="1d"):
+        """Download history from Yahoo Finance"""
+        ticker = self._yf.Ticker(symbol, session=self.session)
+        if start is not None:
+            return ticker.history(start=start, interval=interval)
+        return ticker.history(period=period, interval=interval)
+
+
+class ReplayProvider(MarketDataProvider):
+    """
+    Offline provider that serves OHLCV history from local fixture files.
+    Fixtures are CSV files named after the symbol (e.g. '^NSEI.csv' or
+    '_NSEI.csv') with a Date index column. Latency and failures can be
+    injected to exercise retry and timing behaviour without a network.
+    """
+
+    name = "replay"
+
+    def __init__(self, fixture_dir, latency=0.0, jitter=0.0, failure_rate=0.0, seed=None, tz="Asia/Kolkata"):
+        self.fixture_dir = fixture_dir
+        self.tz = tz
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self._frames = {}
+
+    def fixture_path(self, symbol, interval="1d"):
+        """Return the fixture file for a symbol, preferring an interval-specific file"""
+        safe_symbol = re.sub(r'[^A-Za-z0-9_.-]', '_', symbol)
+        candidates = [
+            f"{symbol}_{interval}.csv", f"{safe_symbol}_{interval}.csv",
+            f"{symbol}.csv", f"{safe_symbol}.csv",
+        ]
+        for name in candidates:
+            path = os.path.join(self.fixture_dir, name)
+            if os.path.exists(path):
+                return path
+        raise DataProviderError(f"No fixture for {symbol} in {self.fixture_dir}")
+
+    def _load(self, symbol, interval):
+        key = (symbol, interval)
+        if key not in self._frames:
+            path = self.fixture_path(symbol, interval)
+            data = pd.read_csv(path, index_col=0)
+            data.index = pd.to_datetime(data.index, utc=True).tz_convert(self.tz)
+            if 'Volume' in data.columns:
+                data['Volume'] = data['Volume'].fillna(0).astype('int64')
+            self._frames[key] = data.sort_index()
+        return self._frames[key]
+
+    def _simulate_network(self, symbol):
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+        if self.failure_rate and self._random.random() < self.failure_rate:
+            raise DataProviderError(f"Injected failure fetching {symbol}")
+
+    def history(self, symbol, period="1y", start=None, interval="1d"):
+        """Serve fixture history, sliced like Yahoo would for the period or start date"""
+        self._simulate_network(symbol)
+        data = self._load(symbol, interval)
+
+        if start is not None:
+            start = pd.Timestamp(start)
+            start = start.tz_localize(data.index.tz) if start.tz is None else start
+            return data[data.index >= start].copy()
+
+        # Periods are measured back from the last fixture bar so replays are reproducible
+        first = period_start(period, data.index[-1])
+        if first is None:
+            return data.copy()
+        return data[data.index >= first].copy()
+
+
+def save_fixture(data, fixture_dir, symbol, interval="1d"):
+    """Write an OHLCV DataFrame as a replay fixture"""
+    os.makedirs(fixture_dir, exist_ok=True)
+    safe_symbol = re.sub(r'[^A-Za-z0-9_.-]', '_', symbol)
+    path = os.path.join(fixture_dir, f"{safe_symbol}_{interval}.csv")
+    columns = [c for c in OHLCV_COLUMNS if c in data.columns]
+    data[columns].to_csv(path, index_label='Date')
+    return path
@@ -0,0 +1,130 @@
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FLAG = 'flag'
+DROP = 'drop'
+REPAIR = 'repair'
+
+# Check name -> action. 'flag' only reports, 'drop' removes the bar, 'repair' fixes it in place.
+DEFAULT_POLICY = {
+    'duplicate_timestamp': DROP,   # keeps the last bar for each timestamp
+    'nan_close': DROP,
+    'nonpositive_price': DROP,
+    'high_low_inverted': REPAIR,   # swaps High and Low
+    'ohlc_out_of_range': REPAIR,   # widens High/Low to contain Open and Close
+    'zero_volume': FLAG,           # index bars often carry no volume
+    'price_jump': FLAG,            # split-style jumps; repair back-adjusts earlier bars
+}
+
+DEFAULT_JUMP_THRESHOLD = 0.25
+
+
+def validate_ohlcv(data, policy=None, jump_threshold=DEFAULT_JUMP_THRESHOLD):
+    """
+    Validate an OHLCV frame in a few vectorized passes and apply the policy.
+    Returns (clean_data, report). The input frame is returned unchanged (not
+    copied) when no bar needs to be dropped or repaired.
+    """
+    policy = {**DEFAULT_POLICY, **(policy or {})}
+    rows = len(data) if data is not None else 0
+    report = {'rows_in': rows, 'rows_out': rows, 'issues': {}, 'actions': {}}
+    if data is None or data.empty:
+        return data, report
+
+    if not data.index.is_monotonic_increasing:
+        data = data.sort_index(kind='stable')
+        report['actions']['unsorted_index'] = 'sorted'
+
+    has = {col: col in data.columns for col in ('Open', 'High', 'Low', 'Close', 'Volume')}
+    close = data['Close'].to_numpy(dtype='float64')
+    n = len(close)
+    drop = np.zeros(n, dtype=bool)
+    masks = {}
+
+    masks['duplicate_timestamp'] = data.index.duplicated(keep='last')
+    masks['nan_close'] = np.isnan(close)
+    price_cols = [c for c in ('Open', 'High', 'Low', 'Close') if has[c]]
+    prices = np.column_stack([data[c].to_numpy(dtype='float64') for c in price_cols])
+    masks['nonpositive_price'] = (prices <= 0).any(axis=1)
+
+    if has['High'] and has['Low']:
+        high = prices[:, price_cols.index('High')]
+        low = prices[:, price_cols.index('Low')]
+        masks['high_low_inverted'] = high < low
+        body_high = np.fmax(prices[:, price_cols.index('Open')], close) if has['Open'] else close
+        body_low = np.fmin(prices[:, price_cols.index('Open')], close) if has['Open'] else close
+        masks['ohlc_out_of_range'] = (body_high > np.fmax(high, low)) | (body_low < np.fmin(high, low))
+
+    if has['Volume']:
+        masks['zero_volume'] = data['Volume'].to_numpy() == 0
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = np.empty(n)
+        ratio[0] = 1.0
+        ratio[1:] = close[1:] / close[:-1]
+    masks['price_jump'] = np.abs(ratio - 1) > jump_threshold
+
+    for check, mask in masks.items():
+        count = int(mask.sum())
+        if count == 0:
+            continue
+        report['issues'][check] = count
+        action = policy.get(check, FLAG)
+        report['actions'][check] = action
+        if action == DROP:
+            drop |= mask
+
+    repairs = {check: masks[check] for check, action in report['actions'].items()
+               if action == REPAIR and check in masks}
+    if not drop.any() and not repairs:
+        return data, report
+
+    data = data.copy()
+
+    if 'high_low_inverted' in repairs:
+        mask = repairs['high_low_inverted']
+        high_values = data['High'].to_numpy(copy=True)
+        low_values = data['Low'].to_numpy(copy=True)
+        data['High'] = np.where(mask, low_values, high_values)
+        data['Low'] = np.where(mask, high_values, low_values)
+
+    if 'ohlc_out_of_range' in repairs:
+        body = [data['Close'].to_numpy()] + ([data['Open'].to_numpy()] if has['Open'] else [])
+        data['High'] = np.fmax.reduce([data['High'].to_numpy()] + body)
+        data['Low'] = np.fmin.reduce([data['Low'].to_numpy()] + body)
+
+    if 'nan_close' in repairs:
+        data['Close'] = data['Close'].ffill()
+
+    if 'price_jump' in repairs:
+        # Back-adjust every bar before a jump by the nearest whole split ratio (2:1, 1:5, ...);
+        # jumps that do not round to a split ratio are left alone
+        jump = repairs['price_jump'] & np.isfinite(ratio) & (ratio > 0)
+        safe_ratio = np.where(jump, ratio, 1.0)
+        split_ratio = np.where(safe_ratio >= 1, np.round(safe_ratio), 1 / np.maximum(np.round(1 / safe_ratio), 1))
+        jump_ratio = np.where(jump & (split_ratio != 1), split_ratio, 1.0)
+        factor = np.cumprod(jump_ratio[::-1])[::-1]
+        factor = np.append(factor[1:], 1.0)
+        for col in price_cols:
+            data[col] = data[col].to_numpy() * factor
+        if has['Volume']:
+            data['Volume'] = (data['Volume'].to_numpy() / factor).round().astype(data['Volume'].dtype)
+
+    if 'duplicate_timestamp' in repairs:
+        # Repairing a duplicate means keeping the last bar, same as dropping the earlier ones
+        drop |= repairs['duplicate_timestamp']
+
+    if drop.any():
+        data = data[~drop]
+    report['rows_out'] = len(data)
+    return data, report
+
+
+def summarize_report(report):
+    """Return a one-line human readable summary of a validation report"""
+    if not report['issues']:
+        return f"{report['rows_in']} bars, no issues"
+    issues = ', '.join(f"{check}={count} ({report['actions'][check]})" for check, count in report['issues'].items())
+    return f"{report['rows_in']} bars in, {report['rows_out']} out: {issues}"
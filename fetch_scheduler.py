@@ -0,0 +1,117 @@
+import time
+import random
+import threading
+import logging
+from concurrent.futures import Future
+from data_providers import MarketDataProvider
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASE_DELAY = 1.0
+DEFAULT_MAX_DELAY = 30.0
+
+# Sleeping exactly the computed wait can leave the bucket a rounding error short of
+# a token; without the tolerance acquire() would sleep again for a few femtoseconds
+TOKEN_TOLERANCE = 1e-9
+
+
+def backoff_delay(attempt, base_delay=DEFAULT_BASE_DELAY, max_delay=DEFAULT_MAX_DELAY, rng=random):
+    """Exponential backoff with full jitter: a random delay in [0, min(max_delay, base_delay * 2**attempt)]"""
+    return rng.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+class RateLimiter:
+    """Thread-safe token bucket allowing `rate` requests per second with bursts of up to `burst`"""
+
+    def __init__(self, rate, burst=1, clock=time.monotonic, sleep=time.sleep):
+        self.rate = float(rate)
+        self.burst = max(1, burst)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a request token is available"""
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1 - TOKEN_TOLERANCE:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            self._sleep(wait)
+
+
+class FetchScheduler(MarketDataProvider):
+    """
+    Provider wrapper that retries with exponential backoff and jitter, applies a
+    global rate limit and coalesces duplicate in-flight requests. Share one
+    scheduler between analyzers and batch fetches so they draw on the same limits.
+    """
+
+    def __init__(self, provider, max_retries=3, base_delay=DEFAULT_BASE_DELAY,
+                 max_delay=DEFAULT_MAX_DELAY, rate_limit=None, burst=1, seed=None, sleep=time.sleep,
+                 clock=time.monotonic):
+        self.provider = provider
+        self.name = provider.name
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.limiter = RateLimiter(rate_limit, burst, clock=clock, sleep=sleep) if rate_limit else None
+        self._sleep = sleep
+        self._rng = random.Random(seed)
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'coalesced': 0, 'retries': 0, 'failures': 0}
+
+    def history(self, symbol, period="1y", start=None, interval="1d"):
+        """Fetch history, joining an identical request already in flight if there is one"""
+        key = (symbol, period, str(start) if start is not None else None, interval)
+        with self._lock:
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._in_flight[key] = future
+            else:
+                self.stats['coalesced'] += 1
+
+        if not owner:
+            # Callers get their own copy so one cannot mutate another's frame
+            data = future.result()
+            return data.copy() if data is not None else None
+
+        try:
+            data = self._fetch_with_retries(symbol, period, start, interval)
+            # Waiters copy from a pristine snapshot, not from the frame handed to the owner
+            future.set_result(data.copy() if data is not None else None)
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+        return data
+
+    def _fetch_with_retries(self, symbol, period, start, interval):
+        for attempt in range(self.max_retries):
+            if self.limiter is not None:
+                self.limiter.acquire()
+            try:
+                with self._lock:
+                    self.stats['requests'] += 1
+                return self.provider.history(symbol, period=period, start=start, interval=interval)
+            except Exception as e:
+                if attempt == self.max_retries - 1:
+                    with self._lock:
+                        self.stats['failures'] += 1
+                    raise
+                delay = backoff_delay(attempt, self.base_delay, self.max_delay, self._rng)
+                logger.warning(f"Fetch of {symbol} failed ({str(e)}), retrying in {delay:.2f}s")
+                with self._lock:
+                    self.stats['retries'] += 1
+                self._sleep(delay)
@@ -0,0 +1,182 @@
+import os
+import re
+import json
+import logging
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+TIMESTAMP_FIELD = 'timestamp'
+DEFAULT_FIELD_DTYPES = {
+    'Open': 'float64',
+    'High': 'float64',
+    'Low': 'float64',
+    'Close': 'float64',
+    'Volume': 'int64',
+}
+
+
+class HistoryStore:
+    """
+    Columnar on-disk OHLCV store.
+    Each symbol is a directory holding one contiguous binary file per field
+    (plus int64 UTC nanosecond timestamps) and a meta.json with the row count
+    and dtypes. Reads are numpy.memmap views, so loading is near free and
+    several processes share the same pages through the OS page cache.
+    """
+
+    def __init__(self, root, field_dtypes=None):
+        self.root = os.path.expanduser(root)
+        self.field_dtypes = dict(field_dtypes or DEFAULT_FIELD_DTYPES)
+        os.makedirs(self.root, exist_ok=True)
+
+    def _symbol_dir(self, symbol):
+        return os.path.join(self.root, re.sub(r'[^A-Za-z0-9_.-]', '_', symbol))
+
+    def _field_path(self, symbol, field):
+        return os.path.join(self._symbol_dir(symbol), f"{field}.bin")
+
+    def _meta_path(self, symbol):
+        return os.path.join(self._symbol_dir(symbol), 'meta.json')
+
+    def symbols(self):
+        """Return the stored symbols"""
+        symbols = []
+        for name in sorted(os.listdir(self.root)):
+            meta_path = os.path.join(self.root, name, 'meta.json')
+            if os.path.exists(meta_path):
+                with open(meta_path) as f:
+                    symbols.append(json.load(f)['symbol'])
+        return symbols
+
+    def meta(self, symbol):
+        """Return the metadata for a symbol, or None if it is not stored"""
+        path = self._meta_path(symbol)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def _write_meta(self, symbol, meta):
+        # meta.json is replaced last and atomically, so readers never see a length
+        # larger than what has been fully written to the field files
+        path = self._meta_path(symbol)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, path)
+
+    def length(self, symbol):
+        """Return the number of stored bars for a symbol"""
+        meta = self.meta(symbol)
+        return meta['length'] if meta else 0
+
+    def _columns(self, data, field_dtypes):
+        index = pd.DatetimeIndex(data.index)
+        if index.tz is None:
+            index = index.tz_localize('UTC')
+        utc_values = index.tz_convert('UTC').tz_localize(None).values
+        columns = {TIMESTAMP_FIELD: utc_values.astype('datetime64[ns]').view('int64')}
+        for field, dtype in field_dtypes.items():
+            values = data[field].to_numpy()
+            if np.issubdtype(np.dtype(dtype), np.integer):
+                values = np.nan_to_num(values, nan=0)
+            columns[field] = np.ascontiguousarray(values, dtype=dtype)
+        return columns
+
+    def write(self, symbol, data, tz=None):
+        """Replace the stored history of a symbol with an OHLCV DataFrame"""
+        symbol_dir = self._symbol_dir(symbol)
+        os.makedirs(symbol_dir, exist_ok=True)
+        data = data.sort_index()
+        field_dtypes = {f: d for f, d in self.field_dtypes.items() if f in data.columns}
+        columns = self._columns(data, field_dtypes)
+
+        for field, values in columns.items():
+            tmp_path = f"{self._field_path(symbol, field)}.tmp"
+            values.tofile(tmp_path)
+            os.replace(tmp_path, self._field_path(symbol, field))
+
+        index_tz = tz or (str(data.index.tz) if getattr(data.index, 'tz', None) is not None else None)
+        self._write_meta(symbol, {
+            'symbol': symbol,
+            'length': len(data),
+            'tz': index_tz,
+            'fields': {TIMESTAMP_FIELD: 'int64', **field_dtypes},
+        })
+        logger.info(f"Stored {len(data)} bars for {symbol}")
+        return len(data)
+
+    def append(self, symbol, data):
+        """Append bars newer than the last stored bar; returns the number of bars added"""
+        meta = self.meta(symbol)
+        if meta is None:
+            return self.write(symbol, data)
+
+        field_dtypes = {f: d for f, d in meta['fields'].items() if f != TIMESTAMP_FIELD}
+        columns = self._columns(data.sort_index(), field_dtypes)
+        last = self.last_timestamp_ns(symbol)
+        keep = columns[TIMESTAMP_FIELD] > last if last is not None else slice(None)
+        columns = {field: values[keep] for field, values in columns.items()}
+        added = len(columns[TIMESTAMP_FIELD])
+        if added == 0:
+            return 0
+
+        for field, values in columns.items():
+            path = self._field_path(symbol, field)
+            with open(path, 'r+b') as f:
+                # Truncate anything past the committed length (e.g. an interrupted append)
+                f.truncate(meta['length'] * np.dtype(meta['fields'][field]).itemsize)
+                f.seek(0, os.SEEK_END)
+                values.tofile(f)
+
+        meta['length'] += added
+        self._write_meta(symbol, meta)
+        return added
+
+    def last_timestamp_ns(self, symbol):
+        """Return the last stored timestamp as UTC nanoseconds, or None"""
+        meta = self.meta(symbol)
+        if not meta or meta['length'] == 0:
+            return None
+        return int(self.arrays(symbol, [TIMESTAMP_FIELD])[TIMESTAMP_FIELD][-1])
+
+    def arrays(self, symbol, fields=None):
+        """Return read-only memory-mapped arrays for the requested fields (default: all)"""
+        meta = self.meta(symbol)
+        if meta is None:
+            raise KeyError(f"No stored history for {symbol}")
+
+        fields = list(meta['fields']) if fields is None else list(fields)
+        length = meta['length']
+        arrays = {}
+        for field in fields:
+            dtype = np.dtype(meta['fields'][field])
+            if length == 0:
+                arrays[field] = np.empty(0, dtype=dtype)
+            else:
+                arrays[field] = np.memmap(self._field_path(symbol, field), dtype=dtype, mode='r', shape=(length,))
+        return arrays
+
+    def to_frame(self, symbol, fields=None, tail=None):
+        """
+        Build an OHLCV DataFrame, optionally of only the last `tail` bars. Each
+        column is a read-only view of its memory-mapped field file (one block per
+        column, never consolidated into a 2-D copy); only the timestamp index is
+        decoded into memory.
+        """
+        meta = self.meta(symbol)
+        if meta is None:
+            raise KeyError(f"No stored history for {symbol}")
+        fields = [f for f in meta['fields'] if f != TIMESTAMP_FIELD] if fields is None else list(fields)
+        arrays = self.arrays(symbol, [TIMESTAMP_FIELD] + fields)
+        window = slice(-tail, None) if tail else slice(None)
+
+        timestamps = np.asarray(arrays[TIMESTAMP_FIELD][window]).view('datetime64[ns]')
+        index = pd.DatetimeIndex(timestamps).tz_localize('UTC')
+        if meta.get('tz'):
+            index = index.tz_convert(meta['tz'])
+        # copy=False keeps each memmap as its own block; the default would consolidate the
+        # same-dtype columns into one in-memory array
+        return pd.DataFrame({field: arrays[field][window] for field in fields}, index=index, copy=False)
@@ -0,0 +1,49 @@
+import logging
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class IndicatorBlock:
+    """
+    Indicator columns for one frame in a single preallocated float64 block of
+    shape (indicators, bars). Each indicator is a contiguous row that computations
+    fill in place; join() turns the block into DataFrame columns in one step, as
+    one pandas block, instead of one insert (and possible consolidation) per column.
+    """
+
+    def __init__(self, names, length):
+        self.names = list(names)
+        self.values = np.full((len(self.names), length), np.nan)
+        self.rows = dict(zip(self.names, self.values))
+
+    def __len__(self):
+        return self.values.shape[1]
+
+    def __getitem__(self, name):
+        return self.rows[name]
+
+    def rows_for(self, names):
+        """Return the block rows for consecutive names as one (len(names), bars) view"""
+        first = self.names.index(names[0])
+        if self.names[first:first + len(names)] != list(names):
+            raise KeyError(f"{', '.join(names)} are not consecutive in the block")
+        return self.values[first:first + len(names)]
+
+    def fill(self, name, values):
+        """Copy values (array or Series) into an indicator's row"""
+        self.rows[name][:] = np.asarray(values, dtype='float64')
+
+    def row(self, position):
+        """Indicator values at one bar as a dict"""
+        return dict(zip(self.names, self.values[:, position].tolist()))
+
+    def to_frame(self, index):
+        """The block as a DataFrame sharing its memory (no copy)"""
+        return pd.DataFrame(self.values.T, index=index, columns=self.names, copy=False)
+
+    def join(self, data):
+        """Return data with the indicator columns replaced by (or appended from) the block"""
+        base = data.drop(columns=[name for name in self.names if name in data.columns])
+        return pd.concat([base, self.to_frame(data.index)], axis=1)
@@ -0,0 +1,137 @@
+import os
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def fingerprint(arrays, params=None):
+    """
+    Content hash of input arrays (values, dtype and shape) plus parameters.
+    Equal data gives an equal key wherever it came from, so the key says nothing
+    about index labels: only what the computation actually reads.
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(f"{array.dtype.str}{array.shape}".encode())
+        digest.update(array.tobytes())
+    digest.update(repr(sorted((params or {}).items())).encode())
+    return digest.hexdigest()
+
+
+class IndicatorCache:
+    """
+    Content-addressed cache of indicator results: key -> {name: array}.
+    Entries live in memory with LRU eviction bounded by max_entries and max_bytes;
+    with cache_dir set they are also written to disk as .npz files and reloaded on
+    a memory miss. Cached arrays are read-only. Safe to share between threads.
+    """
+
+    def __init__(self, max_entries=128, max_bytes=256 * 1024 * 1024, cache_dir=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.cache_dir = os.path.expanduser(cache_dir) if cache_dir else None
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+        self.entries = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.npz")
+
+    def _insert(self, key, results):
+        """Add an entry to memory and evict least recently used entries over the caps"""
+        size = sum(values.nbytes for values in results.values())
+        if key in self.entries:
+            self.nbytes -= sum(values.nbytes for values in self.entries.pop(key).values())
+        self.entries[key] = results
+        self.nbytes += size
+        while self.entries and (len(self.entries) > self.max_entries or self.nbytes > self.max_bytes):
+            _, evicted = self.entries.popitem(last=False)
+            self.nbytes -= sum(values.nbytes for values in evicted.values())
+            self.evictions += 1
+
+    def get(self, key):
+        """Return the cached {name: array} for key, or None"""
+        with self._lock:
+            results = self.entries.get(key)
+            if results is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return results
+
+        results = self._load(key) if self.cache_dir else None
+        with self._lock:
+            if results is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._insert(key, results)
+            return results
+
+    def put(self, key, results):
+        """Store {name: array} under key (arrays are copied and made read-only)"""
+        frozen = {}
+        for name, values in results.items():
+            values = np.array(values, copy=True)
+            values.setflags(write=False)
+            frozen[name] = values
+        with self._lock:
+            self._insert(key, frozen)
+        if self.cache_dir:
+            self._save(key, frozen)
+        return frozen
+
+    def _save(self, key, results):
+        path = self._path(key)
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, **results)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write indicator cache file {path}: {str(e)}")
+
+    def _load(self, key):
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as stored:
+                results = {name: stored[name] for name in stored.files}
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable indicator cache file {path}: {str(e)}")
+            return None
+        for values in results.values():
+            values.setflags(write=False)
+        return results
+
+    def clear(self):
+        """Drop all in-memory entries (disk files are kept)"""
+        with self._lock:
+            self.entries.clear()
+            self.nbytes = 0
+
+    def stats(self):
+        """Return hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'disk_hits': self.disk_hits,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': len(self.entries),
+                'bytes': self.nbytes,
+            }
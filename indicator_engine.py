@@ -0,0 +1,254 @@
+import os
+import math
+import hashlib
+import logging
+import numpy as np
+from rolling_stats import RollingVariance
+
+logger = logging.getLogger(__name__)
+
+NAN = float('nan')
+
+# Running sums are recomputed exactly from the ring buffer every this many
+# updates, so floating-point drift cannot accumulate on long streams.
+RESUM_INTERVAL = 10_000
+
+CHECKPOINT_VERSION = 2
+
+
+def history_checksum(timestamps_ns, close, volume):
+    """blake2b digest of the bars behind an indicator state (timestamps, closes, volumes)"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.ascontiguousarray(timestamps_ns, dtype='int64').tobytes())
+    digest.update(np.ascontiguousarray(close, dtype='float64').tobytes())
+    digest.update(np.ascontiguousarray(volume, dtype='float64').tobytes())
+    return digest.hexdigest()
+
+
+class RollingMean:
+    """Rolling mean over a fixed window with a ring buffer and a running sum; O(1) per update"""
+
+    def __init__(self, window):
+        self.window = window
+        self.buffer = [0.0] * window
+        self.pos = 0
+        self.count = 0
+        self.total = 0.0
+        self.nan_count = 0
+        self._updates = 0
+
+    def update(self, value):
+        """Push a value and return the mean of the last `window` values (NaN until full or if any is NaN)"""
+        if self.count == self.window:
+            old = self.buffer[self.pos]
+            if old != old:
+                self.nan_count -= 1
+            else:
+                self.total -= old
+        else:
+            self.count += 1
+
+        self.buffer[self.pos] = value
+        if value != value:
+            self.nan_count += 1
+        else:
+            self.total += value
+        self.pos = (self.pos + 1) % self.window
+
+        self._updates += 1
+        if self._updates % RESUM_INTERVAL == 0:
+            self.total = math.fsum(v for v in self.buffer[:self.count] if v == v)
+
+        if self.count < self.window or self.nan_count:
+            return NAN
+        return self.total / self.window
+
+    def seed(self, values):
+        """Load the window from the tail of a history array"""
+        tail = [float(v) for v in values[-self.window:]]
+        self.count = len(tail)
+        self.buffer = tail + [0.0] * (self.window - len(tail))
+        self.pos = self.count % self.window
+        self.nan_count = sum(1 for v in tail if v != v)
+        self.total = math.fsum(v for v in tail if v == v)
+
+    def state(self):
+        """Return the window state as (buffer, counters, sums) arrays"""
+        counters = np.array([self.pos, self.count, self.nan_count, self._updates], dtype='int64')
+        return np.array(self.buffer, dtype='float64'), counters, np.array([self.total])
+
+    def restore(self, buffer, counters, sums):
+        """Load a state produced by state()"""
+        self.buffer = [float(v) for v in buffer]
+        self.pos, self.count, self.nan_count, self._updates = (int(v) for v in counters)
+        self.total = float(sums[0])
+
+
+def _window_mean(values):
+    """Mean of a full window, NaN if any value is NaN"""
+    if np.isnan(values).any():
+        return NAN
+    return math.fsum(values) / len(values)
+
+
+def _ewm_last_two(values, alpha):
+    """Last two values of pandas' ewm(alpha=alpha, adjust=False).mean(), same operation order"""
+    factor = 1.0 - alpha
+    weighted = NAN
+    old_weight = 1.0
+    latest = previous = NAN
+    for value in values.tolist():
+        if weighted == weighted:
+            old_weight *= factor
+            if value == value:
+                if weighted != value:
+                    weighted = (old_weight * weighted + alpha * value) / (old_weight + alpha)
+                old_weight = 1.0
+        elif value == value:
+            weighted = value
+        previous, latest = latest, weighted
+    return latest, previous
+
+
+def tail_indicators(close, volume, periods_per_year=252):
+    """
+    Only the last two rows of the calculate_moving_averages indicator set, computed
+    from the shortest history each one needs (201 bars for the 200DMA pair, the
+    full series for the 5DEMA). Returns (latest, previous) dicts that also hold
+    Close and Volume, ready for build_signals.
+    """
+    close = np.asarray(close, dtype='float64')
+    volume = np.asarray(volume, dtype='float64')
+    n = len(close)
+    if n < 2:
+        raise ValueError("At least two bars are needed")
+
+    rows = ({'Close': close[-1], 'Volume': volume[-1]}, {'Close': close[-2], 'Volume': volume[-2]})
+    ema_latest, ema_previous = _ewm_last_two(close, 2 / (5 + 1))
+    rows[0]['5DEMA'], rows[1]['5DEMA'] = ema_latest, ema_previous
+
+    returns = close[-22:][1:] / close[-22:][:-1] - 1
+    for offset, row in enumerate(rows):
+        end = n - offset
+        for name, values, window in (('5DMA', close, 5), ('50DMA', close, 50), ('200DMA', close, 200),
+                                     ('Volume_SMA', volume, 20)):
+            row[name] = _window_mean(values[end - window:end]) if end >= window else NAN
+
+        row['Price_Change'] = close[end - 1] / close[end - 2] - 1 if end >= 2 else NAN
+        # 20 returns need 21 closes
+        window_returns = returns[len(returns) - offset - 20:len(returns) - offset] if end >= 21 else None
+        if window_returns is None or np.isnan(window_returns).any():
+            row['Volatility'] = NAN
+        else:
+            row['Volatility'] = float(np.std(window_returns, ddof=1)) * math.sqrt(periods_per_year)
+    return rows
+
+
+class IncrementalIndicators:
+    """
+    Constant-time-per-bar state for the indicator set of calculate_moving_averages:
+    5/50/200DMA, 5DEMA, Volume_SMA, Price_Change and Volatility. Results match the
+    pandas rolling/ewm output to floating-point tolerance.
+    """
+
+    COLUMNS = ['5DMA', '50DMA', '200DMA', '5DEMA', 'Volume_SMA', 'Price_Change', 'Volatility']
+    WINDOWS = ['sma_5', 'sma_50', 'sma_200', 'volume_sma', 'return_std']
+
+    def __init__(self, periods_per_year=252):
+        self.periods_per_year = periods_per_year
+        self.annualise = math.sqrt(periods_per_year)
+        self.sma_5 = RollingMean(5)
+        self.sma_50 = RollingMean(50)
+        self.sma_200 = RollingMean(200)
+        self.volume_sma = RollingMean(20)
+        self.return_std = RollingVariance(20)
+        self.ema_alpha = 2 / (5 + 1)
+        self.ema_5 = NAN
+        self.last_close = NAN
+        self.count = 0
+        self.last_timestamp = None
+
+    def update(self, close, volume, timestamp=None):
+        """Process one new bar and return its indicator values"""
+        if close == close:
+            self.ema_5 = close if self.ema_5 != self.ema_5 else \
+                self.ema_alpha * close + (1 - self.ema_alpha) * self.ema_5
+        price_change = close / self.last_close - 1 if self.last_close == self.last_close else NAN
+        self.last_close = close
+        self.count += 1
+        self.last_timestamp = timestamp
+
+        if self.count > 1:
+            self.return_std.push(price_change, price_change)
+        volatility = self.return_std.std()
+        return {
+            '5DMA': self.sma_5.update(close),
+            '50DMA': self.sma_50.update(close),
+            '200DMA': self.sma_200.update(close),
+            '5DEMA': self.ema_5,
+            'Volume_SMA': self.volume_sma.update(volume),
+            'Price_Change': price_change,
+            'Volatility': volatility * self.annualise,
+        }
+
+    @classmethod
+    def from_arrays(cls, close, volume, ema_5, periods_per_year=252, last_timestamp=None):
+        """Seed the state from full history arrays and the last computed 5DEMA value"""
+        engine = cls(periods_per_year)
+        close = np.asarray(close, dtype='float64')
+        volume = np.asarray(volume, dtype='float64')
+        engine.sma_5.seed(close)
+        engine.sma_50.seed(close)
+        engine.sma_200.seed(close)
+        engine.volume_sma.seed(volume)
+        tail = close[-(engine.return_std.window + 1):]
+        engine.return_std.seed(tail[1:] / tail[:-1] - 1)
+        engine.ema_5 = float(ema_5)
+        engine.last_close = float(close[-1]) if len(close) else NAN
+        engine.count = len(close)
+        engine.last_timestamp = last_timestamp
+        return engine
+
+    def save(self, path, last_timestamp=None, **extra):
+        """
+        Atomically write the engine state to a compact .npz checkpoint. The last
+        timestamp is stored as epoch nanoseconds: pass last_timestamp when the
+        engine's own is not an integer (e.g. a pandas Timestamp). Extra arrays are
+        stored alongside.
+        """
+        last_timestamp = self.last_timestamp if last_timestamp is None else last_timestamp
+        arrays = {
+            'version': np.array(CHECKPOINT_VERSION),
+            'scalars': np.array([self.periods_per_year, self.ema_5, self.last_close]),
+            'count': np.array(self.count, dtype='int64'),
+            'last_timestamp': np.array(-1 if last_timestamp is None else last_timestamp, dtype='int64'),
+        }
+        for name in self.WINDOWS:
+            buffer, counters, sums = getattr(self, name).state()
+            arrays[f'{name}.buffer'], arrays[f'{name}.counters'], arrays[f'{name}.sums'] = buffer, counters, sums
+        for key, value in extra.items():
+            arrays[f'extra.{key}'] = np.asarray(value)
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Read a checkpoint written by save(); returns (engine, extra)"""
+        with np.load(path, allow_pickle=False) as checkpoint:
+            if int(checkpoint['version']) != CHECKPOINT_VERSION:
+                raise ValueError(f"Unsupported indicator checkpoint version {int(checkpoint['version'])}")
+            periods_per_year, ema_5, last_close = checkpoint['scalars']
+            engine = cls(int(periods_per_year))
+            engine.ema_5 = float(ema_5)
+            engine.last_close = float(last_close)
+            engine.count = int(checkpoint['count'])
+            last_timestamp = int(checkpoint['last_timestamp'])
+            engine.last_timestamp = None if last_timestamp < 0 else last_timestamp
+            for name in cls.WINDOWS:
+                getattr(engine, name).restore(checkpoint[f'{name}.buffer'], checkpoint[f'{name}.counters'],
+                                              checkpoint[f'{name}.sums'])
+            extra = {key[len('extra.'):]: checkpoint[key] for key in checkpoint.files if key.startswith('extra.')}
+        return engine, extra
@@ -0,0 +1,152 @@
+import logging
+import numpy as np
+import pandas as pd
+from rolling_stats import rolling_std
+
+logger = logging.getLogger(__name__)
+
+# Raw OHLCV columns that indicators can depend on
+BASE_COLUMNS = ('Open', 'High', 'Low', 'Close', 'Volume')
+
+
+class Indicator:
+    """An indicator: a name, the columns/indicators it reads, and a function computing it"""
+
+    def __init__(self, name, inputs, func, description=""):
+        self.name = name
+        self.inputs = tuple(inputs)
+        self.func = func
+        self.description = description
+
+    def __repr__(self):
+        return f"Indicator({self.name!r}, inputs={self.inputs!r})"
+
+
+class IndicatorRegistry:
+    """
+    Registry of indicators with declared dependencies. compute() resolves the
+    dependency graph for the requested names and evaluates only those nodes,
+    each exactly once, in dependency order.
+    """
+
+    def __init__(self):
+        self.indicators = {}
+
+    def register(self, name, inputs, description=""):
+        """Decorator registering func(values, params) -> Series under `name`"""
+        def decorator(func):
+            self.add(Indicator(name, inputs, func, description))
+            return func
+        return decorator
+
+    def add(self, indicator):
+        """Register an Indicator, replacing any existing one with the same name"""
+        self.indicators[indicator.name] = indicator
+        return indicator
+
+    def names(self):
+        """Return all registered indicator names"""
+        return list(self.indicators)
+
+    def resolve(self, names):
+        """Return the indicators needed for `names` in dependency order"""
+        order = []
+        state = {}  # name -> 'visiting' | 'done'
+
+        def visit(name, path):
+            if name in BASE_COLUMNS:
+                return
+            if name not in self.indicators:
+                raise KeyError(f"Unknown indicator: {name}")
+            if state.get(name) == 'done':
+                return
+            if state.get(name) == 'visiting':
+                raise ValueError(f"Indicator dependency cycle: {' -> '.join(path + [name])}")
+
+            state[name] = 'visiting'
+            for dependency in self.indicators[name].inputs:
+                visit(dependency, path + [name])
+            state[name] = 'done'
+            order.append(name)
+
+        for name in names:
+            visit(name, [])
+        return order
+
+    def compute(self, data, names=None, **params):
+        """
+        Compute the requested indicators (default: all) and their dependencies from
+        an OHLCV frame. Returns name -> Series for every evaluated node.
+        """
+        names = self.names() if names is None else list(names)
+        values = {column: data[column] for column in BASE_COLUMNS if column in data.columns}
+        computed = {}
+        for name in self.resolve(names):
+            indicator = self.indicators[name]
+            missing = [i for i in indicator.inputs if i not in values]
+            if missing:
+                raise KeyError(f"{name} needs missing input(s): {', '.join(missing)}")
+            values[name] = indicator.func(values, params)
+            computed[name] = values[name]
+        return computed
+
+    def compute_into(self, data, block, **params):
+        """
+        Compute the block's indicators (block.names must include their dependencies)
+        straight into its preallocated rows. Each result is copied into its row as
+        soon as it is produced and dependents read the row, so only one temporary
+        result is alive at a time.
+        """
+        values = {column: data[column] for column in BASE_COLUMNS if column in data.columns}
+        for name in self.resolve(block.names):
+            indicator = self.indicators[name]
+            missing = [i for i in indicator.inputs if i not in values]
+            if missing:
+                raise KeyError(f"{name} needs missing input(s): {', '.join(missing)}")
+            block.fill(name, indicator.func(values, params))
+            values[name] = pd.Series(block[name], index=data.index, name=name, copy=False)
+        return block
+
+
+DEFAULT_REGISTRY = IndicatorRegistry()
+
+
+@DEFAULT_REGISTRY.register('5DMA', ['Close'], "5-day simple moving average")
+def _sma_5(values, params):
+    return values['Close'].rolling(window=5).mean()
+
+
+@DEFAULT_REGISTRY.register('50DMA', ['Close'], "50-day simple moving average")
+def _sma_50(values, params):
+    return values['Close'].rolling(window=50).mean()
+
+
+@DEFAULT_REGISTRY.register('200DMA', ['Close'], "200-day simple moving average")
+def _sma_200(values, params):
+    return values['Close'].rolling(window=200).mean()
+
+
+@DEFAULT_REGISTRY.register('5DEMA', ['Close'], "5-day exponential moving average")
+def _ema_5(values, params):
+    return values['Close'].ewm(span=5, adjust=False).mean()
+
+
+@DEFAULT_REGISTRY.register('Volume_SMA', ['Volume'], "20-day volume moving average")
+def _volume_sma(values, params):
+    return values['Volume'].rolling(window=20).mean()
+
+
+@DEFAULT_REGISTRY.register('Price_Change', ['Close'], "Bar-over-bar percentage change")
+def _price_change(values, params):
+    return values['Close'].pct_change()
+
+
+@DEFAULT_REGISTRY.register('Volatility', ['Price_Change'], "Annualised 20-bar standard deviation of returns")
+def _volatility(values, params):
+    returns = values['Price_Change']
+    return pd.Series(rolling_std(returns.to_numpy(dtype='float64'), 20) * np.sqrt(params.get('periods_per_year', 252)),
+                     index=returns.index)
+
+
+# What generate_signals, signal_history and backtest read; main() computes just these
+SIGNAL_INDICATORS = ['5DMA', '5DEMA', '50DMA', '200DMA', 'Volatility']
@@ -0,0 +1,76 @@
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def compensated_prefix_sum(values):
+    """
+    Prefix sums along axis 0 with a leading zero row, returned as (sums, corrections).
+    sums is the plain float64 cumulative sum; corrections is the cumulative sum of
+    the exact rounding error of every addition (TwoSum error-free transformation),
+    so sums + corrections is accurate to about one rounding of the result
+    regardless of series length.
+    """
+    values = np.asarray(values, dtype='float64')
+    shape = (values.shape[0] + 1,) + values.shape[1:]
+    sums = np.zeros(shape)
+    np.cumsum(values, axis=0, out=sums[1:])
+
+    # TwoSum: sums[i] = fl(sums[i-1] + values[i-1]); recover the rounding error exactly
+    previous = sums[:-1]
+    current = sums[1:]
+    b_virtual = current - previous
+    a_virtual = current - b_virtual
+    errors = (previous - a_virtual) + (values - b_virtual)
+
+    corrections = np.zeros(shape)
+    np.cumsum(errors, axis=0, out=corrections[1:])
+    return sums, corrections
+
+
+def multi_window_sma(values, windows, out=None):
+    """
+    Simple moving averages for several window lengths from one shared,
+    compensated cumulative sum. values is 1-D (n,) or 2-D (n, k) with time on
+    axis 0; the result has shape (len(windows),) + values.shape and is written
+    into `out` when given. Like pandas rolling(window).mean(), a window holding
+    a NaN (or not yet full) yields NaN.
+    """
+    values = np.asarray(values, dtype='float64')
+    n = values.shape[0]
+    result_shape = (len(windows),) + values.shape
+    if out is None:
+        out = np.empty(result_shape)
+    elif out.shape != result_shape:
+        raise ValueError(f"out has shape {out.shape}, expected {result_shape}")
+
+    nan_mask = np.isnan(values)
+    has_nan = nan_mask.any()
+
+    # Shift by a per-column reference level so the prefix sums stay small
+    # (columns that are all-NaN in the head, e.g. symbols listed later, use zero)
+    head = values[:min(n, 1024)]
+    head_counts = np.count_nonzero(~np.isnan(head), axis=0)
+    reference = np.nansum(head, axis=0) / np.maximum(head_counts, 1)
+    shifted = values - reference
+    if has_nan:
+        shifted = np.where(nan_mask, 0.0, shifted)
+        nan_counts = np.zeros((n + 1,) + values.shape[1:], dtype='int64')
+        np.cumsum(nan_mask, axis=0, out=nan_counts[1:])
+
+    sums, corrections = compensated_prefix_sum(shifted)
+
+    for row, window in enumerate(windows):
+        target = out[row]
+        if window > n:
+            target[...] = np.nan
+            continue
+        target[:window - 1] = np.nan
+        window_sums = (sums[window:] - sums[:-window]) + (corrections[window:] - corrections[:-window])
+        np.divide(window_sums, window, out=target[window - 1:])
+        target[window - 1:] += reference
+        if has_nan:
+            incomplete = (nan_counts[window:] - nan_counts[:-window]) > 0
+            target[window - 1:][incomplete] = np.nan
+    return out
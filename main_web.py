@@ -1,10 +1,27 @@
-import yfinance as yf
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import os
 import json
+import time
 import logging
+from ohlcv_cache import OHLCVCache
+from data_providers import YahooProvider, ReplayProvider
+from fetch_scheduler import backoff_delay
+from data_validation import validate_ohlcv, summarize_report
+from resample import resample_ohlcv, bars_per_year, INTRADAY_INTERVALS
+from tick_stream import LiveBars
+from compact import to_compact, compact_indicators
+from indicator_engine import IncrementalIndicators, history_checksum, tail_indicators
+from indicator_registry import DEFAULT_REGISTRY, BASE_COLUMNS, SIGNAL_INDICATORS
+from indicator_cache import fingerprint
+from indicator_block import IndicatorBlock
+from ma_kernel import multi_window_sma
+from oscillators import compute_oscillators, OSCILLATOR_COLUMNS
+from signal_series import signal_series, label_series
+from signal_rules import DEFAULT_RULES
+from backtest import backtest_frame
+from walk_forward import walk_forward
 
 # Configure logging
 logging.basicConfig(
@@ -13,27 +30,74 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Bars covered by the checkpoint checksum: everything the rolling windows still hold
+# (200DMA plus the previous close for Price_Change)
+CHECKPOINT_VERIFY_BARS = 201
+
+# Report labels for symbols whose Yahoo ticker is not the usual name; others are shown as the ticker
+DISPLAY_NAMES = {'^NSEI': 'NIFTY 50'}
+
 class NiftyWebAnalyzer:
     """
     Nifty Technical Analysis for Web Display
     Based on research paper: 'Comparative Technical Analysis and Prediction of Nifty-50 Performance'
     """
 
-    def __init__(self):
-        self.symbol = "^NSEI"  # Nifty 50 Yahoo Finance symbol
+    def __init__(self, cache_dir=None, provider=None, symbol="^NSEI", validation_policy=None, validate=True,
+                 interval="1d", compact=False, indicator_cache=None, rules=None, display_name=None):
+        self.symbol = symbol  # Nifty 50 Yahoo Finance symbol by default
+        self.display_name = display_name or DISPLAY_NAMES.get(symbol, symbol)  # label in logs and reports
+        self.interval = interval  # Bar size: '1d' or an intraday interval such as '1m', '5m', '1h'
         self.data = None
         self.results = {}
-
-    def fetch_data(self, period="1y", max_retries=3):
-        """Fetch Nifty 50 data from Yahoo Finance with retry logic"""
+        self.validate = validate
+        self.validation_policy = validation_policy
+        self.validation_report = None
+        self.live = None
+        self.compact = compact  # float32 prices/indicators, int32 volume, unused columns dropped
+        self.engine = None  # IncrementalIndicators state for method="incremental"
+        self.indicator_cache = indicator_cache  # shared IndicatorCache: repeated computations become lookups
+        self.rules = rules if rules is not None else DEFAULT_RULES  # compiled signal rule table (signal_rules)
+        self.provider = provider if provider is not None else YahooProvider()
+        self.cache = OHLCVCache(cache_dir, self.provider.name) if cache_dir else None
+
+    @property
+    def data(self):
+        """OHLCV bars plus indicator columns; a pending indicator block is joined in on first access"""
+        if self._pending is not None:
+            self._data = self._pending.join(self._data)
+            self._pending = None
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        self._data = value
+        self._pending = None
+        self._partial_indicators = False  # True after a checkpoint resume: only the tail rows are filled
+
+    def _download_history(self, period=None, start=None):
+        """Download OHLCV history from the data provider for a period or from a start date"""
+        return self.provider.history(self.symbol, period=period, start=start, interval=self.interval)
+
+    def fetch_data(self, period="1y", max_retries=3, retry_delay=1.0):
+        """Fetch the symbol's data from the data provider with retry and backoff, using the local cache when enabled"""
         for attempt in range(max_retries):
             try:
-                logger.info(f"Fetching Nifty 50 data (attempt {attempt + 1}/{max_retries})")
-                ticker = yf.Ticker(self.symbol)
-                self.data = ticker.history(period=period)
-
-                if self.data.empty:
-                    raise ValueError("No data received from Yahoo Finance")
+                logger.info(f"Fetching {self.display_name} data (attempt {attempt + 1}/{max_retries})")
+                if self.cache is not None:
+                    self.data = self.cache.fetch(self.symbol, self._download_history, period=period,
+                                                 interval=self.interval)
+                else:
+                    self.data = self._download_history(period=period)
+
+                if self.data is None or self.data.empty:
+                    self.data = None
+                    raise ValueError(f"No data received from {self.provider.name} provider")
+
+                if self.validate:
+                    self.validate_data()
+                if self.compact:
+                    self.data = to_compact(self.data)
 
                 logger.info(f"Data fetched successfully. Shape: {self.data.shape}")
                 return True
@@ -43,28 +107,103 @@ class NiftyWebAnalyzer:
                 if attempt == max_retries - 1:
                     logger.error("All fetch attempts failed")
                     return False
+                time.sleep(backoff_delay(attempt, base_delay=retry_delay))
 
         return False
 
-    def calculate_moving_averages(self):
-        """Calculate moving averages as per research paper methodology"""
+    def validate_data(self):
+        """Check the OHLCV frame for bad bars and drop or repair them according to the validation policy"""
+        self.data, self.validation_report = validate_ohlcv(self.data, policy=self.validation_policy)
+        if self.validation_report['issues']:
+            logger.warning(f"Data validation: {summarize_report(self.validation_report)}")
+        return self.validation_report
+
+    def resample(self, interval):
+        """Resample the loaded bars to a higher timeframe (e.g. 1m -> 5m, 1h or 1d) within NSE sessions"""
         if self.data is None:
             logger.error("No data available. Please fetch data first.")
             return False
 
         try:
-            # Simple Moving Averages
-            self.data['5DMA'] = self.data['Close'].rolling(window=5).mean()
-            self.data['50DMA'] = self.data['Close'].rolling(window=50).mean() 
-            self.data['200DMA'] = self.data['Close'].rolling(window=200).mean()
+            self.data = resample_ohlcv(self.data, interval)
+            self.interval = interval
+            logger.info(f"Resampled to {interval} bars. Shape: {self.data.shape}")
+            return True
 
-            # Exponential Moving Average (5-day)
-            self.data['5DEMA'] = self.data['Close'].ewm(span=5, adjust=False).mean()
+        except Exception as e:
+            logger.error(f"Error resampling data: {str(e)}")
+            return False
 
-            # Calculate additional indicators
-            self.data['Volume_SMA'] = self.data['Volume'].rolling(window=20).mean()
-            self.data['Price_Change'] = self.data['Close'].pct_change()
-            self.data['Volatility'] = self.data['Price_Change'].rolling(window=20).std() * np.sqrt(252)
+    def load_history(self, store, bars=None):
+        """
+        Load OHLCV history for this symbol from a columnar HistoryStore. The price
+        and volume columns stay views of the store's memory-mapped files (see
+        HistoryStore.to_frame), so the indicators read straight from the store.
+        """
+        try:
+            self.data = store.to_frame(self.symbol, tail=bars)
+            if self.data.empty:
+                self.data = None
+                raise ValueError(f"No stored history for {self.symbol}")
+
+            logger.info(f"History loaded from store. Shape: {self.data.shape}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error loading history from store: {str(e)}")
+            self.data = None
+            return False
+
+    def calculate_moving_averages(self, method="pandas", indicators=None):
+        """
+        Calculate moving averages as per research paper methodology.
+        indicators limits the pandas path to the named indicators and their
+        dependencies (see indicator_registry; default: all of them).
+        method="incremental" keeps O(1)-per-bar indicator state between calls and
+        only processes bars appended since the previous call. method="kernel"
+        computes all simple moving averages from one shared compensated cumulative sum.
+        With an indicator_cache, results are looked up by a hash of the input columns
+        and parameters before anything is computed.
+        """
+        if self.data is None:
+            logger.error("No data available. Please fetch data first.")
+            return False
+
+        try:
+            if method == "incremental" and self._update_incremental():
+                logger.info("Moving averages updated incrementally")
+                return True
+
+            # Every path below fills the indicator columns for the whole history
+            if indicators is None:
+                self._partial_indicators = False
+
+            if self.compact:
+                rows = compact_indicators(self.data['Close'].to_numpy(), self.data['Volume'].to_numpy(),
+                                          bars_per_year(self.interval))
+                indicators = pd.DataFrame(rows, index=self.data.index)
+                self.data = pd.concat([self.data.drop(columns=list(rows), errors='ignore'), indicators], axis=1)
+                logger.info("Moving averages calculated successfully (compact float32)")
+                return True
+
+            if method == "kernel":
+                self._compute_cached('kernel', IncrementalIndicators.COLUMNS, ['Close', 'Volume'],
+                                     self._calculate_with_kernel)
+                logger.info("Moving averages calculated successfully (multi-window kernel)")
+                return True
+
+            # Moving averages, EMA, volume SMA and volatility, resolved through the indicator registry
+            if method == "incremental":
+                indicators = None  # the incremental engine needs every column
+            names = DEFAULT_REGISTRY.resolve(DEFAULT_REGISTRY.names() if indicators is None else indicators)
+            inputs = sorted({column for name in names for column in DEFAULT_REGISTRY.indicators[name].inputs
+                             if column in BASE_COLUMNS})
+            self._compute_cached('registry', names, inputs, self._calculate_with_registry)
+
+            if method == "incremental":
+                self.engine = IncrementalIndicators.from_arrays(
+                    self.data['Close'].to_numpy(), self.data['Volume'].to_numpy(), self.data['5DEMA'].iloc[-1],
+                    bars_per_year(self.interval), last_timestamp=self.data.index[-1])
 
             logger.info("Moving averages calculated successfully")
             return True
@@ -73,34 +212,319 @@ class NiftyWebAnalyzer:
             logger.error(f"Error calculating moving averages: {str(e)}")
             return False
 
-    def generate_signals(self):
-        """Generate trading signals based on moving average analysis"""
+    def calculate_oscillators(self):
+        """Calculate RSI, ATR, MACD, Bollinger Bands and the Stochastic oscillator in one array pass"""
         if self.data is None:
+            logger.error("No data available. Please fetch data first.")
             return False
 
         try:
+            computed = compute_oscillators(self.data['High'].to_numpy(), self.data['Low'].to_numpy(),
+                                           self.data['Close'].to_numpy())
+            oscillators = pd.DataFrame(computed, index=self.data.index)
+            self.data = pd.concat([self.data.drop(columns=OSCILLATOR_COLUMNS, errors='ignore'), oscillators], axis=1)
+            logger.info("Oscillators calculated successfully")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error calculating oscillators: {str(e)}")
+            return False
+
+    def _compute_cached(self, method, names, inputs, compute):
+        """
+        Fill a preallocated IndicatorBlock for `names` with compute(block), or from the
+        indicator cache when set. The block is joined into self.data only when the
+        frame is next read, as one set of columns.
+        """
+        data = self.data
+        block = IndicatorBlock(names, len(data))
+        if self.indicator_cache is None:
+            compute(block)
+        else:
+            key = fingerprint([data[column].to_numpy() for column in inputs],
+                              {'method': method, 'indicators': tuple(names), 'inputs': tuple(inputs),
+                               'periods_per_year': bars_per_year(self.interval)})
+            results = self.indicator_cache.get(key)
+            if results is None:
+                compute(block)
+                self.indicator_cache.put(key, block.rows)
+            else:
+                for name, values in results.items():
+                    block.fill(name, values)
+                logger.info("Indicators served from cache")
+        self._pending = block
+
+    def _calculate_with_registry(self, block):
+        """Fill the block's indicators (and their dependencies) through the indicator registry"""
+        DEFAULT_REGISTRY.compute_into(self.data, block, periods_per_year=bars_per_year(self.interval))
+
+    def _calculate_with_kernel(self, block):
+        """Fill SMA rows in place from the multi-window kernel and the rest from the indicator registry"""
+        multi_window_sma(self.data['Close'].to_numpy(dtype='float64'), [5, 50, 200],
+                         out=block.rows_for(['5DMA', '50DMA', '200DMA']))
+        multi_window_sma(self.data['Volume'].to_numpy(dtype='float64'), [20], out=block.rows_for(['Volume_SMA']))
+
+        computed = DEFAULT_REGISTRY.compute(self.data, ['5DEMA', 'Volatility'],
+                                            periods_per_year=bars_per_year(self.interval))
+        for name in ('5DEMA', 'Price_Change', 'Volatility'):
+            block.fill(name, computed[name])
+
+    def _update_incremental(self):
+        """Feed bars appended since the engine's last bar; False if a full recompute is needed"""
+        engine = self.engine
+        if engine is None or engine.last_timestamp is None or not \
+                set(IncrementalIndicators.COLUMNS).issubset(self.data.columns):
+            return False
+
+        position = self.data.index.searchsorted(engine.last_timestamp)
+        if position >= len(self.data) or self.data.index[position] != engine.last_timestamp:
+            # The engine's last bar is no longer in the history; start over
+            return False
+
+        new_rows = self.data.iloc[position + 1:]
+        if new_rows.empty:
+            return True
+
+        values = [engine.update(close, volume, timestamp) for close, volume, timestamp in
+                  zip(new_rows['Close'].to_numpy(dtype='float64'), new_rows['Volume'].to_numpy(dtype='float64'),
+                      new_rows.index)]
+        for column in IncrementalIndicators.COLUMNS:
+            self.data.loc[new_rows.index, column] = [row[column] for row in values]
+        return True
+
+    def _timestamps_ns(self):
+        """Bar timestamps as UTC epoch nanoseconds"""
+        return pd.DatetimeIndex(self.data.index).values.astype('datetime64[ns]').view('int64')
+
+    def _checkpoint_checksum(self, position, rows):
+        """Checksum of the `rows` bars ending at `position` (the bars the rolling windows hold)"""
+        window = slice(position + 1 - rows, position + 1)
+        return history_checksum(self._timestamps_ns()[window], self.data['Close'].to_numpy()[window],
+                                self.data['Volume'].to_numpy()[window])
+
+    def save_checkpoint(self, path):
+        """
+        Save the incremental indicator state, the last two indicator rows and a
+        checksum of the bars behind the state, so the next run can resume from it.
+        """
+        if self.engine is None or self.data is None or len(self.data) < 2:
+            logger.error("No incremental indicator state to checkpoint")
+            return False
+
+        try:
+            position = self.data.index.get_loc(self.engine.last_timestamp)
+            if position < 1:
+                raise ValueError("at least two processed bars are needed")
+            rows = min(CHECKPOINT_VERIFY_BARS, position + 1)
+            timestamps = self._timestamps_ns()
+            self.engine.save(path, last_timestamp=timestamps[position], symbol=self.symbol, interval=self.interval,
+                             verify_rows=rows, checksum=self._checkpoint_checksum(position, rows),
+                             rows=self.data[IncrementalIndicators.COLUMNS].to_numpy(dtype='float64')[position - 1:position + 1])
+            logger.info(f"Indicator checkpoint saved to {path}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error saving indicator checkpoint: {str(e)}")
+            return False
+
+    def resume_from_checkpoint(self, path):
+        """
+        Restore indicator state from a checkpoint and process only bars newer than it.
+        Only the checkpointed pair and the new bars get indicator values, which is
+        all generate_signals reads; signal_history and backtest recompute the full
+        columns on first use. Returns False (leaving a full recompute to the caller) if there is no usable
+        checkpoint or the bars it was built from have since been revised.
+        """
+        if self.data is None or not os.path.exists(path):
+            return False
+
+        try:
+            engine, extra = IncrementalIndicators.load(path)
+            if str(extra['symbol']) != self.symbol or str(extra['interval']) != self.interval or \
+                    engine.periods_per_year != bars_per_year(self.interval):
+                logger.info("Indicator checkpoint is for a different series; recomputing")
+                return False
+
+            timestamps = self._timestamps_ns()
+            position = int(np.searchsorted(timestamps, engine.last_timestamp if engine.last_timestamp else 0))
+            rows = int(extra['verify_rows'])
+            if engine.last_timestamp is None or position >= len(timestamps) or \
+                    timestamps[position] != engine.last_timestamp or position < 1 or position + 1 < rows:
+                logger.info("Checkpointed bars are not in the fetched history; recomputing")
+                return False
+            if self._checkpoint_checksum(position, rows) != str(extra['checksum']):
+                logger.warning("Price history was revised since the checkpoint; recomputing")
+                return False
+
+            indicators = pd.DataFrame(np.nan, index=self.data.index, columns=IncrementalIndicators.COLUMNS)
+            indicators.iloc[position - 1:position + 1] = extra['rows']
+            self.data = pd.concat([self.data.drop(columns=IncrementalIndicators.COLUMNS, errors='ignore'), indicators],
+                                  axis=1)
+            engine.last_timestamp = self.data.index[position]
+            self.engine = engine
+            self._update_incremental()
+            self._partial_indicators = True
+            logger.info(f"Resumed indicators from checkpoint ({len(self.data) - position - 1} new bars)")
+            return True
+
+        except Exception as e:
+            logger.warning(f"Ignoring unusable indicator checkpoint {path}: {str(e)}")
+            self.engine = None
+            return False
+
+    def generate_signals(self, oscillators=False, tail=False):
+        """
+        Generate trading signals based on moving average analysis.
+        oscillators=True also computes the oscillator pack (if not already present)
+        and adds a momentum assessment to the signals.
+        tail=True skips calculate_moving_averages: only the last two values of each
+        indicator are computed, straight from the price arrays, and self.data is
+        left without indicator columns. The signals are the same as the full path.
+        """
+        if self._data is None:
+            return False
+
+        try:
+            if tail:
+                self.results = self._build_tail_signals(oscillators)
+                return True
+
+            if oscillators and 'RSI' not in self._data.columns and not self.calculate_oscillators():
+                return False
+
+            if self._pending is not None:
+                # Read the last two rows straight from the pending block; no frame is assembled
+                latest = {**self._data.iloc[-1].to_dict(), **self._pending.row(-1)}
+                previous = {**self._data.iloc[-2].to_dict(), **self._pending.row(-2)}
+                self.results = self.build_signals(latest, previous, self._data.index[-1])
+                return True
+
             latest = self.data.iloc[-1]
             previous = self.data.iloc[-2]
 
-            signals = {
-                'date': latest.name.strftime('%Y-%m-%d'),
-                'close_price': round(latest['Close'], 2),
-                'volume': int(latest['Volume']) if not pd.isna(latest['Volume']) else 0,
-                'volatility': round(latest['Volatility'], 2) if not pd.isna(latest['Volatility']) else 0,
-                'short_term': self.analyze_short_term(latest, previous),
-                'medium_term': self.analyze_medium_term(latest, previous),
-                'long_term': self.analyze_long_term(latest, previous),
-                'overall_trend': None
-            }
+            self.results = self.build_signals(latest, previous, latest.name)
+            return True
 
-            # Determine overall trend
-            signals['overall_trend'] = self.determine_overall_trend(signals)
+        except Exception as e:
+            logger.error(f"Error generating signals: {str(e)}")
+            return False
+
+    def _build_tail_signals(self, oscillators=False):
+        """Signals from the last two indicator rows computed directly from the price arrays"""
+        latest, previous = tail_indicators(self.data['Close'].to_numpy(), self.data['Volume'].to_numpy(),
+                                           bars_per_year(self.interval))
+        if oscillators:
+            computed = compute_oscillators(self.data['High'].to_numpy(), self.data['Low'].to_numpy(),
+                                           self.data['Close'].to_numpy())
+            for name, values in computed.items():
+                latest[name], previous[name] = values[-1], values[-2]
+        return self.build_signals(latest, previous, self.data.index[-1])
+
+    def build_signals(self, latest, previous, timestamp):
+        """Build the signals dict from the latest and previous indicator rows (Series or dicts)"""
+        date_format = '%Y-%m-%d %H:%M' if self.interval in INTRADAY_INTERVALS else '%Y-%m-%d'
+        signals = {
+            'date': timestamp.strftime(date_format),
+            'close_price': round(latest['Close'], 2),
+            'volume': int(latest['Volume']) if not pd.isna(latest['Volume']) else 0,
+            'volatility': round(latest['Volatility'], 2) if not pd.isna(latest['Volatility']) else 0,
+            'short_term': self.analyze_short_term(latest, previous),
+            'medium_term': self.analyze_medium_term(latest, previous),
+            'long_term': self.analyze_long_term(latest, previous),
+            'overall_trend': None
+        }
 
-            self.results = signals
+        if 'RSI' in latest:
+            signals['momentum'] = self.analyze_momentum(latest, previous)
+
+        # Determine overall trend
+        signals['overall_trend'] = self.determine_overall_trend(signals)
+        return signals
+
+    def _require_full_indicators(self):
+        """
+        A checkpoint resume only fills the indicator rows the engine produced (the
+        checkpointed pair and the new bars). Recompute every row before a method
+        reads the whole history; the engine state is kept for the next update.
+        """
+        if not self._partial_indicators:
             return True
+        logger.info("Indicators were resumed from a checkpoint; recomputing them for the full history")
+        return self.calculate_moving_averages()
+
+    def signal_history(self, labels=True):
+        """
+        Short/medium/long-term signals and strengths, overall trend and recommendation
+        for every bar, vectorized (the last row matches generate_signals). Returns a
+        DataFrame of labels, or of integer codes with labels=False.
+        """
+        if self.data is None or '200DMA' not in self.data.columns:
+            logger.error("No indicators available. Please calculate moving averages first.")
+            return None
+        if not self._require_full_indicators():
+            return None
 
+        series = signal_series(self.data, rules=self.rules)
+        return label_series(series, self.data.index) if labels else pd.DataFrame(series, index=self.data.index)
+
+    def backtest(self, **options):
+        """
+        Backtest the historical recommendations (see backtest.backtest for the
+        position map, cost_bps and slippage_bps options). Returns (per-bar DataFrame,
+        summary dict) or None.
+        """
+        if self.data is None or '200DMA' not in self.data.columns:
+            logger.error("No indicators available. Please calculate moving averages first.")
+            return None
+        if not self._require_full_indicators():
+            return None
+
+        try:
+            return backtest_frame(self.data, rules=self.rules, periods_per_year=bars_per_year(self.interval),
+                                  **options)
         except Exception as e:
-            logger.error(f"Error generating signals: {str(e)}")
+            logger.error(f"Error running backtest: {str(e)}")
+            return None
+
+    def walk_forward(self, **options):
+        """
+        Walk-forward evaluation of the signal parameters on the loaded bars with this
+        analyzer's rules (see walk_forward.walk_forward for train/test sizes, grid and
+        backtest options). Returns the result dict or None.
+        """
+        if self.data is None:
+            logger.error("No data available. Please fetch data first.")
+            return None
+
+        try:
+            return walk_forward(self.data['Close'].to_numpy(dtype='float64'), index=self.data.index,
+                                rules=self.rules, periods_per_year=bars_per_year(self.interval), **options)
+        except Exception as e:
+            logger.error(f"Error running walk-forward evaluation: {str(e)}")
+            return None
+
+    def on_bar(self, bar):
+        """
+        Append a completed bar (e.g. from TickBarAggregator) and update indicators
+        and signals without rebuilding the DataFrame. Historical bars already in
+        self.data seed the live buffers on the first call.
+        """
+        try:
+            if self.live is None:
+                periods = bars_per_year(self.interval)
+                self.live = LiveBars.from_frame(self.data, periods) if self.data is not None else LiveBars(
+                    periods_per_year=periods)
+
+            latest, previous = self.live.append(bar)
+            if previous is None:
+                return False
+
+            timestamp = pd.Timestamp(bar.timestamp, tz='UTC').tz_convert('Asia/Kolkata')
+            self.results = self.build_signals(latest, previous, timestamp)
+            return True
+
+        except Exception as e:
+            logger.error(f"Error processing live bar: {str(e)}")
             return False
 
     def analyze_short_term(self, latest, previous):
@@ -109,32 +533,7 @@ class NiftyWebAnalyzer:
         dma_5 = latest['5DMA']
         ema_5 = latest['5DEMA']
 
-        prev_dma_5 = previous['5DMA']
-        prev_ema_5 = previous['5DEMA']
-
-        signal = "NEUTRAL"
-        strength = 0
-
-        # Price vs MA analysis
-        above_ma = (close > dma_5) and (close > ema_5)
-        below_ma = (close < dma_5) and (close < ema_5)
-
-        # Momentum analysis
-        ma_rising = (dma_5 > prev_dma_5) and (ema_5 > prev_ema_5)
-        ma_falling = (dma_5 < prev_dma_5) and (ema_5 < prev_ema_5)
-
-        if above_ma and ma_rising:
-            signal = "BUY"
-            strength = 2
-        elif above_ma or ma_rising:
-            signal = "BUY"
-            strength = 1
-        elif below_ma and ma_falling:
-            signal = "SELL"
-            strength = 2
-        elif below_ma or ma_falling:
-            signal = "SELL"
-            strength = 1
+        signal, strength = self.rules['short_term'].evaluate_row(latest, previous)
 
         return {
             'signal': signal,
@@ -168,18 +567,7 @@ class NiftyWebAnalyzer:
         price_vs_ma = (close / dma_50) - 1
         ma_trend = (dma_50 / prev_dma_50) - 1
 
-        if close > dma_50 and ma_trend > 0:
-            signal = "BUY"
-            strength = 2 if price_vs_ma > 0.02 else 1
-        elif close > dma_50:
-            signal = "BUY"
-            strength = 1
-        elif close < dma_50 and ma_trend < 0:
-            signal = "SELL"
-            strength = 2 if price_vs_ma < -0.02 else 1
-        elif close < dma_50:
-            signal = "SELL"
-            strength = 1
+        signal, strength = self.rules['medium_term'].evaluate_row(latest, previous)
 
         return {
             'signal': signal,
@@ -210,18 +598,7 @@ class NiftyWebAnalyzer:
         price_vs_ma = (close / dma_200) - 1
         ma_trend = (dma_200 / prev_dma_200) - 1
 
-        if close > dma_200 and ma_trend > 0:
-            signal = "BUY"
-            strength = 2 if price_vs_ma > 0.05 else 1
-        elif close > dma_200:
-            signal = "BUY"  
-            strength = 1
-        elif close < dma_200 and ma_trend < 0:
-            signal = "SELL"
-            strength = 2 if price_vs_ma < -0.05 else 1
-        elif close < dma_200:
-            signal = "SELL"
-            strength = 1
+        signal, strength = self.rules['long_term'].evaluate_row(latest, previous)
 
         return {
             'signal': signal,
@@ -231,6 +608,64 @@ class NiftyWebAnalyzer:
             'ma_values': {'200DMA': round(dma_200, 2)}
         }
 
+    def analyze_momentum(self, latest, previous):
+        """Analyze momentum using RSI, MACD, Bollinger Bands, Stochastic and ATR"""
+        def value(row, column):
+            return None if pd.isna(row[column]) else row[column]
+
+        rsi = value(latest, 'RSI')
+        histogram = value(latest, 'MACD_Hist')
+        prev_histogram = value(previous, 'MACD_Hist')
+        stoch_k = value(latest, 'Stoch_K')
+        stoch_d = value(latest, 'Stoch_D')
+        atr = value(latest, 'ATR')
+
+        signal = "NEUTRAL"
+        strength = 0
+
+        rsi_state = "NEUTRAL"
+        if rsi is not None and rsi > 70:
+            rsi_state = "OVERBOUGHT"
+        elif rsi is not None and rsi < 30:
+            rsi_state = "OVERSOLD"
+
+        macd_cross = None
+        if histogram is not None and prev_histogram is not None:
+            if histogram > 0 >= prev_histogram:
+                macd_cross = "BULLISH"
+            elif histogram < 0 <= prev_histogram:
+                macd_cross = "BEARISH"
+
+        # MACD direction, unless RSI says the move is already stretched
+        if histogram is not None and histogram > 0 and rsi_state != "OVERBOUGHT":
+            signal = "BUY"
+            confirmed = stoch_k is not None and stoch_d is not None and stoch_k > stoch_d
+            strength = 2 if macd_cross == "BULLISH" or confirmed else 1
+        elif histogram is not None and histogram < 0 and rsi_state != "OVERSOLD":
+            signal = "SELL"
+            confirmed = stoch_k is not None and stoch_d is not None and stoch_k < stoch_d
+            strength = 2 if macd_cross == "BEARISH" or confirmed else 1
+
+        return {
+            'signal': signal,
+            'strength': strength,
+            'rsi': round(rsi, 2) if rsi is not None else 0,
+            'rsi_state': rsi_state,
+            'macd': {
+                'macd': round(latest['MACD'], 2) if not pd.isna(latest['MACD']) else 0,
+                'signal': round(latest['MACD_Signal'], 2) if not pd.isna(latest['MACD_Signal']) else 0,
+                'histogram': round(histogram, 2) if histogram is not None else 0,
+                'cross': macd_cross
+            },
+            'bollinger_percent_b': round(latest['BB_PercentB'], 2) if not pd.isna(latest['BB_PercentB']) else 0,
+            'stochastic': {
+                'k': round(stoch_k, 2) if stoch_k is not None else 0,
+                'd': round(stoch_d, 2) if stoch_d is not None else 0
+            },
+            'atr': round(atr, 2) if atr is not None else 0,
+            'atr_pct': round(atr / latest['Close'] * 100, 2) if atr is not None else 0
+        }
+
     def determine_overall_trend(self, signals):
         """Determine overall market trend based on all timeframes"""
         short = signals['short_term']['signal']
@@ -345,7 +780,7 @@ class NiftyWebAnalyzer:
             report = {
                 'analysis_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
                 'market_data': {
-                    'symbol': 'NIFTY 50',
+                    'symbol': self.display_name,
                     'current_price': self.results['close_price'],
                     'volume': self.results['volume'],
                     'volatility': self.results['volatility'],
@@ -368,18 +803,32 @@ def main():
     logger.info("Starting Nifty 50 Web Analysis")
 
     try:
-        # Initialize analyzer
-        analyzer = NiftyWebAnalyzer()
+        # Initialize analyzer (set NIFTY_CACHE_DIR to reuse history between runs,
+        # NIFTY_REPLAY_DIR to run offline from fixture files)
+        replay_dir = os.environ.get('NIFTY_REPLAY_DIR')
+        provider = ReplayProvider(replay_dir) if replay_dir else None
+        cache_dir = os.environ.get('NIFTY_CACHE_DIR')
+        analyzer = NiftyWebAnalyzer(cache_dir=cache_dir, provider=provider)
+
+        # Indicator state is checkpointed next to the cache (or at NIFTY_CHECKPOINT)
+        checkpoint = os.environ.get('NIFTY_CHECKPOINT') or \
+            (os.path.join(os.path.expanduser(cache_dir), 'indicator_state.npz') if cache_dir else None)
 
         # Fetch data
         if not analyzer.fetch_data():
             logger.error("Failed to fetch data")
             return False
 
-        # Calculate indicators
-        if not analyzer.calculate_moving_averages():
+        # Calculate indicators, resuming from the previous run's state when possible. The
+        # checkpointed engine needs every column; otherwise only what the signals read
+        if checkpoint and analyzer.resume_from_checkpoint(checkpoint):
+            pass
+        elif not (analyzer.calculate_moving_averages(method="incremental") if checkpoint else
+                  analyzer.calculate_moving_averages(indicators=SIGNAL_INDICATORS)):
             logger.error("Failed to calculate moving averages")
             return False
+        if checkpoint:
+            analyzer.save_checkpoint(checkpoint)
 
         # Generate signals
         if not analyzer.generate_signals():
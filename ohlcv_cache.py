@@ -0,0 +1,125 @@
+import os
+import re
+import logging
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+PERIOD_PATTERN = re.compile(r'^(\d+)(d|wk|mo|y)$')
+
+# Yahoo's first bar for a period can start a few sessions after the nominal
+# start date (weekends, exchange holidays), so allow some slack before
+# deciding the cache does not cover a period.
+COVERAGE_SLACK = pd.Timedelta(days=7)
+
+
+def period_start(period, now=None):
+    """Return the first timestamp covered by a Yahoo-style period string, or None for 'max'"""
+    now = now if now is not None else pd.Timestamp.now()
+    if period == 'max':
+        return None
+    if period == 'ytd':
+        return pd.Timestamp(year=now.year, month=1, day=1, tz=now.tz)
+
+    match = PERIOD_PATTERN.match(period)
+    if not match:
+        raise ValueError(f"Unsupported period: {period}")
+
+    count, unit = int(match.group(1)), match.group(2)
+    offsets = {
+        'd': pd.DateOffset(days=count),
+        'wk': pd.DateOffset(weeks=count),
+        'mo': pd.DateOffset(months=count),
+        'y': pd.DateOffset(years=count),
+    }
+    return (now - offsets[unit]).normalize()
+
+
+class OHLCVCache:
+    """
+    On-disk OHLCV history cache with incremental top-up.
+    The first fetch stores the full history; later fetches only request bars
+    from the last cached session onwards and merge them in. Files are keyed by
+    the source provider's name as well, so providers can share a cache directory
+    without merging one provider's bars into another's history.
+    """
+
+    def __init__(self, cache_dir, source):
+        self.cache_dir = os.path.expanduser(cache_dir)
+        self.source = source
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def path_for(self, symbol, interval='1d'):
+        """Return the cache file path for a symbol/interval pair from this cache's source"""
+        safe_symbol = re.sub(r'[^A-Za-z0-9_.-]', '_', symbol)
+        safe_source = re.sub(r'[^A-Za-z0-9_.-]', '_', self.source)
+        return os.path.join(self.cache_dir, f"{safe_source}_{safe_symbol}_{interval}.pkl")
+
+    def load(self, symbol, interval='1d'):
+        """Load cached history, or None if nothing usable is cached"""
+        path = self.path_for(symbol, interval)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            data = pd.read_pickle(path)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cache file {path}: {str(e)}")
+            return None
+
+        return data if not data.empty else None
+
+    def save(self, symbol, data, interval='1d'):
+        """Atomically write history to the cache"""
+        path = self.path_for(symbol, interval)
+        tmp_path = f"{path}.tmp"
+        data.to_pickle(tmp_path)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def merge(cached, fresh):
+        """Merge freshly fetched bars into cached history, preferring the fresh values"""
+        if fresh is None or fresh.empty:
+            return cached
+        if cached is None:
+            return fresh.sort_index()
+
+        combined = pd.concat([cached, fresh])
+        combined = combined[~combined.index.duplicated(keep='last')]
+        return combined.sort_index()
+
+    def fetch(self, symbol, fetch_history, period='1y', interval='1d'):
+        """
+        Return history for the requested period, topping up the cache first.
+        fetch_history(period=..., start=...) must return an OHLCV DataFrame.
+        """
+        cached = self.load(symbol, interval)
+        # Periods are measured back from the last bar, as ReplayProvider does, so a
+        # replayed (or stale) history gets the same window with or without the cache
+        start = period_start(period, cached.index[-1]) if cached is not None else None
+
+        if cached is not None and (start is None or cached.index[0] > start + COVERAGE_SLACK):
+            # Cache does not reach back far enough for this period
+            logger.info(f"Cache for {symbol} does not cover period {period}, refetching")
+            cached = None
+
+        if cached is None:
+            fresh = fetch_history(period=period, start=None)
+        else:
+            # Refetch the last cached session as well, in case it was still in progress
+            top_up_start = cached.index[-1].normalize()
+            logger.info(f"Topping up cached {symbol} history from {top_up_start.strftime('%Y-%m-%d')}")
+            fresh = fetch_history(period=None, start=top_up_start)
+
+        combined = self.merge(cached, fresh)
+        if combined is None or combined.empty:
+            return combined
+
+        self.save(symbol, combined, interval)
+        added = len(combined) - (len(cached) if cached is not None else 0)
+        logger.info(f"Cache for {symbol} holds {len(combined)} bars ({added} new)")
+
+        start = period_start(period, combined.index[-1])
+        if start is not None:
+            combined = combined[combined.index >= start]
+        return combined
@@ -0,0 +1,135 @@
+import logging
+import numpy as np
+from ma_kernel import multi_window_sma
+
+logger = logging.getLogger(__name__)
+
+OSCILLATOR_COLUMNS = ['RSI', 'ATR', 'MACD', 'MACD_Signal', 'MACD_Hist', 'BB_Upper', 'BB_Middle', 'BB_Lower',
+                      'BB_PercentB', 'Stoch_K', 'Stoch_D']
+
+
+def ema_scan(values, alpha, start=0, initial=None):
+    """
+    Exponential recurrence y[t] = (1 - alpha) * y[t-1] + alpha * x[t] for t > start,
+    with y[start] = initial (default x[start]) and NaN before start. Evaluated as
+    a log-step prefix scan (ceil(log2 n) vectorized passes, no per-bar loop); every
+    pass adds decaying terms, so rounding does not grow with series length.
+    """
+    values = np.asarray(values, dtype='float64')
+    out = np.full(len(values), np.nan)
+    if start >= len(values):
+        return out
+
+    terms = alpha * values[start:]
+    terms[0] = values[start] if initial is None else initial
+    decay = 1.0 - alpha
+    step = 1
+    while step < len(terms) and decay > 0.0:
+        # terms[t] becomes the sum of the last 2*step terms, each weighted by decay**age
+        terms[step:] += decay * terms[:-step]
+        decay *= decay
+        step *= 2
+    out[start:] = terms
+    return out
+
+
+def wilder_average(values, period, first=0):
+    """
+    Wilder's smoothing: the first value is the simple mean of values[first:first+period],
+    then y[t] = y[t-1] + (x[t] - y[t-1]) / period.
+    """
+    values = np.asarray(values, dtype='float64')
+    start = first + period - 1
+    if start >= len(values):
+        return np.full(len(values), np.nan)
+    return ema_scan(values, 1.0 / period, start=start, initial=values[first:start + 1].mean())
+
+
+def _rolling_max(values, window):
+    """
+    Trailing-window maximum in O(n) regardless of window length (van Herk/Gil-Werman):
+    within blocks of `window` bars, a prefix and a suffix running maximum cover
+    every window with one comparison. NaN until the window is full.
+    """
+    n = len(values)
+    out = np.full(n, np.nan)
+    if n < window:
+        return out
+    blocks = -(-n // window)
+    padded = np.full(blocks * window, -np.inf)
+    padded[:n] = values
+    prefix = np.maximum.accumulate(padded.reshape(blocks, window), axis=1).ravel()
+    suffix = np.maximum.accumulate(padded.reshape(blocks, window)[:, ::-1], axis=1)[:, ::-1].ravel()
+    out[window - 1:] = np.maximum(suffix[:n - window + 1], prefix[window - 1:n])
+    return out
+
+
+def compute_oscillators(high, low, close, rsi_period=14, atr_period=14, macd=(12, 26, 9), bollinger=(20, 2.0),
+                        stochastic=(14, 3)):
+    """
+    RSI and ATR (Wilder smoothing), MACD, Bollinger Bands and the Stochastic
+    oscillator from High/Low/Close arrays in one pass. The previous close, the
+    close-to-close change and the rolling windows are computed once and shared.
+    Returns name -> float64 array (see OSCILLATOR_COLUMNS); bars before an
+    indicator has enough history are NaN.
+    """
+    high = np.asarray(high, dtype='float64')
+    low = np.asarray(low, dtype='float64')
+    close = np.asarray(close, dtype='float64')
+    n = len(close)
+    result = {}
+
+    # Shared intermediates: previous close and the close-to-close change
+    previous_close = np.empty(n)
+    previous_close[:1] = np.nan
+    previous_close[1:] = close[:-1]
+    change = close - previous_close
+
+    # RSI: Wilder averages of gains and losses, seeded after rsi_period changes
+    gains = np.maximum(change, 0.0)
+    losses = np.maximum(-change, 0.0)
+    average_gain = wilder_average(gains, rsi_period, first=1)
+    average_loss = wilder_average(losses, rsi_period, first=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 100.0 - 100.0 / (1.0 + average_gain / average_loss)
+    result['RSI'] = np.where(average_loss == 0.0, 100.0, rsi)
+    result['RSI'][np.isnan(average_gain)] = np.nan
+
+    # ATR: Wilder average of the true range (the first bar has no previous close)
+    true_range = np.fmax(high - low, np.fmax(np.abs(high - previous_close), np.abs(low - previous_close)))
+    result['ATR'] = wilder_average(true_range, atr_period)
+
+    # MACD: pandas-style EMAs (adjust=False) seeded at the first value
+    fast, slow, signal = macd
+    macd_line = ema_scan(close, 2.0 / (fast + 1)) - ema_scan(close, 2.0 / (slow + 1))
+    result['MACD'] = macd_line
+    result['MACD_Signal'] = ema_scan(macd_line, 2.0 / (signal + 1))
+    result['MACD_Hist'] = macd_line - result['MACD_Signal']
+
+    # Bollinger Bands: SMA +/- k population standard deviations. Window means of the
+    # close and its square come from one kernel call; centring on a reference level
+    # first keeps the mean-of-squares subtraction well conditioned
+    window, width = bollinger
+    reference = np.nanmean(close[:1024]) if n else 0.0
+    centred = close - reference
+    means = multi_window_sma(np.column_stack([centred, centred * centred]), [window])[0]
+    middle = means[:, 0] + reference
+    deviation = np.sqrt(np.maximum(means[:, 1] - means[:, 0] * means[:, 0], 0.0))
+    result['BB_Upper'] = middle + width * deviation
+    result['BB_Middle'] = middle
+    result['BB_Lower'] = middle - width * deviation
+    band = result['BB_Upper'] - result['BB_Lower']
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result['BB_PercentB'] = np.where(band > 0, (close - result['BB_Lower']) / band, 0.5)
+    result['BB_PercentB'][np.isnan(band)] = np.nan
+
+    # Stochastic: %K from the trailing high/low range (flat range -> 50), %D its SMA
+    k_period, d_period = stochastic
+    highest, lowest = _rolling_max(high, k_period), -_rolling_max(-low, k_period)
+    price_range = highest - lowest
+    with np.errstate(divide='ignore', invalid='ignore'):
+        stoch_k = np.where(price_range > 0, 100.0 * (close - lowest) / price_range, 50.0)
+    stoch_k[np.isnan(price_range)] = np.nan
+    result['Stoch_K'] = stoch_k
+    result['Stoch_D'] = multi_window_sma(stoch_k, [d_period])[0]
+    return result
@@ -0,0 +1,99 @@
+import math
+import logging
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+NSE_TIMEZONE = "Asia/Kolkata"
+NSE_SESSION_OPEN = "09:15"
+NSE_SESSION_CLOSE = "15:30"
+TRADING_DAYS_PER_YEAR = 252
+
+# Yahoo interval strings -> pandas offsets for intraday bars
+INTRADAY_INTERVALS = {
+    '1m': '1min', '2m': '2min', '5m': '5min', '15m': '15min', '30m': '30min',
+    '60m': '60min', '90m': '90min', '1h': '60min',
+}
+PERIODS_PER_YEAR = {'1d': TRADING_DAYS_PER_YEAR, '5d': TRADING_DAYS_PER_YEAR / 5, '1wk': 52, '1mo': 12, '3mo': 4}
+
+
+def _session_bounds(session_open, session_close):
+    open_offset = pd.Timedelta(f"{session_open}:00")
+    close_offset = pd.Timedelta(f"{session_close}:00")
+    return open_offset, close_offset
+
+
+def session_minutes(session_open=NSE_SESSION_OPEN, session_close=NSE_SESSION_CLOSE):
+    """Return the length of a trading session in minutes"""
+    open_offset, close_offset = _session_bounds(session_open, session_close)
+    return int((close_offset - open_offset) / pd.Timedelta(minutes=1))
+
+
+def bars_per_year(interval, session_open=NSE_SESSION_OPEN, session_close=NSE_SESSION_CLOSE):
+    """Number of bars per year for an interval, used to annualise volatility"""
+    if interval in PERIODS_PER_YEAR:
+        return PERIODS_PER_YEAR[interval]
+    rule = INTRADAY_INTERVALS.get(interval, interval)
+    minutes = pd.Timedelta(rule) / pd.Timedelta(minutes=1)
+    # Bins are anchored at the session open, so a trailing partial bin still counts as a bar
+    return TRADING_DAYS_PER_YEAR * math.ceil(session_minutes(session_open, session_close) / minutes)
+
+
+def resample_ohlcv(data, rule, session_open=NSE_SESSION_OPEN, session_close=NSE_SESSION_CLOSE, tz=NSE_TIMEZONE):
+    """
+    Build higher-timeframe OHLCV bars from lower-timeframe bars.
+    Bins are anchored at the session open and never cross a session boundary;
+    bars outside the session are discarded. rule is a pandas offset ('5min',
+    '1h') or a Yahoo interval ('5m', '1h'); '1d' builds one bar per session.
+    Intraday bars are labelled with the bin start. Data must be sorted by time.
+    """
+    if data is None or data.empty:
+        return data
+
+    index = pd.DatetimeIndex(data.index)
+    index = index.tz_localize(tz) if index.tz is None else index.tz_convert(tz)
+    open_offset, close_offset = _session_bounds(session_open, session_close)
+
+    # Local wall-clock nanoseconds, so session dates and times fall out of integer arithmetic
+    local_ns = index.tz_localize(None).values.astype('datetime64[ns]').view('int64')
+    day_ns = pd.Timedelta(days=1).value
+    day = local_ns // day_ns
+    offset = local_ns - day * day_ns - open_offset.value
+    in_session = (offset >= 0) & (offset < (close_offset - open_offset).value)
+
+    daily = rule in ('1d', 'D', '1D')
+    if daily:
+        bin_ns = (close_offset - open_offset).value
+    else:
+        bin_ns = pd.Timedelta(INTRADAY_INTERVALS.get(rule, rule)).value
+
+    if not in_session.any():
+        return data.iloc[0:0]
+
+    day = day[in_session]
+    offset = offset[in_session]
+    bins_per_session = -(-(close_offset - open_offset).value // bin_ns)
+    group = day * bins_per_session + offset // bin_ns
+
+    starts = np.flatnonzero(np.r_[True, group[1:] != group[:-1]])
+    ends = np.r_[starts[1:], len(group)] - 1
+
+    columns = {}
+    if 'Open' in data.columns:
+        columns['Open'] = data['Open'].to_numpy()[in_session][starts]
+    if 'High' in data.columns:
+        columns['High'] = np.maximum.reduceat(data['High'].to_numpy()[in_session], starts)
+    if 'Low' in data.columns:
+        columns['Low'] = np.minimum.reduceat(data['Low'].to_numpy()[in_session], starts)
+    columns['Close'] = data['Close'].to_numpy()[in_session][ends]
+    if 'Volume' in data.columns:
+        columns['Volume'] = np.add.reduceat(data['Volume'].to_numpy()[in_session], starts)
+
+    if daily:
+        # Session bars are labelled at midnight, like Yahoo's daily bars
+        label_ns = day[starts] * day_ns
+    else:
+        label_ns = day[starts] * day_ns + open_offset.value + (offset[starts] // bin_ns) * bin_ns
+    labels = pd.DatetimeIndex(label_ns.view('datetime64[ns]')).tz_localize(tz)
+    return pd.DataFrame(columns, index=labels)
@@ -0,0 +1,230 @@
+import math
+import logging
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+logger = logging.getLogger(__name__)
+
+NAN = float('nan')
+
+# Rows of windows materialised at once by the batch functions (bounds the
+# temporary (chunk, window) arrays to a few MB)
+CHUNK_ROWS = 65_536
+
+# The streaming moments are recomputed with a two-pass sum over the window every
+# this many updates, so rounding cannot accumulate on endless streams.
+RESYNC_INTERVAL = 1_000
+
+
+def _rolling_moments(x, y, window, ddof, chunk_rows):
+    """Windowed means of x and y and their co-moment / (window - ddof), two-pass per window"""
+    x = np.asarray(x, dtype='float64')
+    y = x if y is None else np.asarray(y, dtype='float64')
+    if x.shape != y.shape:
+        raise ValueError(f"x has shape {x.shape} but y has shape {y.shape}")
+    n = x.shape[0]
+    mean_x = np.full(x.shape, np.nan)
+    mean_y = mean_x if y is x else np.full(y.shape, np.nan)
+    comoment = np.full(x.shape, np.nan)
+    if n < window:
+        return mean_x, mean_y, comoment
+
+    # Windows along axis 0; sliding_window_view appends the window axis last
+    windows_x = sliding_window_view(x, window, axis=0)
+    windows_y = windows_x if y is x else sliding_window_view(y, window, axis=0)
+    for start in range(0, n - window + 1, chunk_rows):
+        stop = min(start + chunk_rows, n - window + 1)
+        out = slice(start + window - 1, stop + window - 1)
+        chunk_x = windows_x[start:stop]
+        mean_x[out] = chunk_x.mean(axis=-1)
+        centred_x = chunk_x - mean_x[out][..., None]
+        if y is x:
+            comoment[out] = np.einsum('...i,...i->...', centred_x, centred_x) / (window - ddof)
+        else:
+            chunk_y = windows_y[start:stop]
+            mean_y[out] = chunk_y.mean(axis=-1)
+            centred_y = chunk_y - mean_y[out][..., None]
+            comoment[out] = np.einsum('...i,...i->...', centred_x, centred_y) / (window - ddof)
+    return mean_x, mean_y, comoment
+
+
+def rolling_mean_var(values, window, ddof=1, chunk_rows=CHUNK_ROWS):
+    """
+    Rolling mean and variance over a trailing window, vectorized. values is 1-D
+    or 2-D with time on axis 0. Each window is reduced exactly two-pass (mean,
+    then squared deviations from it), chunk by chunk, so accuracy does not depend
+    on series length or on the level of the data. Like pandas rolling(window),
+    a window that is not full or holds a NaN gives NaN.
+    """
+    mean, _, variance = _rolling_moments(values, None, window, ddof, chunk_rows)
+    return mean, variance
+
+
+def rolling_std(values, window, ddof=1, chunk_rows=CHUNK_ROWS):
+    """Rolling standard deviation (see rolling_mean_var)"""
+    return np.sqrt(rolling_mean_var(values, window, ddof, chunk_rows)[1])
+
+
+def rolling_cov(x, y, window, ddof=1, chunk_rows=CHUNK_ROWS):
+    """Rolling covariance of two equally shaped series (see rolling_mean_var)"""
+    return _rolling_moments(x, y, window, ddof, chunk_rows)[2]
+
+
+class RollingCovariance:
+    """
+    Streaming windowed means and co-moment of (x, y) pairs with Welford updates:
+    O(1) per update, one ring buffer, and no sum-of-squares cancellation. The
+    moments are kept relative to a shift near the window mean, so rounding scales
+    with the spread of the data rather than its level. NaN pairs are kept out of
+    the moments; results are NaN while the window is not full or holds a NaN.
+    """
+
+    def __init__(self, window, ddof=1):
+        self.window = window
+        self.ddof = ddof
+        self.xs = [0.0] * window
+        self.ys = [0.0] * window
+        self.pos = 0
+        self.count = 0  # pairs in the window, NaN or not
+        self.nan_count = 0
+        self.n = 0  # valid pairs in the moments
+        self.shift_x = 0.0
+        self.shift_y = 0.0
+        self.mean_x = 0.0  # relative to shift_x
+        self.mean_y = 0.0  # relative to shift_y
+        self.comoment = 0.0
+        self._updates = 0
+
+    def _add(self, x, y):
+        if self.n == 0:
+            self.shift_x, self.shift_y = x, y
+        x -= self.shift_x
+        y -= self.shift_y
+        self.n += 1
+        dx = x - self.mean_x
+        self.mean_x += dx / self.n
+        self.mean_y += (y - self.mean_y) / self.n
+        self.comoment += dx * (y - self.mean_y)
+
+    def _remove(self, x, y):
+        self.n -= 1
+        if self.n == 0:
+            self.mean_x = self.mean_y = self.comoment = 0.0
+            return
+        x -= self.shift_x
+        y -= self.shift_y
+        dx = x - self.mean_x
+        self.mean_x -= dx / self.n
+        self.mean_y -= (y - self.mean_y) / self.n
+        self.comoment -= dx * (y - self.mean_y)
+
+    def _resync(self):
+        """Recompute the moments two-pass from the window contents"""
+        pairs = [(x, y) for x, y in zip(self.xs[:self.count], self.ys[:self.count]) if x == x and y == y]
+        self.n = len(pairs)
+        if not pairs:
+            self.mean_x = self.mean_y = self.comoment = 0.0
+            return
+        # Re-centre the shift on the current window mean
+        self.shift_x = math.fsum(x for x, _ in pairs) / self.n
+        self.shift_y = math.fsum(y for _, y in pairs) / self.n
+        pairs = [(x - self.shift_x, y - self.shift_y) for x, y in pairs]
+        self.mean_x = math.fsum(x for x, _ in pairs) / self.n
+        self.mean_y = math.fsum(y for _, y in pairs) / self.n
+        self.comoment = math.fsum((x - self.mean_x) * (y - self.mean_y) for x, y in pairs)
+
+    def push(self, x, y):
+        """Add a pair, evicting the oldest once the window is full"""
+        if self.count == self.window:
+            old_x, old_y = self.xs[self.pos], self.ys[self.pos]
+            if old_x == old_x and old_y == old_y:
+                self._remove(old_x, old_y)
+            else:
+                self.nan_count -= 1
+        else:
+            self.count += 1
+
+        self.xs[self.pos] = x
+        self.ys[self.pos] = y
+        if x == x and y == y:
+            self._add(x, y)
+        else:
+            self.nan_count += 1
+        self.pos = (self.pos + 1) % self.window
+
+        self._updates += 1
+        if self._updates % RESYNC_INTERVAL == 0:
+            self._resync()
+        elif self.pos == 0 and x == x and y == y:
+            # Once per window, move the shift to the newest pair so a drifting series
+            # stays centred. The co-moment does not depend on the shift, and x - shift
+            # is exact for nearby values, so only the relative means are rounded
+            self.mean_x -= x - self.shift_x
+            self.mean_y -= y - self.shift_y
+            self.shift_x, self.shift_y = x, y
+
+    @property
+    def ready(self):
+        """True when the window is full and holds no NaN"""
+        return self.count == self.window and not self.nan_count
+
+    def covariance(self):
+        """Windowed covariance (NaN until ready)"""
+        return self.comoment / (self.window - self.ddof) if self.ready else NAN
+
+    def update(self, x, y):
+        """Push a pair and return the windowed covariance"""
+        self.push(x, y)
+        return self.covariance()
+
+    def seed(self, xs, ys):
+        """Load the window from the tails of two history arrays"""
+        xs = [float(v) for v in xs[-self.window:]]
+        ys = [float(v) for v in ys[-self.window:]]
+        self.count = len(xs)
+        self.xs = xs + [0.0] * (self.window - self.count)
+        self.ys = ys + [0.0] * (self.window - self.count)
+        self.pos = self.count % self.window
+        self.nan_count = sum(1 for x, y in zip(xs, ys) if x != x or y != y)
+        self._resync()
+
+    def state(self):
+        """Return the window state as (buffers, counters, moments) arrays"""
+        counters = np.array([self.pos, self.count, self.nan_count, self.n, self._updates], dtype='int64')
+        return (np.array([self.xs, self.ys], dtype='float64'), counters,
+                np.array([self.shift_x, self.shift_y, self.mean_x, self.mean_y, self.comoment]))
+
+    def restore(self, buffers, counters, moments):
+        """Load a state produced by state()"""
+        self.xs = [float(v) for v in buffers[0]]
+        self.ys = [float(v) for v in buffers[1]]
+        self.pos, self.count, self.nan_count, self.n, self._updates = (int(v) for v in counters)
+        self.shift_x, self.shift_y, self.mean_x, self.mean_y, self.comoment = (float(v) for v in moments)
+
+
+class RollingVariance(RollingCovariance):
+    """Streaming windowed mean and variance (Welford); the covariance of a series with itself"""
+
+    def update(self, value):
+        """Push a value and return the windowed variance"""
+        self.push(value, value)
+        return self.covariance()
+
+    def variance(self):
+        """Windowed variance (NaN until ready)"""
+        return self.covariance()
+
+    def std(self):
+        """Windowed standard deviation (NaN until ready)"""
+        variance = self.covariance()
+        if variance != variance:
+            return NAN
+        return math.sqrt(variance) if variance > 0 else 0.0
+
+    def mean(self):
+        """Windowed mean (NaN until ready)"""
+        return self.shift_x + self.mean_x if self.ready else NAN
+
+    def seed(self, values):
+        """Load the window from the tail of a history array"""
+        super().seed(values, values)
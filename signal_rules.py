@@ -0,0 +1,240 @@
+import logging
+import operator
+from functools import reduce
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+NAN = float('nan')
+
+SIGNAL_CODES = {'BUY': 1, 'NEUTRAL': 0, 'SELL': -1}
+SIGNAL_NAMES = {code: name for name, code in SIGNAL_CODES.items()}
+
+COMPARISONS = {'>': operator.gt, '>=': operator.ge, '<': operator.lt, '<=': operator.le}
+
+# Per-timeframe signal rules. Operands are columns ('Close', '5DMA'), the previous
+# bar's value ('prev.5DMA'), features, thresholds (a leading '-' negates one) or
+# numbers. Named conditions AND their comparisons. Rules are tried in order; the
+# first whose conditions all hold sets (signal, strength), otherwise NEUTRAL/0.
+# When any `guard` operand is NaN the result is NEUTRAL/0.
+SIGNAL_RULES = {
+    'short_term': {
+        'guard': [],
+        'features': {},
+        'thresholds': {},
+        'conditions': {
+            'above_ma': [('Close', '>', '5DMA'), ('Close', '>', '5DEMA')],
+            'below_ma': [('Close', '<', '5DMA'), ('Close', '<', '5DEMA')],
+            'ma_rising': [('5DMA', '>', 'prev.5DMA'), ('5DEMA', '>', 'prev.5DEMA')],
+            'ma_falling': [('5DMA', '<', 'prev.5DMA'), ('5DEMA', '<', 'prev.5DEMA')],
+        },
+        'rules': [
+            ('BUY', 2, ['above_ma', 'ma_rising']),
+            ('BUY', 1, ['above_ma']),
+            ('BUY', 1, ['ma_rising']),
+            ('SELL', 2, ['below_ma', 'ma_falling']),
+            ('SELL', 1, ['below_ma']),
+            ('SELL', 1, ['ma_falling']),
+        ],
+    },
+    'medium_term': {
+        'guard': ['50DMA', 'prev.50DMA'],
+        'features': {'price_vs_ma': ('pct', 'Close', '50DMA'), 'ma_trend': ('pct', '50DMA', 'prev.50DMA')},
+        'thresholds': {'strong': 0.02},
+        'conditions': {
+            'above_ma': [('Close', '>', '50DMA')],
+            'below_ma': [('Close', '<', '50DMA')],
+            'ma_rising': [('ma_trend', '>', 0)],
+            'ma_falling': [('ma_trend', '<', 0)],
+            'far_above': [('price_vs_ma', '>', 'strong')],
+            'far_below': [('price_vs_ma', '<', '-strong')],
+        },
+        'rules': [
+            ('BUY', 2, ['above_ma', 'ma_rising', 'far_above']),
+            ('BUY', 1, ['above_ma']),
+            ('SELL', 2, ['below_ma', 'ma_falling', 'far_below']),
+            ('SELL', 1, ['below_ma']),
+        ],
+    },
+    'long_term': {
+        'guard': ['200DMA', 'prev.200DMA'],
+        'features': {'price_vs_ma': ('pct', 'Close', '200DMA'), 'ma_trend': ('pct', '200DMA', 'prev.200DMA')},
+        'thresholds': {'strong': 0.05},
+        'conditions': {
+            'above_ma': [('Close', '>', '200DMA')],
+            'below_ma': [('Close', '<', '200DMA')],
+            'ma_rising': [('ma_trend', '>', 0)],
+            'ma_falling': [('ma_trend', '<', 0)],
+            'far_above': [('price_vs_ma', '>', 'strong')],
+            'far_below': [('price_vs_ma', '<', '-strong')],
+        },
+        'rules': [
+            ('BUY', 2, ['above_ma', 'ma_rising', 'far_above']),
+            ('BUY', 1, ['above_ma']),
+            ('SELL', 2, ['below_ma', 'ma_falling', 'far_below']),
+            ('SELL', 1, ['below_ma']),
+        ],
+    },
+}
+
+FEATURES = {
+    'pct': lambda a, b: a / b - 1,
+    'diff': lambda a, b: a - b,
+}
+
+
+def _previous(values):
+    """values shifted one bar later along axis 0 (NaN on the first bar)"""
+    shifted = np.empty_like(values)
+    shifted[:1] = np.nan
+    shifted[1:] = values[:-1]
+    return shifted
+
+
+class CompiledRules:
+    """
+    One timeframe's rule table compiled into vectorized mask expressions.
+    evaluate() scores whole histories (1-D arrays, or 2-D time x symbol);
+    thresholds may be overridden with arrays of shape (variants, 1) to score many
+    rule variants in one broadcast pass. evaluate_row() scores a single bar
+    without NumPy overhead.
+    """
+
+    def __init__(self, table):
+        self.table = table
+        self.thresholds = dict(table.get('thresholds', {}))
+        self.features = dict(table.get('features', {}))
+        self.guard = list(table.get('guard', []))
+        conditions = table['conditions']
+
+        operands = set(self.guard)
+        for comparisons in conditions.values():
+            for left, op, right in comparisons:
+                if op not in COMPARISONS:
+                    raise ValueError(f"Unknown comparison {op!r}")
+                operands.update(o for o in (left, right) if isinstance(o, str))
+        for kind, left, right in self.features.values():
+            if kind not in FEATURES:
+                raise ValueError(f"Unknown feature kind {kind!r}")
+            operands.update((left, right))
+
+        # Columns the rules read (without the prev. prefix)
+        names = {o.lstrip('-') for o in operands} - set(self.features) - set(self.thresholds)
+        self.columns = sorted({name[len('prev.'):] if name.startswith('prev.') else name for name in names})
+
+        self.rules = []
+        for signal, strength, names in table['rules']:
+            unknown = [name for name in names if name not in conditions]
+            if unknown:
+                raise KeyError(f"Unknown condition(s): {', '.join(unknown)}")
+            self.rules.append((SIGNAL_CODES[signal], strength, list(names)))
+        self.conditions = {name: [(left, COMPARISONS[op], right) for left, op, right in comparisons]
+                           for name, comparisons in conditions.items()}
+
+    def evaluate(self, columns, thresholds=None):
+        """
+        Score every bar: columns maps column name -> array. Returns (signal, strength)
+        int8 arrays; with array-valued threshold overrides they broadcast to
+        (variants,) + bars.
+        """
+        values = {name: np.asarray(columns[name], dtype='float64') for name in self.columns}
+        thresholds = {**self.thresholds, **(thresholds or {})}
+        cache = {}
+
+        def operand(name):
+            if not isinstance(name, str):
+                return name
+            if name in cache:
+                return cache[name]
+            if name.startswith('-'):
+                result = -operand(name[1:])
+            elif name in thresholds:
+                result = thresholds[name]
+            elif name in self.features:
+                kind, left, right = self.features[name]
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    result = FEATURES[kind](operand(left), operand(right))
+            elif name.startswith('prev.'):
+                result = _previous(values[name[len('prev.'):]])
+            else:
+                result = values[name]
+            cache[name] = result
+            return result
+
+        masks = {}
+
+        def condition(name):
+            if name not in masks:
+                mask = True
+                for left, compare, right in self.conditions[name]:
+                    mask = mask & compare(operand(left), operand(right))
+                masks[name] = mask
+            return masks[name]
+
+        valid = True
+        for name in self.guard:
+            valid = valid & ~np.isnan(operand(name))
+
+        # Masks may differ in shape (threshold variants), so AND them with broadcasting
+        selected = [reduce(operator.and_, [condition(name) for name in names], valid)
+                    for _, _, names in self.rules]
+        shape = np.broadcast_shapes(*(np.shape(mask) for mask in selected))
+        selected = [np.broadcast_to(mask, shape) for mask in selected]
+        signal = np.select(selected, [code for code, _, _ in self.rules], 0).astype('int8')
+        strength = np.select(selected, [strength for _, strength, _ in self.rules], 0).astype('int8')
+        return signal, strength
+
+    def evaluate_row(self, latest, previous, thresholds=None):
+        """
+        Score one bar from its row and the previous row (Series or dicts) with plain
+        float comparisons: ('BUY'|'SELL'|'NEUTRAL', strength). Matches evaluate().
+        """
+        thresholds = {**self.thresholds, **(thresholds or {})}
+        cache = {}
+
+        def operand(name):
+            if not isinstance(name, str):
+                return name
+            if name in cache:
+                return cache[name]
+            if name.startswith('-'):
+                result = -operand(name[1:])
+            elif name in thresholds:
+                result = thresholds[name]
+            elif name in self.features:
+                kind, left, right = self.features[name]
+                try:
+                    result = FEATURES[kind](operand(left), operand(right))
+                except ZeroDivisionError:
+                    result = NAN
+            elif name.startswith('prev.'):
+                result = float(previous[name[len('prev.'):]])
+            else:
+                result = float(latest[name])
+            cache[name] = result
+            return result
+
+        for name in self.guard:
+            if operand(name) != operand(name):
+                return 'NEUTRAL', 0
+
+        masks = {}
+        for code, strength, names in self.rules:
+            for name in names:
+                if name not in masks:
+                    masks[name] = all(compare(operand(left), operand(right))
+                                      for left, compare, right in self.conditions[name])
+                if not masks[name]:
+                    break
+            else:
+                return SIGNAL_NAMES[code], strength
+        return 'NEUTRAL', 0
+
+
+def compile_rules(tables=None):
+    """Compile a {timeframe: table} rule set (default SIGNAL_RULES) into CompiledRules"""
+    tables = SIGNAL_RULES if tables is None else tables
+    return {timeframe: CompiledRules(table) for timeframe, table in tables.items()}
+
+
+DEFAULT_RULES = compile_rules()
@@ -0,0 +1,87 @@
+import logging
+import numpy as np
+import pandas as pd
+from signal_rules import DEFAULT_RULES
+
+logger = logging.getLogger(__name__)
+
+# Signal codes used by the series functions
+BUY, NEUTRAL, SELL = 1, 0, -1
+SIGNAL_LABELS = {BUY: 'BUY', NEUTRAL: 'NEUTRAL', SELL: 'SELL'}
+TREND_LABELS = {BUY: 'BULLISH', NEUTRAL: 'NEUTRAL', SELL: 'BEARISH'}
+RECOMMENDATION_LABELS = {3: 'STRONG BUY', 2: 'BUY', 1: 'WEAK BUY', 0: 'HOLD',
+                         -1: 'WEAK SELL', -2: 'SELL', -3: 'STRONG SELL'}
+
+
+def _evaluate(rules, timeframe, columns, thresholds):
+    rules = DEFAULT_RULES if rules is None else rules
+    return rules[timeframe].evaluate(columns, thresholds)
+
+
+def short_term_series(close, dma_5, ema_5, rules=None, thresholds=None):
+    """Vectorized analyze_short_term: (signal, strength) int8 arrays for every bar"""
+    return _evaluate(rules, 'short_term', {'Close': close, '5DMA': dma_5, '5DEMA': ema_5}, thresholds)
+
+
+def medium_term_series(close, dma_50, rules=None, thresholds=None):
+    """Vectorized analyze_medium_term: (signal, strength) int8 arrays for every bar"""
+    return _evaluate(rules, 'medium_term', {'Close': close, '50DMA': dma_50}, thresholds)
+
+
+def long_term_series(close, dma_200, rules=None, thresholds=None):
+    """Vectorized analyze_long_term: (signal, strength) int8 arrays for every bar"""
+    return _evaluate(rules, 'long_term', {'Close': close, '200DMA': dma_200}, thresholds)
+
+
+def overall_trend_series(short, medium, long):
+    """Vectorized determine_overall_trend from three signal arrays: BUY (bullish), SELL (bearish) or NEUTRAL"""
+    signals = np.stack(np.broadcast_arrays(short, medium, long))
+    buys = (signals == BUY).sum(axis=0)
+    sells = (signals == SELL).sum(axis=0)
+    return np.select([buys >= 2, sells >= 2], [BUY, SELL], NEUTRAL).astype('int8')
+
+
+def recommendation_series(trend, total_strength):
+    """Vectorized get_recommendation: codes -3 (STRONG SELL) .. 3 (STRONG BUY), see RECOMMENDATION_LABELS"""
+    trend = np.asarray(trend)
+    total_strength = np.asarray(total_strength)
+    level = np.select([total_strength >= 5, total_strength >= 3], [3, 2], 1)
+    return (trend * level).astype('int8')
+
+
+def signal_series(data, rules=None, thresholds=None):
+    """
+    Signal and strength arrays for every bar of a frame (or a mapping of arrays,
+    bars along the first axis) with Close, 5DMA, 5DEMA, 50DMA and 200DMA columns,
+    plus the overall trend and recommendation codes.
+    The last row matches build_signals/get_recommendation on the last two rows.
+    rules is a compile_rules() set (default DEFAULT_RULES); thresholds maps a
+    timeframe to threshold overrides, e.g. {'long_term': {'strong': 0.04}}.
+    """
+    thresholds = thresholds or {}
+    columns = {name: np.asarray(data[name], dtype='float64') for name in ('Close', '5DMA', '5DEMA', '50DMA', '200DMA')}
+    series = {}
+    for prefix, timeframe in (('short', 'short_term'), ('medium', 'medium_term'), ('long', 'long_term')):
+        series[f'{prefix}_signal'], series[f'{prefix}_strength'] = _evaluate(
+            rules, timeframe, columns, thresholds.get(timeframe))
+    series['overall_trend'] = overall_trend_series(series['short_signal'], series['medium_signal'],
+                                                   series['long_signal'])
+    total_strength = series['short_strength'] + series['medium_strength'] + series['long_strength']
+    series['recommendation'] = recommendation_series(series['overall_trend'], total_strength)
+    return series
+
+
+def _labels(codes, labels):
+    """Replace integer codes (-3 .. 3) by their labels with one array lookup"""
+    lookup = np.array([labels.get(code) for code in range(-3, 4)], dtype=object)
+    return lookup[np.asarray(codes, dtype='int64') + 3]
+
+
+def label_series(series, index=None):
+    """DataFrame of signal_series output with codes replaced by their labels"""
+    series = dict(series)
+    for column in ('short_signal', 'medium_signal', 'long_signal'):
+        series[column] = _labels(series[column], SIGNAL_LABELS)
+    series['overall_trend'] = _labels(series['overall_trend'], TREND_LABELS)
+    series['recommendation'] = _labels(series['recommendation'], RECOMMENDATION_LABELS)
+    return pd.DataFrame(series, index=index)
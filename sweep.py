@@ -0,0 +1,230 @@
+import os
+import time
+import argparse
+import itertools
+import logging
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from ma_kernel import multi_window_sma
+from rolling_stats import rolling_std
+from signal_series import (short_term_series, medium_term_series, long_term_series, overall_trend_series,
+                           recommendation_series)
+from backtest import backtest
+
+logger = logging.getLogger(__name__)
+
+# Default grid: 145 valid window triples x 5 x 4 x 4 thresholds/cut-offs = 11,600 combinations
+DEFAULT_GRID = {
+    'short_window': [3, 5, 8, 10, 13],
+    'medium_window': [20, 30, 40, 50, 75, 100],
+    'long_window': [100, 150, 200, 250, 300],
+    'medium_threshold': [0.01, 0.02, 0.03, 0.04, 0.05],
+    'long_threshold': [0.03, 0.05, 0.075, 0.1],
+    'risk_cutoffs': [(15.0, 25.0), (20.0, 30.0), (25.0, 35.0), (float('inf'), float('inf'))],
+}
+VOLATILITY_WINDOW = 20
+
+# Set in each worker by _attach: the shared indicator matrix and its row layout
+_shared = {}
+
+
+def _indicator_rows(close, grid, periods_per_year):
+    """
+    Every series the grid reads, computed once: close, annualized volatility in
+    percent (the assess_risk units), an SMA per distinct window and an EMA per
+    distinct short window. Returns (matrix, {name: row}).
+    """
+    close = np.asarray(close, dtype='float64')
+    sma_windows = sorted(set(grid['short_window']) | set(grid['medium_window']) | set(grid['long_window']))
+    names = ['Close', 'Volatility'] + [f'SMA{w}' for w in sma_windows] + [f'EMA{w}' for w in grid['short_window']]
+    matrix = np.empty((len(names), len(close)))
+    layout = {name: row for row, name in enumerate(names)}
+
+    matrix[layout['Close']] = close
+    returns = np.full_like(close, np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns[1:] = close[1:] / close[:-1] - 1
+    matrix[layout['Volatility']] = rolling_std(returns, VOLATILITY_WINDOW) * np.sqrt(periods_per_year) * 100
+    first = layout[f'SMA{sma_windows[0]}']
+    multi_window_sma(close, sma_windows, out=matrix[first:first + len(sma_windows)])
+    for window in grid['short_window']:
+        # Same definition as the 5DEMA indicator
+        matrix[layout[f'EMA{window}']] = pd.Series(close).ewm(span=window, adjust=False).mean().to_numpy()
+    return matrix, layout
+
+
+def _attach(name, shape, layout):
+    """Worker initializer: map the shared indicator matrix without copying it"""
+    block = shared_memory.SharedMemory(name=name)
+    _shared['block'] = block
+    _shared['matrix'] = np.ndarray(shape, dtype='float64', buffer=block.buf)
+    _shared['layout'] = layout
+
+
+def window_signals(short_window, medium_window, long_window, grid, matrix, layout, rules=None):
+    """
+    Recommendation codes for one window triple and every threshold combination,
+    shaped (medium threshold, long threshold, 1, bars); the risk cut-offs are
+    applied later by backtest.
+    """
+    close = matrix[layout['Close']]
+    medium_thresholds = np.asarray(grid['medium_threshold'], dtype='float64')
+    long_thresholds = np.asarray(grid['long_threshold'], dtype='float64')
+
+    short, short_strength = short_term_series(close, matrix[layout[f'SMA{short_window}']],
+                                              matrix[layout[f'EMA{short_window}']], rules=rules)
+    medium, medium_strength = medium_term_series(close, matrix[layout[f'SMA{medium_window}']], rules=rules,
+                                                 thresholds={'strong': medium_thresholds[:, None]})
+    long, long_strength = long_term_series(close, matrix[layout[f'SMA{long_window}']], rules=rules,
+                                           thresholds={'strong': long_thresholds[:, None]})
+
+    # Variant axes: (medium threshold, long threshold, risk cut-offs, bars)
+    medium, medium_strength = medium[:, None, None], medium_strength[:, None, None]
+    long, long_strength = long[None, :, None], long_strength[None, :, None]
+    trend = overall_trend_series(short, medium, long)
+    return recommendation_series(trend, short_strength + medium_strength + long_strength)
+
+
+def score_windows(windows, recommendation, grid, options, matrix, layout, bars=slice(None)):
+    """
+    Backtest window_signals output over a range of bars with every risk cut-off.
+    Returns a DataFrame with one row per combination.
+    """
+    cutoffs = np.asarray(grid['risk_cutoffs'], dtype='float64')
+    result = backtest(matrix[layout['Close'], bars], recommendation[..., bars],
+                      volatility=matrix[layout['Volatility'], bars],
+                      risk_cutoffs=(cutoffs[:, 0, None], cutoffs[:, 1, None]), **options)
+
+    shape = result['summary']['total_return'].shape
+    medium_axis, long_axis, cutoff_axis = np.meshgrid(np.arange(len(grid['medium_threshold'])),
+                                                      np.arange(len(grid['long_threshold'])),
+                                                      np.arange(len(cutoffs)), indexing='ij')
+    frame = pd.DataFrame({
+        'short_window': windows[0],
+        'medium_window': windows[1],
+        'long_window': windows[2],
+        'medium_threshold': np.asarray(grid['medium_threshold'], dtype='float64')[medium_axis.ravel()],
+        'long_threshold': np.asarray(grid['long_threshold'], dtype='float64')[long_axis.ravel()],
+        'moderate_volatility': cutoffs[cutoff_axis.ravel(), 0],
+        'high_volatility': cutoffs[cutoff_axis.ravel(), 1],
+    })
+    for metric, values in result['summary'].items():
+        frame[metric] = np.broadcast_to(values, shape).ravel()
+    return frame
+
+
+def evaluate_windows(short_window, medium_window, long_window, grid, options, matrix=None, layout=None,
+                     rules=None):
+    """
+    Backtest every threshold / risk cut-off combination for one window triple in a
+    single broadcast pass. Returns a DataFrame with one row per combination.
+    """
+    matrix = _shared['matrix'] if matrix is None else matrix
+    layout = _shared['layout'] if layout is None else layout
+    windows = (short_window, medium_window, long_window)
+    recommendation = window_signals(*windows, grid, matrix, layout, rules)
+    return score_windows(windows, recommendation, grid, options, matrix, layout)
+
+
+def _window_triples(grid):
+    """Window combinations to evaluate (medium below long, short below medium)"""
+    windows = itertools.product(grid['short_window'], grid['medium_window'], grid['long_window'])
+    return [(short, medium, long) for short, medium, long in windows if short < medium < long]
+
+
+def rank_results(results, metric='sharpe', ascending=False):
+    """Sort a results table by a summary metric and number the rows from 1"""
+    ranked = results.sort_values(metric, ascending=ascending, kind='stable', na_position='last')
+    ranked = ranked.reset_index(drop=True)
+    ranked.insert(0, 'rank', np.arange(1, len(ranked) + 1))
+    return ranked
+
+
+def sweep(close, grid=None, workers=None, metric='sharpe', periods_per_year=252, output=None, rules=None,
+          **options):
+    """
+    Backtest every combination of the grid on one price series with a process pool.
+    The indicator series are computed once and shared with the workers through
+    shared memory; each task evaluates one window triple with all its threshold
+    combinations vectorized. Returns the results ranked by metric and writes them
+    to output (CSV) when given. rules is a compile_rules() set (default
+    DEFAULT_RULES); options are passed to backtest (cost_bps, ...).
+    """
+    grid = {**DEFAULT_GRID, **(grid or {})}
+    options = {'periods_per_year': periods_per_year, **options}
+    start_time = time.perf_counter()
+    matrix, layout = _indicator_rows(close, grid, periods_per_year)
+    triples = _window_triples(grid)
+    variants = len(grid['medium_threshold']) * len(grid['long_threshold']) * len(grid['risk_cutoffs'])
+    logger.info(f"Sweeping {len(triples) * variants:,} combinations ({len(triples)} window triples)")
+
+    workers = workers or os.cpu_count() or 1
+    frames = []
+    if workers == 1:
+        frames = [evaluate_windows(*triple, grid, options, matrix, layout, rules) for triple in triples]
+    else:
+        block = shared_memory.SharedMemory(create=True, size=matrix.nbytes)
+        try:
+            shared = np.ndarray(matrix.shape, dtype='float64', buffer=block.buf)
+            shared[:] = matrix
+            with ProcessPoolExecutor(max_workers=workers, initializer=_attach,
+                                     initargs=(block.name, matrix.shape, layout)) as executor:
+                futures = {executor.submit(evaluate_windows, *triple, grid, options, rules=rules): triple
+                           for triple in triples}
+                for future in as_completed(futures):
+                    try:
+                        frames.append(future.result())
+                    except Exception as e:
+                        logger.error(f"Windows {futures[future]} failed: {str(e)}")
+            del shared
+        finally:
+            block.close()
+            block.unlink()
+
+    if not frames:
+        return None
+    results = rank_results(pd.concat(frames, ignore_index=True), metric)
+    logger.info(f"Swept {len(results):,} combinations in {time.perf_counter() - start_time:.2f}s "
+                f"with {workers} workers")
+    if output:
+        results.to_csv(output, index=False)
+        logger.info(f"Ranked results written to {output}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest a grid of MA windows and signal thresholds")
+    parser.add_argument('output', help="CSV file for the ranked results")
+    parser.add_argument('--symbol', default="^NSEI")
+    parser.add_argument('--period', default="10y", help="History to download (default: 10y)")
+    parser.add_argument('--store', default=None, help="Read history from a HistoryStore root instead")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--metric', default='sharpe', help="Summary metric to rank by")
+    parser.add_argument('--cost-bps', type=float, default=0.0)
+    parser.add_argument('--slippage-bps', type=float, default=0.0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    from main_web import NiftyWebAnalyzer
+    analyzer = NiftyWebAnalyzer(symbol=args.symbol)
+    if args.store:
+        from history_store import HistoryStore
+        loaded = analyzer.load_history(HistoryStore(args.store))
+    else:
+        loaded = analyzer.fetch_data(period=args.period)
+    if not loaded:
+        return False
+
+    results = sweep(analyzer.data['Close'].to_numpy(), workers=args.workers, metric=args.metric,
+                    output=args.output, cost_bps=args.cost_bps, slippage_bps=args.slippage_bps)
+    if results is None:
+        return False
+    print(results.head(10).to_string(index=False))
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
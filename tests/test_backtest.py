@@ -0,0 +1,88 @@
+import logging
+import numpy as np
+import pytest
+from benchmark import synthetic_ohlcv
+from data_providers import MarketDataProvider
+from main_web import NiftyWebAnalyzer
+from signal_series import signal_series
+from backtest import backtest, target_positions, _trade_stats, LONG_ONLY, LONG_SHORT
+
+logging.disable(logging.INFO)
+
+
+def loop_backtest(close, recommendation, position_map, cost_bps):
+    """Per-bar reference: positions, costs and equity curve, one bar at a time"""
+    held = target = 0.0
+    equity = 1.0
+    positions, costs, curve = (np.empty(len(close)) for _ in range(3))
+    for t in range(len(close)):
+        cost = abs(target - held) * cost_bps / 10_000
+        held = target
+        bar_return = close[t] / close[t - 1] - 1 if t else 0.0
+        equity *= 1 + held * bar_return - cost
+        positions[t], costs[t], curve[t] = held, cost, equity
+        mapped = position_map[int(recommendation[t])]
+        if mapped == mapped:
+            target = mapped
+    return positions, costs, curve
+
+
+@pytest.fixture(scope='module')
+def signals():
+    analyzer = NiftyWebAnalyzer(provider=MarketDataProvider())
+    analyzer.data = synthetic_ohlcv(2520)
+    analyzer.calculate_moving_averages()
+    return analyzer.data['Close'].to_numpy(), signal_series(analyzer.data)['recommendation']
+
+
+@pytest.mark.parametrize('position_map', [LONG_ONLY, LONG_SHORT], ids=['long_only', 'long_short'])
+@pytest.mark.parametrize('cost_bps', [0.0, 5.0])
+def test_vectorized_backtest_matches_loop(signals, position_map, cost_bps):
+    close, recommendation = signals
+    result = backtest(close, recommendation, position_map=position_map, cost_bps=cost_bps)
+    positions, costs, equity = loop_backtest(close, recommendation, position_map, cost_bps)
+    np.testing.assert_array_equal(result['position'], positions)
+    np.testing.assert_allclose(result['costs'], costs, rtol=1e-12)
+    np.testing.assert_allclose(result['equity'], equity, rtol=1e-12)
+    assert result['summary']['trades'] > 0
+
+
+def test_target_positions_carry_forward_through_hold():
+    codes = np.array([0, 0, 2, 0, 1, 0, 0, -1, 0, -3, 0, 3])
+    np.testing.assert_array_equal(target_positions(codes),
+                                  [0, 0, 1, 1, 0.5, 0.5, 0.5, 0, 0, 0, 0, 1])
+    np.testing.assert_array_equal(target_positions(codes, LONG_SHORT),
+                                  [0, 0, 1, 1, 0.5, 0.5, 0.5, -0.5, -0.5, -1, -1, 1])
+
+    # Variant rows are carried forward independently
+    variants = np.stack([codes, codes[::-1]])
+    np.testing.assert_array_equal(target_positions(variants),
+                                  [target_positions(codes), target_positions(codes[::-1])])
+
+
+def test_trade_stats_count_runs_of_one_position():
+    held = np.array([0, 1, 1, 0, 0.5, 0.5, -1, -1, 0])
+    net = np.array([0, 0.02, -0.01, 0, -0.01, 0.005, 0.01, 0.01, 0])
+    # Trades: 1 (+2% then -1%: a win), 0.5 (-1% then +0.5%: a loss), -1 (a win)
+    trades, wins = _trade_stats(held, net)
+    assert (trades, wins) == (3, 2)
+
+    stacked = np.stack([held, np.zeros_like(held), -held])
+    trades, wins = _trade_stats(stacked, np.stack([net, net, -net]))
+    np.testing.assert_array_equal(trades, [3, 0, 3])
+    np.testing.assert_array_equal(wins, [2, 0, 1])
+
+
+def test_position_changes_pay_cost_and_slippage():
+    close = np.full(8, 100.0)  # flat prices: only costs move the equity
+    codes = np.array([2, 0, 1, 0, -3, 3, 0, 0])
+    result = backtest(close, codes, position_map=LONG_SHORT, cost_bps=3, slippage_bps=2)
+    np.testing.assert_array_equal(result['position'], [0, 1, 1, 0.5, 0.5, -1, 1, 1])
+    np.testing.assert_array_equal(result['turnover'], [0, 1, 0, 0.5, 0, 1.5, 2, 0])
+    np.testing.assert_allclose(result['costs'], result['turnover'] * 5 / 10_000)
+    np.testing.assert_allclose(result['equity'], np.cumprod(1 - result['costs']))
+    assert result['summary']['costs'] == pytest.approx(5 * 5 / 10_000)
+    assert result['summary']['trades'] == 4
+
+    free = backtest(close, codes, position_map=LONG_SHORT)
+    assert free['summary']['total_return'] == 0.0 and free['summary']['costs'] == 0.0
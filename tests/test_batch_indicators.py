@@ -0,0 +1,97 @@
+import logging
+import numpy as np
+import pandas as pd
+import pytest
+from benchmark import synthetic_ohlcv
+from data_providers import MarketDataProvider
+from main_web import NiftyWebAnalyzer
+from batch_indicators import screen, stack_frames, _ema_last_two, TAIL_BARS
+
+logging.disable(logging.WARNING)
+
+
+@pytest.fixture(scope='module')
+def frames():
+    frames = {}
+    for i in range(40):
+        frame = synthetic_ohlcv(900, seed=i).iloc[i % 8 * 80:]
+        close = frame.columns.get_loc('Close')
+        if i % 3 == 0:
+            # A missed session inside the history
+            frame = frame.drop(frame.index[-60])
+        if i % 5 == 0:
+            frame = frame.copy()
+            frame.iloc[-120, close] = np.nan
+        if i % 7 == 0:
+            # Flat closes: ties with the moving averages and the EMA
+            frame = frame.copy()
+            frame.iloc[-12:-2, close] = frame.iloc[-13, close]
+        frames[f"SYM{i:02d}.NS"] = frame
+    frames['NEW.NS'] = synthetic_ohlcv(30, seed=99)
+    frames['ONE.NS'] = synthetic_ohlcv(1, seed=98)
+    return frames
+
+
+@pytest.fixture(scope='module')
+def expected(frames):
+    analyzer = NiftyWebAnalyzer(provider=MarketDataProvider())
+    results = {}
+    for symbol, frame in frames.items():
+        if len(frame) < 2:
+            continue
+        analyzer.data = frame.copy()
+        analyzer.calculate_moving_averages()
+        assert analyzer.generate_signals()
+        results[symbol] = (analyzer.results, analyzer.get_recommendation())
+    return results
+
+
+def test_details_match_per_symbol_runs(frames, expected):
+    results = screen(frames, details=True)
+    assert results == {symbol: signals for symbol, (signals, _) in expected.items()}
+
+
+def test_table_matches_per_symbol_runs(frames, expected):
+    table = screen(frames)
+    assert list(table.index) == list(expected)
+    for symbol, (signals, recommendation) in expected.items():
+        row = table.loc[symbol]
+        for prefix, timeframe in (('short', 'short_term'), ('medium', 'medium_term'), ('long', 'long_term')):
+            assert row[f'{prefix}_signal'] == signals[timeframe]['signal'], (symbol, timeframe)
+            assert row[f'{prefix}_strength'] == signals[timeframe]['strength'], (symbol, timeframe)
+        assert row['overall_trend'] == signals['overall_trend']
+        assert row['recommendation'] == recommendation
+        assert round(row['close'], 2) == signals['close_price']
+        assert row['date'] == frames[symbol].index[-1]
+
+
+def test_stack_frames_right_aligns_the_tail(frames):
+    symbols, matrices, last_timestamps = stack_frames(frames, ('Close',), length=TAIL_BARS)
+    assert matrices['Close'].shape == (TAIL_BARS, len(frames))
+    j = symbols.index('NEW.NS')
+    assert np.isnan(matrices['Close'][:-30, j]).all()
+    np.testing.assert_array_equal(matrices['Close'][-30:, j], frames['NEW.NS']['Close'].to_numpy())
+    assert last_timestamps[j] == frames['NEW.NS'].index[-1]
+
+
+def test_ema_replay_is_bit_identical_to_pandas():
+    rng = np.random.default_rng(5)
+    values = np.cumsum(rng.normal(0, 1, (TAIL_BARS, 60)), axis=0) + 1000
+    values[np.arange(TAIL_BARS)[:, None] < rng.integers(0, TAIL_BARS, 60)] = np.nan  # ragged starts
+    values[:150, 0] = np.nan
+    values[200:210, 1] = values[199, 1]  # ties
+    values[250, 2] = np.nan  # a gap after the start
+    values[:, 3] = np.nan
+    expected = pd.DataFrame(values).ewm(span=5, adjust=False).mean().to_numpy()
+    latest, previous = _ema_last_two(values, 5)
+    np.testing.assert_array_equal(latest, expected[-1])
+    np.testing.assert_array_equal(previous, expected[-2])
+
+
+def test_long_history_ema_matches_full_replay():
+    # Replaying only the last TAIL_BARS bars lands on the full-history EMA
+    data = synthetic_ohlcv(5000, seed=3)
+    full = data['Close'].ewm(span=5, adjust=False).mean().to_numpy()
+    _, matrices, _ = stack_frames({'X': data}, ('Close',), length=TAIL_BARS)
+    latest, previous = _ema_last_two(matrices['Close'], 5)
+    assert (latest[0], previous[0]) == (full[-1], full[-2])
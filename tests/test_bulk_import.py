@@ -0,0 +1,65 @@
+import logging
+import numpy as np
+import pytest
+from benchmark import synthetic_ohlcv
+from bulk_import import import_file, FIELDS
+from history_store import HistoryStore
+
+logging.disable(logging.INFO)
+
+CHUNK_ROWS = 128
+
+
+@pytest.fixture
+def data():
+    return synthetic_ohlcv(1000, seed=5)
+
+
+def write_csv(data, path):
+    # Vendor style: naive local timestamps, lower-case headers
+    frame = data.rename(columns=str.lower)
+    frame.index = frame.index.tz_localize(None)
+    frame.to_csv(path, index_label='date')
+    return str(path)
+
+
+def write_npy(data, path):
+    array = np.empty(len(data), dtype=[('timestamp', 'int64')] + [(f.lower(), 'float64') for f in FIELDS])
+    array['timestamp'] = data.index.values.astype('datetime64[ns]').view('int64')
+    for field in FIELDS:
+        array[field.lower()] = data[field].to_numpy(dtype='float64')
+    np.save(path, array)
+    return str(path)
+
+
+def stored(store_root):
+    return HistoryStore(store_root).to_frame('TEST')
+
+
+def assert_imported(result, store_root, data):
+    assert result['rows_read'] == result['rows_stored'] == len(data)
+    frame = stored(store_root)
+    assert frame.index.equals(data.index)
+    for field in FIELDS:
+        # read_csv's fast float parser can be one ulp off the written value
+        np.testing.assert_allclose(frame[field].to_numpy(dtype='float64'), data[field].to_numpy(dtype='float64'),
+                                   rtol=1e-15, err_msg=field)
+
+
+@pytest.mark.parametrize('writer, name', [(write_csv, 'TEST.csv'), (write_npy, 'TEST.npy')])
+@pytest.mark.parametrize('newest_first', [False, True])
+def test_import_stores_bars_oldest_first(tmp_path, data, writer, name, newest_first):
+    path = writer(data.iloc[::-1] if newest_first else data, tmp_path / name)
+    store_root = str(tmp_path / 'store')
+    result = import_file(path, store_root, 'TEST', chunk_rows=CHUNK_ROWS)
+    assert_imported(result, store_root, data)
+
+
+@pytest.mark.parametrize('writer, name', [(write_csv, 'TEST.csv'), (write_npy, 'TEST.npy')])
+@pytest.mark.parametrize('validate', [True, False])
+def test_interleaved_file_is_refused(tmp_path, data, writer, name, validate):
+    # Oldest first overall, but one block of bars is out of place
+    order = np.r_[0:300, 600:900, 300:600, 900:1000]
+    path = writer(data.iloc[order], tmp_path / name)
+    with pytest.raises(ValueError, match="not in time order"):
+        import_file(path, str(tmp_path / 'store'), 'TEST', chunk_rows=CHUNK_ROWS, validate=validate)
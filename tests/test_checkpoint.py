@@ -0,0 +1,93 @@
+import logging
+import numpy as np
+import pandas as pd
+import pytest
+from benchmark import synthetic_ohlcv
+from data_providers import ReplayProvider, save_fixture
+from main_web import NiftyWebAnalyzer
+from indicator_engine import IncrementalIndicators
+
+logging.disable(logging.INFO)
+
+FIRST_RUN_BARS = 1000
+NEW_BARS = 12
+
+
+@pytest.fixture
+def history():
+    return synthetic_ohlcv(FIRST_RUN_BARS + NEW_BARS, seed=7)
+
+
+def run(fixture_dir, checkpoint=None):
+    """One main()-style run: fetch, indicators (resuming when possible), signals"""
+    analyzer = NiftyWebAnalyzer(provider=ReplayProvider(fixture_dir))
+    assert analyzer.fetch_data()
+    resumed = checkpoint is not None and analyzer.resume_from_checkpoint(checkpoint)
+    if not resumed:
+        assert analyzer.calculate_moving_averages(method="incremental" if checkpoint else "pandas")
+    if checkpoint is not None:
+        assert analyzer.save_checkpoint(checkpoint)
+    assert analyzer.generate_signals()
+    return analyzer, resumed
+
+
+def first_run(tmp_path, history):
+    fixtures = tmp_path / 'fixtures'
+    checkpoint = str(tmp_path / 'indicator_state.npz')
+    save_fixture(history.iloc[:FIRST_RUN_BARS], fixtures, '^NSEI')
+    _, resumed = run(fixtures, checkpoint)
+    assert not resumed
+    return fixtures, checkpoint
+
+
+def test_resume_matches_fresh_run(tmp_path, history):
+    fixtures, checkpoint = first_run(tmp_path, history)
+    save_fixture(history, fixtures, '^NSEI')
+
+    analyzer, resumed = run(fixtures, checkpoint)
+    fresh, _ = run(fixtures)
+    assert resumed
+    assert analyzer.results == fresh.results
+
+    pd.testing.assert_frame_equal(analyzer.signal_history(), fresh.signal_history())
+    for name in IncrementalIndicators.COLUMNS:
+        np.testing.assert_allclose(analyzer.data[name].to_numpy(dtype='float64'),
+                                   fresh.data[name].to_numpy(dtype='float64'), rtol=1e-9, err_msg=name)
+
+    frame, summary = analyzer.backtest()
+    fresh_frame, fresh_summary = fresh.backtest()
+    assert summary['trades'] == fresh_summary['trades']
+    assert summary['total_return'] == pytest.approx(fresh_summary['total_return'])
+
+
+def test_backtest_after_resume_recomputes_history(tmp_path, history):
+    fixtures, checkpoint = first_run(tmp_path, history)
+    save_fixture(history, fixtures, '^NSEI')
+
+    analyzer, resumed = run(fixtures, checkpoint)
+    fresh, _ = run(fixtures)
+    assert resumed
+    assert analyzer.data['200DMA'].isna().sum() > fresh.data['200DMA'].isna().sum()
+    assert analyzer.backtest()[1]['trades'] == fresh.backtest()[1]['trades']
+    assert analyzer.data['200DMA'].isna().sum() == fresh.data['200DMA'].isna().sum()
+
+
+def test_revised_history_falls_back_to_full_recompute(tmp_path, history):
+    fixtures, checkpoint = first_run(tmp_path, history)
+    revised = history.copy()
+    revised.iloc[FIRST_RUN_BARS - 50, revised.columns.get_loc('Close')] *= 1.01
+    save_fixture(revised, fixtures, '^NSEI')
+
+    analyzer, resumed = run(fixtures, checkpoint)
+    fresh, _ = run(fixtures)
+    assert not resumed
+    assert analyzer.results == fresh.results
+    pd.testing.assert_frame_equal(analyzer.signal_history(), fresh.signal_history())
+
+
+def test_checkpoint_for_other_symbol_is_ignored(tmp_path, history):
+    fixtures, checkpoint = first_run(tmp_path, history)
+    save_fixture(history, fixtures, 'RELIANCE.NS')
+    analyzer = NiftyWebAnalyzer(provider=ReplayProvider(fixtures), symbol='RELIANCE.NS')
+    assert analyzer.fetch_data()
+    assert not analyzer.resume_from_checkpoint(checkpoint)
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+from benchmark import synthetic_ohlcv
+from compact import to_compact, compact_indicators, compare_compact_accuracy, COMPACT_TOLERANCES
+
+
+def assert_within_tolerance(errors):
+    over = {name: error for name, error in errors.items() if not error <= COMPACT_TOLERANCES[name]}
+    assert not over, f"compact mode over tolerance: {over}"
+
+
+@pytest.mark.parametrize('n_bars', [150, 600, 20_000])
+def test_accuracy_within_tolerance(n_bars):
+    assert_within_tolerance(compare_compact_accuracy(synthetic_ohlcv(n_bars)))
+
+
+def test_nan_close_stays_within_tolerance():
+    data = synthetic_ohlcv(600)
+    data.iloc[100, data.columns.get_loc('Close')] = np.nan
+    assert_within_tolerance(compare_compact_accuracy(data))
+
+
+def test_nan_bar_only_blanks_windows_that_contain_it():
+    data = synthetic_ohlcv(600)
+    data.iloc[100, data.columns.get_loc('Close')] = np.nan
+    compact = to_compact(data)
+    rows = compact_indicators(compact['Close'].to_numpy(), compact['Volume'].to_numpy())
+
+    expected = data['Close'].rolling(window=200).mean().to_numpy()
+    assert np.isnan(rows['200DMA'][299])
+    assert rows['200DMA'][300] == pytest.approx(expected[300], rel=COMPACT_TOLERANCES['200DMA'])
+    assert rows['200DMA'][-1] == pytest.approx(expected[-1], rel=COMPACT_TOLERANCES['200DMA'])
+    assert not np.isnan(rows['5DMA'][105])
+
+
+def test_nan_mismatch_is_reported():
+    data = synthetic_ohlcv(300)
+    data['Volume'] = data['Volume'].astype('float64')
+    data.iloc[50, data.columns.get_loc('Volume')] = np.nan
+    # to_compact fills missing volume with 0, so the compact Volume_SMA has values where pandas has NaN
+    assert compare_compact_accuracy(data)['Volume_SMA'] == float('inf')
@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+import pytest
+from benchmark import synthetic_ohlcv
+from data_validation import validate_ohlcv, REPAIR, DROP
+
+PRICES = ['Open', 'High', 'Low', 'Close']
+
+
+@pytest.fixture
+def data():
+    return synthetic_ohlcv(300, seed=11)
+
+
+def test_clean_frame_is_returned_without_a_copy(data):
+    clean, report = validate_ohlcv(data)
+    assert clean is data
+    assert report['issues'] == {} and report['rows_out'] == len(data)
+
+
+def test_split_is_back_adjusted(data):
+    split = data.copy()
+    split.iloc[200:, [split.columns.get_loc(c) for c in PRICES]] /= 2
+    split.iloc[200:, split.columns.get_loc('Volume')] *= 2
+
+    flagged, report = validate_ohlcv(split)
+    assert flagged is split
+    assert report['issues'] == {'price_jump': 1} and report['actions'] == {'price_jump': 'flag'}
+
+    repaired, report = validate_ohlcv(split, policy={'price_jump': REPAIR})
+    # Every bar before the split is scaled into post-split units
+    np.testing.assert_allclose(repaired[PRICES].to_numpy(), data[PRICES].to_numpy() / 2, rtol=1e-12)
+    np.testing.assert_array_equal(repaired['Volume'].to_numpy(), data['Volume'].to_numpy() * 2)
+    assert repaired['Volume'].dtype == data['Volume'].dtype
+    pd.testing.assert_frame_equal(split.iloc[:200], data.iloc[:200])  # the input is not modified
+
+
+def test_jump_that_is_not_a_split_ratio_is_left_alone(data):
+    jumped = data.copy()
+    jumped.iloc[200:, [jumped.columns.get_loc(c) for c in PRICES]] *= 1.4
+    repaired, report = validate_ohlcv(jumped, policy={'price_jump': REPAIR})
+    assert report['issues'] == {'price_jump': 1}
+    pd.testing.assert_frame_equal(repaired, jumped)
+
+
+def test_inverted_high_low_is_swapped(data):
+    broken = data.copy()
+    rows = [10, 150]
+    broken.iloc[rows, broken.columns.get_loc('High')] = data['Low'].iloc[rows].to_numpy()
+    broken.iloc[rows, broken.columns.get_loc('Low')] = data['High'].iloc[rows].to_numpy()
+    repaired, report = validate_ohlcv(broken)
+    assert report['issues'] == {'high_low_inverted': 2}
+    pd.testing.assert_frame_equal(repaired, data)
+
+
+def test_out_of_range_high_low_are_widened(data):
+    broken = data.copy()
+    high, low = broken.columns.get_loc('High'), broken.columns.get_loc('Low')
+    broken.iloc[20, high] = min(data['Open'].iloc[20], data['Close'].iloc[20])
+    broken.iloc[40, low] = max(data['Open'].iloc[40], data['Close'].iloc[40])
+    repaired, report = validate_ohlcv(broken)
+    assert report['issues'] == {'ohlc_out_of_range': 2}
+
+    body = data[['Open', 'Close']]
+    assert repaired['High'].iloc[20] == body.iloc[20].max()
+    assert repaired['Low'].iloc[40] == body.iloc[40].min()
+    untouched = np.ones(len(data), dtype=bool)
+    untouched[[20, 40]] = False
+    pd.testing.assert_frame_equal(repaired[untouched], data[untouched])
+
+
+def test_nan_close_is_dropped_or_forward_filled(data):
+    broken = data.copy()
+    broken.iloc[50, broken.columns.get_loc('Close')] = np.nan
+
+    dropped, report = validate_ohlcv(broken)
+    assert report['issues']['nan_close'] == 1 and report['rows_out'] == len(data) - 1
+    assert data.index[50] not in dropped.index
+
+    filled, report = validate_ohlcv(broken, policy={'nan_close': REPAIR})
+    assert report['rows_out'] == len(data)
+    assert filled['Close'].iloc[50] == data['Close'].iloc[49]
+    assert not filled['Close'].isna().any()
+
+
+@pytest.mark.parametrize('action', [DROP, REPAIR])
+def test_duplicate_timestamps_keep_the_last_bar(data, action):
+    duplicate = data.iloc[[100]].copy()
+    duplicate['Close'] += 1.0
+    broken = pd.concat([data.iloc[:101], duplicate, data.iloc[101:]])
+    cleaned, report = validate_ohlcv(broken, policy={'duplicate_timestamp': action})
+    assert report['issues'] == {'duplicate_timestamp': 1}
+    assert cleaned.index.is_unique and len(cleaned) == len(data)
+    assert cleaned['Close'].iloc[100] == duplicate['Close'].iloc[0]
+
+
+def test_unsorted_index_is_sorted(data):
+    cleaned, report = validate_ohlcv(data.iloc[::-1])
+    assert report['actions'] == {'unsorted_index': 'sorted'}
+    pd.testing.assert_frame_equal(cleaned, data, check_freq=False)
@@ -0,0 +1,161 @@
+import time
+import random
+import logging
+import threading
+import pytest
+from benchmark import synthetic_ohlcv
+from data_providers import MarketDataProvider, DataProviderError
+from fetch_scheduler import FetchScheduler, RateLimiter, backoff_delay
+
+logging.disable(logging.WARNING)
+
+
+class FakeClock:
+    """clock/sleep pair for RateLimiter and FetchScheduler: sleeping advances the clock and is recorded"""
+
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FlakyProvider(MarketDataProvider):
+    """Fails the first `failures` requests, then serves a synthetic frame"""
+
+    name = "flaky"
+
+    def __init__(self, failures=0, gate=None):
+        self.failures = failures
+        self.gate = gate
+        self.calls = 0
+        self.entered = threading.Event()
+
+    def history(self, symbol, period="1y", start=None, interval="1d"):
+        self.calls += 1
+        self.entered.set()
+        if self.gate is not None:
+            assert self.gate.wait(5)
+        if self.calls <= self.failures:
+            raise DataProviderError(f"Injected failure {self.calls}")
+        return synthetic_ohlcv(50)
+
+
+def test_rate_limiter_paces_after_the_burst():
+    clock = FakeClock()
+    limiter = RateLimiter(rate=10, burst=2, clock=clock, sleep=clock.sleep)
+    for _ in range(5):
+        limiter.acquire()
+    assert clock.sleeps == pytest.approx([0.1, 0.1, 0.1])
+
+    # An idle bucket refills only up to the burst
+    clock.now += 60
+    clock.sleeps.clear()
+    for _ in range(3):
+        limiter.acquire()
+    assert clock.sleeps == pytest.approx([0.1])
+
+
+@pytest.mark.parametrize('failures', [0, 1, 2])
+def test_retries_back_off_with_seeded_jitter(failures):
+    clock = FakeClock()
+    provider = FlakyProvider(failures)
+    scheduler = FetchScheduler(provider, max_retries=3, base_delay=1.0, seed=3, sleep=clock.sleep)
+    assert len(scheduler.history('^NSEI')) == 50
+
+    rng = random.Random(3)
+    assert clock.sleeps == [backoff_delay(attempt, 1.0, rng=rng) for attempt in range(failures)]
+    assert all(delay <= 2 ** attempt for attempt, delay in enumerate(clock.sleeps))
+    assert provider.calls == failures + 1
+    assert scheduler.stats == {'requests': failures + 1, 'coalesced': 0, 'retries': failures, 'failures': 0}
+
+
+def test_exhausted_retries_raise_the_last_error():
+    clock = FakeClock()
+    scheduler = FetchScheduler(FlakyProvider(failures=10), max_retries=3, seed=3, sleep=clock.sleep)
+    with pytest.raises(DataProviderError, match="failure 3"):
+        scheduler.history('^NSEI')
+    assert len(clock.sleeps) == 2
+    assert scheduler.stats == {'requests': 3, 'coalesced': 0, 'retries': 2, 'failures': 1}
+
+
+def test_backoff_is_capped_at_max_delay():
+    rng = random.Random(0)
+    delays = [backoff_delay(attempt, 1.0, max_delay=4.0, rng=rng) for attempt in range(50)]
+    assert max(delays) <= 4.0 and max(delays[2:]) > 2.0
+
+
+def test_rate_limit_applies_to_every_attempt():
+    clock = FakeClock()
+    scheduler = FetchScheduler(FlakyProvider(failures=1), max_retries=3, base_delay=0.0, rate_limit=2,
+                               sleep=clock.sleep, clock=clock)
+    for period in ('1y', '2y', '5y'):
+        scheduler.history('^NSEI', period=period)
+    # Four requests (one retried): the first uses the burst token, the rest wait 0.5s each
+    assert [s for s in clock.sleeps if s] == pytest.approx([0.5, 0.5, 0.5])
+    assert scheduler.stats['requests'] == 4
+
+
+def run_concurrently(scheduler, provider, gate, calls):
+    """Start the first call, wait until it is inside the provider, then start the rest and let it finish"""
+    results = [None] * len(calls)
+    errors = [None] * len(calls)
+
+    def call(i):
+        try:
+            results[i] = scheduler.history(*calls[i])
+        except Exception as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(len(calls))]
+    threads[0].start()
+    assert provider.entered.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while scheduler.stats['coalesced'] < len(calls) - 1 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    gate.set()
+    for thread in threads:
+        thread.join(5)
+    return results, errors
+
+
+def test_duplicate_requests_are_coalesced():
+    gate = threading.Event()
+    provider = FlakyProvider(gate=gate)
+    scheduler = FetchScheduler(provider)
+    results, errors = run_concurrently(scheduler, provider, gate, [('^NSEI', '1y')] * 4)
+
+    assert errors == [None] * 4
+    assert provider.calls == 1
+    assert scheduler.stats['requests'] == 1 and scheduler.stats['coalesced'] == 3
+    assert len({id(frame) for frame in results}) == 4  # every caller gets its own frame
+    results[1].iloc[0, 0] = -1.0
+    assert results[0].iloc[0, 0] != -1.0 and results[2].iloc[0, 0] != -1.0
+
+
+def test_coalesced_waiters_see_the_owner_failure():
+    gate = threading.Event()
+    provider = FlakyProvider(failures=1, gate=gate)
+    scheduler = FetchScheduler(provider, max_retries=1)
+    _, errors = run_concurrently(scheduler, provider, gate, [('^NSEI', '1y')] * 3)
+    assert all(isinstance(e, DataProviderError) for e in errors)
+    assert provider.calls == 1
+
+    # The failed request is no longer in flight: the next call fetches again
+    assert len(scheduler.history('^NSEI', '1y')) == 50
+
+
+def test_different_requests_are_not_coalesced():
+    provider = FlakyProvider()
+    scheduler = FetchScheduler(provider)
+    scheduler.history('^NSEI', '1y')
+    scheduler.history('^NSEI', '1y', interval='1h')
+    scheduler.history('RELIANCE.NS', '1y')
+    assert provider.calls == 3 and scheduler.stats['coalesced'] == 0
@@ -0,0 +1,63 @@
+import logging
+import numpy as np
+import pytest
+from benchmark import synthetic_ohlcv
+from data_providers import MarketDataProvider
+from history_store import HistoryStore
+from main_web import NiftyWebAnalyzer
+
+logging.disable(logging.INFO)
+
+FIELDS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+def assert_same_bars(frame, expected):
+    assert frame.index.equals(expected.index)
+    assert list(frame.columns) == FIELDS
+    for field in FIELDS:
+        np.testing.assert_array_equal(frame[field].to_numpy(), expected[field].to_numpy(), err_msg=field)
+
+
+def mapped_file(values):
+    """File behind the np.memmap an array is a view of, or None if it owns its memory"""
+    while values is not None and not isinstance(values, np.memmap):
+        values = values.base
+    return getattr(values, 'filename', None)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = HistoryStore(str(tmp_path / 'history'))
+    store.write('^NSEI', synthetic_ohlcv(1000))
+    return store
+
+
+@pytest.mark.parametrize('tail', [None, 300])
+def test_frame_columns_are_views_of_the_store(store, tail):
+    frame = store.to_frame('^NSEI', tail=tail)
+    expected = synthetic_ohlcv(1000).iloc[-(tail or 1000):]
+    assert_same_bars(frame, expected)
+    for field in FIELDS:
+        assert mapped_file(frame[field].to_numpy()) == store._field_path('^NSEI', field), field
+
+
+def test_analyzer_reads_indicators_from_the_store(store):
+    analyzer = NiftyWebAnalyzer(provider=MarketDataProvider())
+    assert analyzer.load_history(store)
+    assert analyzer.calculate_moving_averages()
+    assert analyzer.generate_signals()
+    for field in FIELDS:
+        assert mapped_file(analyzer.data[field].to_numpy()) == store._field_path('^NSEI', field), field
+
+    fresh = NiftyWebAnalyzer(provider=MarketDataProvider())
+    fresh.data = synthetic_ohlcv(1000)
+    fresh.calculate_moving_averages()
+    fresh.generate_signals()
+    assert analyzer.results == fresh.results
+
+
+def test_append_adds_only_newer_bars(store):
+    data = synthetic_ohlcv(1010)
+    store.write('^NSEI', data.iloc[:1000])
+    assert store.append('^NSEI', data.iloc[990:]) == 10
+    assert_same_bars(store.to_frame('^NSEI'), data)
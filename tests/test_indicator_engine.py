@@ -0,0 +1,93 @@
+import logging
+import numpy as np
+import pandas as pd
+import pytest
+from benchmark import synthetic_ohlcv
+from data_providers import MarketDataProvider
+from main_web import NiftyWebAnalyzer
+from indicator_engine import IncrementalIndicators, tail_indicators
+
+logging.disable(logging.INFO)
+
+
+def pandas_indicators(data):
+    close = data['Close']
+    frame = data.assign(**{
+        '5DMA': close.rolling(window=5).mean(),
+        '50DMA': close.rolling(window=50).mean(),
+        '200DMA': close.rolling(window=200).mean(),
+        '5DEMA': close.ewm(span=5, adjust=False).mean(),
+        'Volume_SMA': data['Volume'].rolling(window=20).mean(),
+        'Price_Change': close.pct_change(),
+    })
+    frame['Volatility'] = frame['Price_Change'].rolling(window=20).std() * np.sqrt(252)
+    return frame
+
+
+def test_incremental_updates_match_pandas():
+    data = synthetic_ohlcv(1500)
+    engine = IncrementalIndicators()
+    rows = [engine.update(close, volume) for close, volume in
+            zip(data['Close'].to_numpy(dtype='float64'), data['Volume'].to_numpy(dtype='float64'))]
+    expected = pandas_indicators(data)
+    for name in IncrementalIndicators.COLUMNS:
+        got = np.array([row[name] for row in rows])
+        reference = expected[name].to_numpy()
+        assert np.array_equal(np.isnan(got), np.isnan(reference)), name
+        mask = ~np.isnan(reference)
+        np.testing.assert_allclose(got[mask], reference[mask], rtol=1e-9, atol=1e-12, err_msg=name)
+
+
+def test_resumed_engine_matches_fresh_run():
+    data = synthetic_ohlcv(800)
+    close = data['Close'].to_numpy(dtype='float64')
+    volume = data['Volume'].to_numpy(dtype='float64')
+    fresh = IncrementalIndicators()
+    expected = [fresh.update(c, v) for c, v in zip(close, volume)][-1]
+
+    seeded = pandas_indicators(data.iloc[:600])
+    engine = IncrementalIndicators.from_arrays(close[:600], volume[:600], seeded['5DEMA'].iloc[-1])
+    got = [engine.update(c, v) for c, v in zip(close[600:], volume[600:])][-1]
+    for name in IncrementalIndicators.COLUMNS:
+        assert got[name] == pytest.approx(expected[name], rel=1e-9), name
+
+
+def test_analyzer_incremental_method_processes_appended_bars():
+    data = synthetic_ohlcv(520)
+    analyzer = NiftyWebAnalyzer(provider=MarketDataProvider())
+    analyzer.data = data.iloc[:500].copy()
+    assert analyzer.calculate_moving_averages(method="incremental")
+    engine = analyzer.engine
+    analyzer.data = pd.concat([analyzer.data, data.iloc[500:]])
+    assert analyzer.calculate_moving_averages(method="incremental")
+    assert analyzer.engine is engine and engine.count == 520
+
+    expected = pandas_indicators(data)
+    for name in IncrementalIndicators.COLUMNS:
+        np.testing.assert_allclose(analyzer.data[name].to_numpy(dtype='float64'), expected[name].to_numpy(),
+                                   rtol=1e-9, atol=1e-12, err_msg=name)
+
+
+@pytest.mark.parametrize('n_bars', [2, 3, 21, 60, 201, 202, 450])
+@pytest.mark.parametrize('oscillators', [False, True])
+def test_tail_path_matches_full_path(n_bars, oscillators):
+    data = synthetic_ohlcv(n_bars, seed=n_bars)
+    analyzer = NiftyWebAnalyzer(provider=MarketDataProvider())
+    analyzer.data = data.copy()
+    analyzer.calculate_moving_averages()
+    assert analyzer.generate_signals(oscillators=oscillators)
+    full = analyzer.results
+
+    analyzer = NiftyWebAnalyzer(provider=MarketDataProvider())
+    analyzer.data = data
+    assert analyzer.generate_signals(oscillators=oscillators, tail=True)
+    assert analyzer.results == full
+
+
+def test_tail_indicators_match_pandas():
+    data = synthetic_ohlcv(500)
+    latest, previous = tail_indicators(data['Close'].to_numpy(), data['Volume'].to_numpy())
+    expected = pandas_indicators(data)
+    for name in IncrementalIndicators.COLUMNS:
+        assert latest[name] == pytest.approx(expected[name].iloc[-1], rel=1e-12), name
+        assert previous[name] == pytest.approx(expected[name].iloc[-2], rel=1e-12), name
@@ -0,0 +1,32 @@
+import logging
+import pandas as pd
+import pytest
+from benchmark import synthetic_ohlcv
+from data_providers import MarketDataProvider
+from main_web import NiftyWebAnalyzer
+from indicator_registry import DEFAULT_REGISTRY, SIGNAL_INDICATORS
+
+logging.disable(logging.INFO)
+
+
+def test_resolve_adds_dependencies_in_order():
+    names = DEFAULT_REGISTRY.resolve(['Volatility'])
+    assert names.index('Price_Change') < names.index('Volatility')
+    with pytest.raises(KeyError):
+        DEFAULT_REGISTRY.resolve(['Unknown'])
+
+
+def test_signal_indicators_are_enough_for_every_signal_path():
+    data = synthetic_ohlcv(600)
+    full = NiftyWebAnalyzer(provider=MarketDataProvider())
+    full.data = data.copy()
+    assert full.calculate_moving_averages() and full.generate_signals()
+
+    subset = NiftyWebAnalyzer(provider=MarketDataProvider())
+    subset.data = data.copy()
+    assert subset.calculate_moving_averages(indicators=SIGNAL_INDICATORS) and subset.generate_signals()
+    assert 'Volume_SMA' not in subset.data.columns
+
+    assert subset.results == full.results
+    pd.testing.assert_frame_equal(subset.signal_history(), full.signal_history())
+    assert subset.backtest()[1] == full.backtest()[1]
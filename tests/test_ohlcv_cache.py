@@ -0,0 +1,102 @@
+import os
+import logging
+import pandas as pd
+import pytest
+from benchmark import synthetic_ohlcv
+from data_providers import ReplayProvider, save_fixture
+from main_web import NiftyWebAnalyzer
+from ohlcv_cache import OHLCVCache
+
+logging.disable(logging.INFO)
+
+
+@pytest.fixture
+def history():
+    return synthetic_ohlcv(1010, seed=3)
+
+
+class Source:
+    """fetch_history for OHLCVCache.fetch that serves a replay fixture and records the requests"""
+
+    def __init__(self, fixture_dir):
+        self.provider = ReplayProvider(fixture_dir)
+        self.calls = []
+
+    def __call__(self, period=None, start=None):
+        self.calls.append((period, start))
+        return self.provider.history('^NSEI', period=period, start=start)
+
+
+def test_merge_prefers_fresh_bars(history):
+    cached = history.iloc[:10]
+    fresh = history.iloc[8:13].copy()
+    fresh['Close'] += 1.0
+    merged = OHLCVCache.merge(cached, fresh.iloc[::-1])
+    pd.testing.assert_index_equal(merged.index, history.index[:13])
+    pd.testing.assert_frame_equal(merged.iloc[:8], cached.iloc[:8], check_freq=False)
+    pd.testing.assert_frame_equal(merged.iloc[8:], fresh, check_freq=False)
+
+    assert OHLCVCache.merge(cached, None) is cached
+    assert OHLCVCache.merge(cached, fresh.iloc[:0]) is cached
+    pd.testing.assert_frame_equal(OHLCVCache.merge(None, fresh.iloc[::-1]), fresh, check_freq=False)
+
+
+def test_top_up_requests_only_the_last_session_onwards(tmp_path, history):
+    fixtures = tmp_path / 'fixtures'
+    cache = OHLCVCache(str(tmp_path / 'cache'), 'replay')
+    save_fixture(history.iloc[:1000], fixtures, '^NSEI')
+    first = Source(fixtures)
+    stored = cache.fetch('^NSEI', first, period='2y')
+    assert first.calls == [('2y', None)]
+
+    save_fixture(history, fixtures, '^NSEI')
+    second = Source(fixtures)
+    data = cache.fetch('^NSEI', second, period='2y')
+    assert second.calls == [(None, history.index[999].normalize())]
+    pd.testing.assert_frame_equal(data, second.provider.history('^NSEI', period='2y'), check_freq=False)
+    # The cache keeps every bar it has seen; only the returned frame is trimmed to the period
+    pd.testing.assert_frame_equal(cache.load('^NSEI'), history.loc[stored.index[0]:],
+                                  check_freq=False, check_names=False)
+
+
+@pytest.mark.parametrize('period', ['3y', 'max'])
+def test_cache_short_of_the_period_is_refetched(tmp_path, history, period):
+    fixtures = tmp_path / 'fixtures'
+    cache = OHLCVCache(str(tmp_path / 'cache'), 'replay')
+    save_fixture(history, fixtures, '^NSEI')
+    cache.fetch('^NSEI', Source(fixtures), period='1y')
+
+    source = Source(fixtures)
+    data = cache.fetch('^NSEI', source, period=period)
+    assert source.calls == [(period, None)]
+    pd.testing.assert_frame_equal(data, source.provider.history('^NSEI', period=period), check_freq=False)
+
+
+def test_cached_period_is_trimmed_like_a_direct_fetch(tmp_path, history):
+    fixtures = tmp_path / 'fixtures'
+    save_fixture(history, fixtures, '^NSEI')
+    cache_dir = str(tmp_path / 'cache')
+
+    warm = NiftyWebAnalyzer(cache_dir=cache_dir, provider=ReplayProvider(fixtures), validate=False)
+    assert warm.fetch_data(period='max')
+    assert len(warm.data) == len(history)
+
+    cached = NiftyWebAnalyzer(cache_dir=cache_dir, provider=ReplayProvider(fixtures), validate=False)
+    direct = NiftyWebAnalyzer(provider=ReplayProvider(fixtures), validate=False)
+    assert cached.fetch_data(period='1y') and direct.fetch_data(period='1y')
+    assert len(cached.data) == len(direct.data) == 262
+    pd.testing.assert_frame_equal(cached.data, direct.data, check_freq=False)
+
+
+def test_providers_sharing_a_directory_keep_separate_files(tmp_path, history):
+    fixtures = tmp_path / 'fixtures'
+    save_fixture(history, fixtures, '^NSEI')
+    cache_dir = str(tmp_path / 'cache')
+    replay = OHLCVCache(cache_dir, 'replay')
+    yahoo = OHLCVCache(cache_dir, 'yahoo')
+    assert replay.path_for('^NSEI') != yahoo.path_for('^NSEI')
+
+    analyzer = NiftyWebAnalyzer(cache_dir=cache_dir, provider=ReplayProvider(fixtures), validate=False)
+    assert analyzer.fetch_data(period='1y')
+    assert os.listdir(cache_dir) == [os.path.basename(replay.path_for('^NSEI'))]
+    assert yahoo.load('^NSEI') is None
@@ -0,0 +1,154 @@
+import logging
+import numpy as np
+import pandas as pd
+import pytest
+from benchmark import synthetic_ohlcv
+from data_providers import MarketDataProvider
+from main_web import NiftyWebAnalyzer
+from signal_rules import DEFAULT_RULES
+from signal_series import signal_series, label_series
+
+logging.disable(logging.INFO)
+
+
+# The if/elif signal logic the rule table replaced, kept verbatim as the reference
+
+def reference_short_term(latest, previous):
+    close, dma_5, ema_5 = latest['Close'], latest['5DMA'], latest['5DEMA']
+    prev_dma_5, prev_ema_5 = previous['5DMA'], previous['5DEMA']
+    above_ma = (close > dma_5) and (close > ema_5)
+    below_ma = (close < dma_5) and (close < ema_5)
+    ma_rising = (dma_5 > prev_dma_5) and (ema_5 > prev_ema_5)
+    ma_falling = (dma_5 < prev_dma_5) and (ema_5 < prev_ema_5)
+    if above_ma and ma_rising:
+        return "BUY", 2
+    elif above_ma or ma_rising:
+        return "BUY", 1
+    elif below_ma and ma_falling:
+        return "SELL", 2
+    elif below_ma or ma_falling:
+        return "SELL", 1
+    return "NEUTRAL", 0
+
+
+def reference_ma_term(latest, previous, column, strong):
+    close, dma, prev_dma = latest['Close'], latest[column], previous[column]
+    if pd.isna(dma) or pd.isna(prev_dma):
+        return "NEUTRAL", 0
+    price_vs_ma = (close / dma) - 1
+    ma_trend = (dma / prev_dma) - 1
+    if close > dma and ma_trend > 0:
+        return "BUY", 2 if price_vs_ma > strong else 1
+    elif close > dma:
+        return "BUY", 1
+    elif close < dma and ma_trend < 0:
+        return "SELL", 2 if price_vs_ma < -strong else 1
+    elif close < dma:
+        return "SELL", 1
+    return "NEUTRAL", 0
+
+
+def reference_trend(short, medium, long):
+    signals = [short, medium, long]
+    if signals.count('BUY') >= 2:
+        return "BULLISH"
+    elif signals.count('SELL') >= 2:
+        return "BEARISH"
+    return "NEUTRAL"
+
+
+def reference_recommendation(trend, total_strength):
+    if trend == "BULLISH":
+        return "STRONG BUY" if total_strength >= 5 else "BUY" if total_strength >= 3 else "WEAK BUY"
+    if trend == "BEARISH":
+        return "STRONG SELL" if total_strength >= 5 else "SELL" if total_strength >= 3 else "WEAK SELL"
+    return "HOLD"
+
+
+def reference_rows(data):
+    """Reference signals for every bar after the first, as label_series columns"""
+    rows = []
+    for i in range(1, len(data)):
+        latest, previous = data.iloc[i], data.iloc[i - 1]
+        short = reference_short_term(latest, previous)
+        medium = reference_ma_term(latest, previous, '50DMA', 0.02)
+        long = reference_ma_term(latest, previous, '200DMA', 0.05)
+        trend = reference_trend(short[0], medium[0], long[0])
+        rows.append({
+            'short_signal': short[0], 'short_strength': short[1],
+            'medium_signal': medium[0], 'medium_strength': medium[1],
+            'long_signal': long[0], 'long_strength': long[1],
+            'overall_trend': trend,
+            'recommendation': reference_recommendation(trend, short[1] + medium[1] + long[1]),
+        })
+    return pd.DataFrame(rows, index=data.index[1:])
+
+
+def indicator_frame(seed, n_bars=600):
+    """Synthetic history with NaN warm-up bars, a flat stretch (ties) and a missing close"""
+    data = synthetic_ohlcv(n_bars, seed=seed)
+    close = data.columns.get_loc('Close')
+    data.iloc[300:310, close] = data.iloc[300, close]
+    data.iloc[450, close] = np.nan
+    data['5DMA'] = data['Close'].rolling(window=5).mean()
+    data['50DMA'] = data['Close'].rolling(window=50).mean()
+    data['200DMA'] = data['Close'].rolling(window=200).mean()
+    data['5DEMA'] = data['Close'].ewm(span=5, adjust=False).mean()
+    return data
+
+
+@pytest.fixture(scope='module', params=[0, 1, 2])
+def history(request):
+    data = indicator_frame(request.param)
+    return data, reference_rows(data)
+
+
+def test_evaluate_row_matches_reference(history):
+    data, expected = history
+    rows = data.to_dict('records')
+    for i in range(1, len(rows)):
+        got = [DEFAULT_RULES[timeframe].evaluate_row(rows[i], rows[i - 1])
+               for timeframe in ('short_term', 'medium_term', 'long_term')]
+        reference = expected.iloc[i - 1]
+        assert got == [(reference[f'{prefix}_signal'], reference[f'{prefix}_strength'])
+                       for prefix in ('short', 'medium', 'long')], f"bar {i}"
+
+
+def test_evaluate_matches_reference(history):
+    data, expected = history
+    got = label_series(signal_series(data), data.index).iloc[1:]
+    pd.testing.assert_frame_equal(got, expected, check_dtype=False)
+
+
+def test_warm_up_bars_are_neutral(history):
+    data, _ = history
+    series = signal_series(data)
+    assert (series['long_signal'][:200] == 0).all()
+    assert (series['medium_signal'][:50] == 0).all()
+
+
+def test_threshold_variants_match_single_runs(history):
+    data, _ = history
+    strong = np.array([0.0, 0.02, 0.05, 0.1])
+    variants = signal_series(data, thresholds={'long_term': {'strong': strong[:, None]}})
+    for k, value in enumerate(strong):
+        single = signal_series(data, thresholds={'long_term': {'strong': value}})
+        assert (variants['long_strength'][k] == single['long_strength']).all()
+        assert (variants['recommendation'][k] == single['recommendation']).all()
+
+
+def test_analyzer_signals_match_reference():
+    analyzer = NiftyWebAnalyzer(provider=MarketDataProvider())
+    analyzer.data = synthetic_ohlcv(600, seed=3)
+    analyzer.calculate_moving_averages()
+    assert analyzer.generate_signals()
+    expected = reference_rows(analyzer.data)
+    pd.testing.assert_frame_equal(analyzer.signal_history().iloc[1:], expected, check_dtype=False)
+
+    reference = expected.iloc[-1]
+    results = analyzer.results
+    assert [(results[timeframe]['signal'], results[timeframe]['strength'])
+            for timeframe in ('short_term', 'medium_term', 'long_term')] == \
+        [(reference[f'{prefix}_signal'], reference[f'{prefix}_strength']) for prefix in ('short', 'medium', 'long')]
+    assert results['overall_trend'] == reference['overall_trend']
+    assert analyzer.get_recommendation() == reference['recommendation']
@@ -0,0 +1,54 @@
+import logging
+import pytest
+from benchmark import synthetic_ohlcv
+from data_providers import MarketDataProvider
+from main_web import NiftyWebAnalyzer
+from indicator_engine import IncrementalIndicators
+from tick_stream import Bar, LiveBars
+from test_indicator_engine import pandas_indicators
+
+logging.disable(logging.INFO)
+
+
+def bars(data):
+    timestamps = data.index.values.astype('datetime64[ns]').view('int64')
+    for ts, (o, h, l, c, v) in zip(timestamps, data[['Open', 'High', 'Low', 'Close', 'Volume']].to_numpy()):
+        yield Bar(int(ts), o, h, l, c, v)
+
+
+def assert_row(row, expected):
+    for name in IncrementalIndicators.COLUMNS + ['Close', 'Volume']:
+        assert row[name] == pytest.approx(expected[name], rel=1e-9, nan_ok=True), name
+
+
+@pytest.mark.parametrize('seed_bars', [0, 1, 2, 150, 800])
+def test_seeded_live_bars_match_pandas(seed_bars):
+    data = synthetic_ohlcv(900, seed=seed_bars)
+    live = LiveBars.from_frame(data.iloc[:seed_bars])
+    if seed_bars >= 2:
+        assert_row(live.latest, pandas_indicators(data.iloc[:seed_bars]).iloc[-1])
+
+    for bar in bars(data.iloc[seed_bars:]):
+        latest, previous = live.append(bar)
+    expected = pandas_indicators(data)
+    assert_row(latest, expected.iloc[-1])
+    assert_row(previous, expected.iloc[-2])
+    assert live.engine.count == len(data)
+    assert live.engine.last_timestamp == data.index[-1].value
+
+
+def test_on_bar_matches_full_recompute():
+    data = synthetic_ohlcv(700)
+    analyzer = NiftyWebAnalyzer(provider=MarketDataProvider())
+    analyzer.data = data.iloc[:650].copy()
+    for bar in bars(data.iloc[650:]):
+        assert analyzer.on_bar(bar)
+
+    fresh = NiftyWebAnalyzer(provider=MarketDataProvider())
+    fresh.data = data.copy()
+    fresh.calculate_moving_averages()
+    assert fresh.generate_signals()
+    assert analyzer.results.keys() == fresh.results.keys()
+    for timeframe in ('short_term', 'medium_term', 'long_term'):
+        assert analyzer.results[timeframe]['signal'] == fresh.results[timeframe]['signal'], timeframe
+    assert analyzer.results['close_price'] == fresh.results['close_price']
@@ -0,0 +1,31 @@
+import logging
+import numpy as np
+import pandas as pd
+from benchmark import synthetic_ohlcv
+from walk_forward import walk_forward, make_folds
+
+logging.disable(logging.INFO)
+
+GRID = {'short_window': [5, 10], 'medium_window': [20, 50], 'long_window': [100, 200],
+        'medium_threshold': [0.02], 'long_threshold': [0.05], 'risk_cutoffs': [(20.0, 30.0)]}
+
+
+def test_folds_tile_the_history_after_warmup():
+    folds = make_folds(1300, train_bars=500, test_bars=250, warmup=200)
+    assert [(train.start, train.stop, test.start, test.stop) for train, test in folds] == [
+        (200, 700, 700, 950), (450, 950, 950, 1200), (700, 1200, 1200, 1300)]
+    anchored = make_folds(1300, train_bars=500, test_bars=250, warmup=200, anchored=True)
+    assert all(train.start == 200 for train, _ in anchored)
+
+
+def test_fold_rows_hold_integer_windows():
+    data = synthetic_ohlcv(1300, seed=4)
+    result = walk_forward(data['Close'].to_numpy(), grid=GRID, train_bars=500, test_bars=250, index=data.index)
+    folds = result['folds']
+    assert list(folds['fold']) == [1, 2, 3]
+    for name in ('short_window', 'medium_window', 'long_window'):
+        assert pd.api.types.is_integer_dtype(folds[name]), name
+        assert set(folds[name]) <= set(GRID[name]), name
+    assert folds['test_start'].iloc[0] == data.index[700]
+    assert len(result['equity']) == len(result['index']) == 600
+    assert np.isfinite(result['summary']['total_return'])
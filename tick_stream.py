@@ -0,0 +1,212 @@
+import time
+import logging
+from collections import namedtuple
+import numpy as np
+import pandas as pd
+from indicator_engine import IncrementalIndicators, tail_indicators
+
+logger = logging.getLogger(__name__)
+
+Bar = namedtuple('Bar', ['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+
+# 09:15 IST is 03:45 UTC: anchoring bins there makes hourly bars start at 09:15, 10:15, ...
+NSE_OPEN_ANCHOR_NS = pd.Timedelta(hours=3, minutes=45).value
+
+
+class TickBarAggregator:
+    """
+    Turns a stream of trade ticks into OHLCV bars of a fixed duration.
+    The current bar lives in a handful of scalars (fixed memory); each completed
+    bar is passed to on_bar(Bar). Timestamps are UTC epoch nanoseconds.
+    """
+
+    def __init__(self, bar_seconds=60, on_bar=None, anchor_ns=NSE_OPEN_ANCHOR_NS):
+        self.bar_ns = int(bar_seconds * 1_000_000_000)
+        self.anchor_ns = anchor_ns
+        self.on_bar = on_bar
+        self.bars_emitted = 0
+        self.ticks_seen = 0
+        self._start = None
+        self._open = self._high = self._low = self._close = 0.0
+        self._volume = 0
+
+    def _emit(self):
+        bar = Bar(self._start, self._open, self._high, self._low, self._close, self._volume)
+        self.bars_emitted += 1
+        if self.on_bar is not None:
+            self.on_bar(bar)
+        return bar
+
+    def add_tick(self, timestamp_ns, price, size):
+        """Add one tick; returns the completed bar if this tick closed one, else None"""
+        self.ticks_seen += 1
+        start = timestamp_ns - (timestamp_ns - self.anchor_ns) % self.bar_ns
+        completed = None
+        if start != self._start:
+            if self._start is not None:
+                completed = self._emit()
+            self._start = start
+            self._open = self._high = self._low = self._close = price
+            self._volume = size
+            return completed
+
+        if price > self._high:
+            self._high = price
+        elif price < self._low:
+            self._low = price
+        self._close = price
+        self._volume += size
+        return None
+
+    def add_ticks(self, timestamps_ns, prices, sizes):
+        """
+        Add a batch of time-ordered ticks with vectorized group reductions.
+        Returns the number of bars completed by the batch.
+        """
+        n = len(timestamps_ns)
+        if n == 0:
+            return 0
+        self.ticks_seen += n
+
+        timestamps_ns = np.asarray(timestamps_ns, dtype='int64')
+        prices = np.asarray(prices, dtype='float64')
+        sizes = np.asarray(sizes)
+        starts_ns = timestamps_ns - (timestamps_ns - self.anchor_ns) % self.bar_ns
+        boundaries = np.flatnonzero(starts_ns[1:] != starts_ns[:-1]) + 1
+        group_starts = np.r_[0, boundaries]
+
+        opens = prices[group_starts]
+        highs = np.maximum.reduceat(prices, group_starts)
+        lows = np.minimum.reduceat(prices, group_starts)
+        closes = prices[np.r_[boundaries - 1, n - 1]]
+        volumes = np.add.reduceat(sizes, group_starts)
+        bar_starts = starts_ns[group_starts]
+
+        completed = 0
+        first = 0
+        if self._start is not None:
+            if bar_starts[0] == self._start:
+                # The batch continues the bar in progress
+                self._high = max(self._high, float(highs[0]))
+                self._low = min(self._low, float(lows[0]))
+                self._close = float(closes[0])
+                self._volume += int(volumes[0])
+                first = 1
+                if len(group_starts) > 1:
+                    self._emit()
+                    completed += 1
+            else:
+                self._emit()
+                completed += 1
+
+        last = len(group_starts) - 1
+        if first <= last:
+            for i in range(first, last):
+                # Whole bars inside the batch
+                bar = Bar(int(bar_starts[i]), float(opens[i]), float(highs[i]), float(lows[i]),
+                          float(closes[i]), int(volumes[i]))
+                self.bars_emitted += 1
+                completed += 1
+                if self.on_bar is not None:
+                    self.on_bar(bar)
+            self._start = int(bar_starts[last])
+            self._open = float(opens[last])
+            self._high = float(highs[last])
+            self._low = float(lows[last])
+            self._close = float(closes[last])
+            self._volume = int(volumes[last])
+        return completed
+
+    def flush(self):
+        """Emit the bar in progress (e.g. at the session close)"""
+        if self._start is None:
+            return None
+        bar = self._emit()
+        self._start = None
+        return bar
+
+
+def synthetic_ticks(n_ticks, start=None, ticks_per_second=50, price=20000.0, seed=7):
+    """Generate (timestamps_ns, prices, sizes) arrays for a random-walk tick stream"""
+    rng = np.random.default_rng(seed)
+    start = start if start is not None else pd.Timestamp("2026-01-05 09:15", tz="Asia/Kolkata")
+    start_ns = pd.Timestamp(start).value
+    gaps = rng.exponential(1_000_000_000 / ticks_per_second, n_ticks).astype('int64')
+    timestamps = start_ns + np.cumsum(gaps)
+    prices = price * np.exp(np.cumsum(rng.normal(0, 0.00005, n_ticks)))
+    sizes = rng.integers(1, 500, n_ticks)
+    return timestamps, np.round(prices, 2), sizes
+
+
+def synthetic_tick_batches(n_ticks, batch_size=100_000, **options):
+    """Yield the synthetic tick stream in batches, as a feed handler would deliver it"""
+    timestamps, prices, sizes = synthetic_ticks(n_ticks, **options)
+    for start in range(0, n_ticks, batch_size):
+        stop = start + batch_size
+        yield timestamps[start:stop], prices[start:stop], sizes[start:stop]
+
+
+class LiveBars:
+    """
+    Indicators for bars arriving one at a time: an IncrementalIndicators engine
+    plus the latest two indicator rows. Memory is fixed (the engine's rolling
+    windows), however long the stream runs; the DataFrame is never rebuilt.
+    """
+
+    def __init__(self, periods_per_year=252):
+        self.engine = IncrementalIndicators(periods_per_year)
+        self.latest = None
+        self.previous = None
+
+    @classmethod
+    def from_frame(cls, data, periods_per_year=252):
+        """Seed the engine from historical bars so indicators are warm from the first live bar"""
+        live = cls(periods_per_year)
+        close = data['Close'].to_numpy(dtype='float64')
+        volume = data['Volume'].to_numpy(dtype='float64')
+        if len(close) < 2:
+            for c, v in zip(close, volume):
+                live._append(None, float(c), float(v))
+        else:
+            live.latest, live.previous = tail_indicators(close, volume, periods_per_year)
+            live.engine = IncrementalIndicators.from_arrays(close, volume, live.latest['5DEMA'], periods_per_year)
+        if len(close):
+            index = pd.DatetimeIndex(data.index[-1:])
+            live.engine.last_timestamp = int(index.values.astype('datetime64[ns]').view('int64')[0])
+        return live
+
+    def _append(self, timestamp_ns, close, volume):
+        row = self.engine.update(close, volume, timestamp_ns)
+        row['Close'] = close
+        row['Volume'] = volume
+        self.previous = self.latest
+        self.latest = row
+
+    def append(self, bar):
+        """Append a completed bar and return (latest, previous) indicator rows"""
+        self._append(int(bar.timestamp), float(bar.close), float(bar.volume))
+        return self.latest, self.previous
+
+
+def run_throughput(n_ticks=5_000_000, batch_size=100_000, bar_seconds=60):
+    """Measure aggregator throughput on the synthetic tick stream, batched and tick-by-tick"""
+    timestamps, prices, sizes = synthetic_ticks(n_ticks)
+
+    aggregator = TickBarAggregator(bar_seconds)
+    start = time.perf_counter()
+    for i in range(0, n_ticks, batch_size):
+        aggregator.add_ticks(timestamps[i:i + batch_size], prices[i:i + batch_size], sizes[i:i + batch_size])
+    batched = n_ticks / (time.perf_counter() - start)
+
+    scalar_ticks = min(n_ticks, 1_000_000)
+    scalar = TickBarAggregator(bar_seconds)
+    ts_list, price_list, size_list = (timestamps[:scalar_ticks].tolist(), prices[:scalar_ticks].tolist(),
+                                      sizes[:scalar_ticks].tolist())
+    start = time.perf_counter()
+    add_tick = scalar.add_tick
+    for ts, price, size in zip(ts_list, price_list, size_list):
+        add_tick(ts, price, size)
+    per_tick = scalar_ticks / (time.perf_counter() - start)
+
+    return {'batched_ticks_per_second': batched, 'per_tick_ticks_per_second': per_tick,
+            'bars': aggregator.bars_emitted}
@@ -0,0 +1,157 @@
+import time
+import argparse
+import logging
+import numpy as np
+import pandas as pd
+from sweep import DEFAULT_GRID, _indicator_rows, _window_triples, window_signals, score_windows, rank_results
+from backtest import backtest, performance
+
+logger = logging.getLogger(__name__)
+
+# Three years of daily bars to choose parameters, the following year to score them
+TRAIN_BARS = 756
+TEST_BARS = 252
+TEST_METRICS = ['total_return', 'sharpe', 'max_drawdown', 'hit_rate', 'trades']
+
+
+def make_folds(n_bars, train_bars=TRAIN_BARS, test_bars=TEST_BARS, step=None, anchored=False, warmup=0):
+    """
+    (train, test) bar slices for rolling walk-forward evaluation. Each test window
+    follows its train window; windows advance by step (default test_bars, so the
+    test windows tile the history and the last one may be shorter). With anchored
+    the train windows all start at warmup and grow instead of rolling.
+    """
+    step = step or test_bars
+    folds = []
+    train_start = warmup
+    train_end = warmup + train_bars
+    while train_end < n_bars:
+        folds.append((slice(train_start, train_end), slice(train_end, min(train_end + test_bars, n_bars))))
+        train_end += step
+        if not anchored:
+            train_start += step
+    return folds
+
+
+def walk_forward(close, grid=None, train_bars=TRAIN_BARS, test_bars=TEST_BARS, step=None, anchored=False,
+                 metric='sharpe', periods_per_year=252, index=None, rules=None, **options):
+    """
+    Walk-forward evaluation of the sweep grid: on each train window pick the
+    combination with the best metric, then backtest it on the following test
+    window, and stitch the test windows into one out-of-sample track record.
+    Indicators and every combination's recommendation series are computed once
+    for the whole history (they only look back) and sliced per fold. The first
+    train window starts once the longest moving average is defined.
+    Returns {'folds': DataFrame with per-fold parameters, scores and timings,
+    'position'/'returns'/'equity'/'drawdown': stitched test arrays, 'index',
+    'summary', 'setup_seconds'}. options are passed to backtest (cost_bps, ...).
+    """
+    grid = {**DEFAULT_GRID, **(grid or {})}
+    options = {'periods_per_year': periods_per_year, **options}
+    close = np.asarray(close, dtype='float64')
+    folds = make_folds(len(close), train_bars, test_bars, step, anchored, warmup=max(grid['long_window']))
+    if not folds:
+        raise ValueError(f"{len(close)} bars are too few for a {train_bars}-bar train window "
+                         f"after {max(grid['long_window'])} warm-up bars")
+
+    start_time = time.perf_counter()
+    matrix, layout = _indicator_rows(close, grid, periods_per_year)
+    signals = {triple: window_signals(*triple, grid, matrix, layout, rules) for triple in _window_triples(grid)}
+    setup_seconds = time.perf_counter() - start_time
+    logger.info(f"Indicators and signals for {len(signals)} window triples in {setup_seconds:.2f}s")
+
+    rows = []
+    pieces = []
+    for number, (train, test) in enumerate(folds, start=1):
+        fold_start = time.perf_counter()
+        scores = pd.concat([score_windows(triple, recommendation, grid, options, matrix, layout, train)
+                            for triple, recommendation in signals.items()], ignore_index=True)
+        best = rank_results(scores, metric).iloc[0]
+        train_seconds = time.perf_counter() - fold_start
+
+        # Start one bar early so the position decided at the last train bar is held
+        # (and paid for) on the first test bar, then drop that bar
+        test_start = time.perf_counter()
+        triple = (int(best['short_window']), int(best['medium_window']), int(best['long_window']))
+        recommendation = signals[triple][list(grid['medium_threshold']).index(best['medium_threshold']),
+                                         list(grid['long_threshold']).index(best['long_threshold']), 0]
+        bars = slice(test.start - 1, test.stop)
+        result = backtest(close[bars], recommendation[bars], volatility=matrix[layout['Volatility'], bars],
+                          risk_cutoffs=(best['moderate_volatility'], best['high_volatility']), **options)
+        piece = {name: result[name][1:] for name in ('position', 'returns', 'turnover', 'costs')}
+        pieces.append(piece)
+        scored = performance(piece['position'], piece['returns'], piece['turnover'], piece['costs'],
+                             periods_per_year)['summary']
+        test_seconds = time.perf_counter() - test_start
+
+        row = {
+            'fold': number,
+            'train_start': index[train.start] if index is not None else train.start,
+            'train_end': index[train.stop - 1] if index is not None else train.stop - 1,
+            'test_start': index[test.start] if index is not None else test.start,
+            'test_end': index[test.stop - 1] if index is not None else test.stop - 1,
+        }
+        row.update(zip(('short_window', 'medium_window', 'long_window'), triple))
+        row.update({name: best[name] for name in ('medium_threshold', 'long_threshold', 'moderate_volatility',
+                                                   'high_volatility')})
+        row[f'train_{metric}'] = best[metric]
+        row.update({f'test_{name}': scored[name] for name in TEST_METRICS})
+        row.update({'train_seconds': train_seconds, 'test_seconds': test_seconds,
+                    'seconds': train_seconds + test_seconds})
+        rows.append(row)
+        logger.info(f"Fold {number}/{len(folds)}: windows {triple}, train {metric} {best[metric]:.2f}, "
+                    f"test return {scored['total_return']:+.2%} ({row['seconds']:.2f}s)")
+
+    stitched = performance(*(np.concatenate([piece[name] for piece in pieces])
+                             for name in ('position', 'returns', 'turnover', 'costs')), periods_per_year)
+    covered = slice(folds[0][1].start, folds[-1][1].stop)
+    return {
+        'folds': pd.DataFrame(rows),
+        'position': stitched['position'],
+        'returns': stitched['returns'],
+        'equity': stitched['equity'],
+        'drawdown': stitched['drawdown'],
+        'index': index[covered] if index is not None else np.arange(covered.start, covered.stop),
+        'summary': stitched['summary'],
+        'setup_seconds': setup_seconds,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Walk-forward evaluation of the signal parameters")
+    parser.add_argument('output', help="CSV file for the per-fold results")
+    parser.add_argument('--symbol', default="^NSEI")
+    parser.add_argument('--period', default="max", help="History to download (default: max)")
+    parser.add_argument('--store', default=None, help="Read history from a HistoryStore root instead")
+    parser.add_argument('--train-bars', type=int, default=TRAIN_BARS)
+    parser.add_argument('--test-bars', type=int, default=TEST_BARS)
+    parser.add_argument('--anchored', action='store_true', help="Expanding instead of rolling train windows")
+    parser.add_argument('--metric', default='sharpe', help="Summary metric used to choose parameters")
+    parser.add_argument('--cost-bps', type=float, default=0.0)
+    parser.add_argument('--slippage-bps', type=float, default=0.0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    from main_web import NiftyWebAnalyzer
+    analyzer = NiftyWebAnalyzer(symbol=args.symbol)
+    if args.store:
+        from history_store import HistoryStore
+        loaded = analyzer.load_history(HistoryStore(args.store))
+    else:
+        loaded = analyzer.fetch_data(period=args.period)
+    if not loaded:
+        return False
+
+    result = analyzer.walk_forward(train_bars=args.train_bars, test_bars=args.test_bars, anchored=args.anchored,
+                                   metric=args.metric, cost_bps=args.cost_bps, slippage_bps=args.slippage_bps)
+    if result is None:
+        return False
+    result['folds'].to_csv(args.output, index=False)
+    print(result['folds'].to_string(index=False))
+    print({name: round(value, 4) for name, value in result['summary'].items()})
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)